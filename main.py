@@ -1,8 +1,12 @@
-from src.app import ConsoleApp
+from src.app import ConsoleApp, DirectoryWatcher
 from src.constants import SPACE
 import os
+import sys
 
 if __name__ == "__main__":
+    if '--watch' in sys.argv[1:]:
+        DirectoryWatcher(ConsoleApp._requested_features()).run()
+        sys.exit()
     try :
         app = ConsoleApp()
         app.main_menu()
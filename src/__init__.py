@@ -1,10 +1,35 @@
 from .app.console_app import ConsoleApp
+from .app.out_of_core_runner import OutOfCoreRunner
+from .app.duckdb_engine import DuckDBEngine
+from .app.directory_watcher import DirectoryWatcher
+from .app.preview_runner import PreviewRunner
 from .calculations.risk_score import CustomerRiskScorer
 from .calculations.transaction_flager import TransactionFlagger
+from .calculations.threshold_evaluator import ThresholdEvaluator
+from .calculations.segment_normalizer import SegmentNormalizer
+from .calculations.mahalanobis_scorer import MahalanobisScorer
+from .calculations.reason_codes import ReasonCodes
+from .calculations.sample_estimator import SampleEstimator
 from .constants import colors, config, keys
 from .data_manipulator.data_manager import DataManager
 from .data_manipulator.transactions_cleaner import TransactionCleaner
+from .data_manipulator.customer_index import CustomerIndex
+from .data_manipulator.shared_frame import SharedFrame
+from .data_manipulator.sender_partitioner import SenderPartitioner
+from .data_manipulator.sender_sampler import SenderSampler
+from .data_manipulator.ingestion_manifest import IngestionManifest
+from .data_manipulator.load_filter import LoadFilter
+from .features_builder.feature_registry import FeatureRegistry
 from .features_builder.customer_features_builder import CustomerFeaturesBuilder
 from .features_builder.transaction_features_builder import TransactionFeaturesBuilder
+from .features_builder.graph_features_builder import GraphFeaturesBuilder
+from .features_builder.ewm_baseline_builder import EWMBaselineBuilder
+from .features_builder.hyperloglog import HyperLogLog
+from .features_builder.sketch_features_builder import SketchFeaturesBuilder
+from .features_builder.transaction_graph import TransactionGraph
 from .report_generator.dashboard_generator import DashboardGenerator
-from .report_generator.report_generator import ReportGenerator
\ No newline at end of file
+from .report_generator.report_generator import ReportGenerator
+from .report_generator.sqlite_exporter import SQLiteExporter
+from .report_generator.trend_analyzer import TrendAnalyzer
+from .report_generator.customer_pages import CustomerPageRenderer
+from .report_generator.html_dashboard import HTMLDashboard
@@ -1 +1,6 @@
 from .console_app import ConsoleApp
+from .stage_runner import StageRunner, StageCancelled
+from .out_of_core_runner import OutOfCoreRunner
+from .duckdb_engine import DuckDBEngine
+from .directory_watcher import DirectoryWatcher
+from .preview_runner import PreviewRunner
@@ -1,9 +1,16 @@
 import msvcrt
+import time
+import os
+import pandas as pd
 from tabulate import tabulate
-from src.data_manipulator import DataManager, TransactionCleaner
-from src.features_builder import CustomerFeaturesBuilder, TransactionFeaturesBuilder
-from src.calculations import CustomerRiskScorer, TransactionFlagger
-from src.report_generator import ReportGenerator, DashboardGenerator
+from src.data_manipulator import DataManager, TransactionCleaner, CustomerIndex, IngestionManifest, LoadFilter
+from src.features_builder import FeatureRegistry
+from src.calculations import CustomerRiskScorer, TransactionFlagger, MahalanobisScorer, ThresholdEvaluator
+from src.report_generator import ReportGenerator, DashboardGenerator, SQLiteExporter, HTMLDashboard
+from src.app.stage_runner import StageRunner, StageCancelled
+from src.app.out_of_core_runner import OutOfCoreRunner
+from src.app.duckdb_engine import DuckDBEngine
+from src.app.preview_runner import PreviewRunner
 from src.utils import clear_screen, print_centered, show_banner, wait, error
 from src.constants import *
 
@@ -18,6 +25,14 @@ class ConsoleApp:
         """Initialize the console application state and status flags."""
         self.current = 0
         self.df = None
+        self.index = None
+        self.engine = None
+
+        self.session = {
+            'max_zscore': None,
+            'flag_threshold': FLAG_ZSCORE_THRESHOLD,
+            'risk_bins': list(RISK_CLASS_BINS)
+        }
 
         self.info = {
             'Loaded': False,
@@ -28,6 +43,48 @@ class ConsoleApp:
             'Flagged': False
         }
 
+    @staticmethod
+    def _run_stage(desc: str, stage, total=None, unit: str = 'rows'):
+        """Run a stage on a background worker and return its result.
+
+        Returns None when the user cancelled; the caller then leaves `self.df`
+        and `self.info` untouched, since stages never mutate application state.
+        """
+        try:
+            return StageRunner.run(desc, stage, total=total, unit=unit)
+        except StageCancelled:
+            print(f"\n{SPACE}⚠️  {desc} cancelled. Data left unchanged.")
+            wait()
+            return None
+
+    @staticmethod
+    def _requested_features() -> list:
+        """Return the feature columns read by the scorers, plus `EXTRA_FEATURES` and user requests."""
+        requested = (
+            CustomerRiskScorer.RISK_FEATURES + TransactionFlagger.FLAG_FEATURES
+            + MahalanobisScorer.FEATURES + EXTRA_FEATURES + FeatureRegistry.requested()
+        )
+        return list(dict.fromkeys(requested))
+
+    def _set_engine(self, engine):
+        """Replace the SQL engine used for report aggregations, closing the previous one."""
+        if self.engine is not None:
+            self.engine.close()
+        self.engine = engine
+
+    @staticmethod
+    def _single_step(compute, size: int):
+        """Wrap a non-chunked computation as a stage reporting `size` units at once.
+
+        ESC cannot interrupt the computation itself; its result is discarded
+        when it returns (see `StageRunner.run`).
+        """
+        def stage(progress):
+            result = compute()
+            progress.update(size)
+            return result
+        return stage
+
     def main_menu(self):
         """Display the interactive main menu and handle user keyboard navigation."""
         while True:
@@ -72,6 +129,22 @@ class ConsoleApp:
                 elif self.current == 8:
                     self.export_dashboard()
                 elif self.current == 9:
+                    self.investigate_customer()
+                elif self.current == 10:
+                    self.export_sqlite()
+                elif self.current == 11:
+                    self.evaluate_thresholds()
+                elif self.current == 12:
+                    self.what_if_thresholds()
+                elif self.current == 13:
+                    self.run_out_of_core()
+                elif self.current == 14:
+                    self.run_duckdb_pipeline()
+                elif self.current == 15:
+                    self.run_preview()
+                elif self.current == 16:
+                    self.export_html_dashboard()
+                elif self.current == 17:
                     clear_screen()
                     print_centered("👋 Exiting FRAUDLENS ...")
                     break
@@ -79,16 +152,35 @@ class ConsoleApp:
     def load_data(self):
         """Load CSV files from DATA_PATH using DataManager and reset processing flags.
 
+        With `INCREMENTAL_LOAD`, only new or changed files are parsed and the
+        others come from the ingestion cache. An optional step range and type
+        list restrict the load; cached row groups that cannot match are skipped.
         After loading, all step flags are reset so only 'Loaded' is True.
         """
         show_banner()
-        result = DataManager.read_csv(DATA_PATH)
-        self.df = result['data_frame']
-        if not len(self.df):
+        try:
+            row_filter = self._ask_load_filter()
+        except ValueError:
+            error("⚠️  Invalid input. Nothing loaded.")
+            return
+
+        def stage(progress):
+            if INCREMENTAL_LOAD:
+                return IngestionManifest(DATA_PATH).load(progress=progress, row_filter=row_filter)
+            return DataManager.read_csv(DATA_PATH, progress=progress, row_filter=row_filter)
+
+        result = self._run_stage("Loading", stage)
+        if result is None:
+            return
+        if not len(result['data_frame']):
             print(f"{SPACE} ⚠️ We Can't Find Any Data Matched!")
             wait()
             return -1
-        
+
+        self.df = result['data_frame']
+        self.index = None
+        self._set_engine(None)
+        self.session['max_zscore'] = None
         self.info = {
             'Loaded': True,
             'Cleaned': False,
@@ -104,6 +196,28 @@ class ConsoleApp:
             ["Matched Files", ", ".join(result['matches'])],
             ["Invalid Files", ", ".join(result['not_matches'])]
         ]
+        if INCREMENTAL_LOAD:
+            table += [
+                [f"{status.title()} Files", ", ".join(result[status]) or "-"]
+                for status in ('new', 'changed', 'unchanged', 'removed')
+            ]
+        if row_filter.active:
+            table.append(["Load Filter", row_filter.describe()])
+            if 'pushdown' in result:
+                pushdown = result['pushdown']
+                table.append([
+                    "Cached Row Groups Read",
+                    f"{pushdown['row_groups_read']} of {pushdown['row_groups']} "
+                    f"({pushdown['files_skipped']} file(s) skipped)"
+                ])
+        io = result['io']
+        if io['compressed_files']:
+            table.append([
+                "Bytes Read",
+                f"{io['disk_bytes'] / 2 ** 20:,.1f} MiB for {io['csv_bytes'] / 2 ** 20:,.1f} MiB of CSV "
+                f"({io['compressed_files']} compressed file(s), "
+                f"{io['saved_bytes'] / max(io['csv_bytes'], 1):.0%} less I/O)"
+            ])
 
         print(f"\n{SPACE}✅ Data Loaded Successfully")
         print(tabulate(table, headers=["Metric", "Value"], tablefmt="grid"))
@@ -120,7 +234,12 @@ class ConsoleApp:
             return
 
         show_banner()
-        result = TransactionCleaner.clean(self.df)
+        result = self._run_stage(
+            "Cleaning", lambda progress: TransactionCleaner.clean(self.df, progress=progress),
+            total=len(self.df)
+        )
+        if result is None:
+            return
         self.df = result['cleaned_data']
         self.info['Cleaned'] = True
 
@@ -132,7 +251,7 @@ class ConsoleApp:
         wait()
 
     def build_customer_features(self):
-        """Construct customer-level features and mark them as built."""
+        """Construct the customer-stage features the scorers need and mark them as built."""
         if not self.info['Loaded']:
             error("❌ Load data first.")
             return
@@ -145,8 +264,18 @@ class ConsoleApp:
             error("⚠️  Customer features already built. Load new data to rebuild.")
             return
 
+        requested = self._requested_features()
+
         show_banner()
-        self.df = CustomerFeaturesBuilder.build(self.df)
+        features = self._run_stage(
+            "Customer features",
+            lambda progress: FeatureRegistry.build(self.df, requested, stage='customer', progress=progress),
+            total=FeatureRegistry.count(self.df.columns, requested, stage='customer'),
+            unit='features'
+        )
+        if features is None:
+            return
+        self.df = features
         self.info['CustomerFeatures'] = True
 
         print(f"\n{SPACE}👤 Customer Features Built Successfully")
@@ -154,7 +283,7 @@ class ConsoleApp:
         wait()
 
     def build_transaction_features(self):
-        """Construct transaction-level features and mark them as built."""
+        """Construct the remaining requested features and mark them as built."""
         if not self.info['Loaded']:
             error("❌ Load data first.")
             return
@@ -171,8 +300,17 @@ class ConsoleApp:
             error("⚠️  Transaction features already built. Load new data to rebuild.")
             return
 
+        requested = self._requested_features()
+
         show_banner()
-        self.df = TransactionFeaturesBuilder.build(self.df)
+        features = self._run_stage(
+            "Transaction features",
+            lambda progress: FeatureRegistry.build(self.df, requested, progress=progress),
+            total=FeatureRegistry.count(self.df.columns, requested), unit='features'
+        )
+        if features is None:
+            return
+        self.df = features
         self.info['TransactionFeatures'] = True
 
         print(f"\n{SPACE}💳 Transaction Features Built Successfully")
@@ -189,8 +327,15 @@ class ConsoleApp:
             error("❌ Build customer features first before calculating risk scores.")
             return
 
+        def stage(progress):
+            scored = CustomerRiskScorer.build(self.df, self.session['risk_bins'], progress=progress)
+            return scored, CustomerIndex(scored)
+
         show_banner()
-        self.df = CustomerRiskScorer.build(self.df)
+        result = self._run_stage("Risk scoring", stage, total=len(self.df))
+        if result is None:
+            return
+        self.df, self.index = result
         self.info['RiskScored'] = True
 
         dist = self.df['risk_class'].value_counts().reset_index()
@@ -210,12 +355,28 @@ class ConsoleApp:
             error("❌ Build transaction features first before flagging transactions.")
             return
 
+        def stage(progress):
+            max_z, reasons = TransactionFlagger.score(self.df, progress=progress)
+            flagged = TransactionFlagger.build(
+                self.df, self.session['flag_threshold'], max_z=max_z, reasons=reasons
+            )
+            progress.check()
+            return MahalanobisScorer.build(flagged, progress=progress), max_z
+
         show_banner()
-        self.df = TransactionFlagger.build(self.df)
+        result = self._run_stage("Flagging", stage, total=3 * len(self.df))
+        if result is None:
+            return
+        self.df, self.session['max_zscore'] = result
+        if self.index is not None:
+            self.index = self.index.rebind(self.df)
         self.info['Flagged'] = True
 
-        flags = self.df['transaction_flag'].value_counts().reset_index()
-        flags.columns = ["Flag", "Count"]
+        flags = pd.concat([
+            self.df['transaction_flag'].value_counts().rename("Z-score"),
+            self.df['mahalanobis_flag'].value_counts().rename("Mahalanobis")
+        ], axis=1).fillna(0).astype(int).reset_index()
+        flags.columns = ["Flag", "Z-score", "Mahalanobis"]
 
         print(f"\n{SPACE}🚨 Transaction Flag Summary\n")
         print(tabulate(flags, headers="keys", tablefmt="grid"))
@@ -278,8 +439,13 @@ class ConsoleApp:
             return
 
         show_banner()
-        gen = ReportGenerator(self.df)
-        paths = gen.export_all()
+        gen = ReportGenerator(self.df, engine=self.engine)
+        paths = self._run_stage(
+            "Exporting reports", lambda progress: gen.export_all(progress=progress),
+            total=3, unit='reports'
+        )
+        if paths is None:
+            return
 
         table = [[k.replace("_", " ").title(), v] for k, v in paths.items()]
 
@@ -298,9 +464,365 @@ class ConsoleApp:
             return
 
         show_banner()
-        dashboard = DashboardGenerator(self.df)
-        path = dashboard.export_dashboard_pdf()
+        dashboard = DashboardGenerator(self.df, index=self.index)
+        path = self._run_stage(
+            "Exporting dashboard", dashboard.export_dashboard_pdf,
+            total=len(dashboard.top_critical_customers()) + 1, unit='pages'
+        )
+        if path is None:
+            return
 
         print(f"\n{SPACE}📊 Dashboard Exported Successfully\n")
         print(f"{SPACE}Path: {path}")
-        wait()
\ No newline at end of file
+        wait()
+
+    def export_html_dashboard(self):
+        """Pre-aggregate the flagged data and write the self-contained HTML dashboard."""
+        if not self.info['Loaded']:
+            error("❌ Load data first.")
+            return
+
+        if not (self.info['RiskScored'] and self.info['Flagged']):
+            error("❌ Run risk scoring and transaction flagging first.")
+            return
+
+        show_banner()
+
+        def stage(progress):
+            summary = HTMLDashboard.summarize(self.df)
+            progress.update(1)
+            progress.check()
+            path = HTMLDashboard.export(summary)
+            progress.update(1)
+            return path
+
+        path = self._run_stage("Exporting HTML dashboard", stage, total=2, unit='steps')
+        if path is None:
+            return
+
+        print(f"\n{SPACE}🌐 HTML Dashboard Exported Successfully\n")
+        print(f"{SPACE}Path: {path} ({os.path.getsize(path) / 1024:,.0f} KiB, opens offline)")
+        wait()
+
+    def export_sqlite(self):
+        """Write scored transactions and customer risk table into an indexed SQLite database."""
+        if not self.info['Loaded']:
+            error("❌ Load data first.")
+            return
+
+        if not (self.info['RiskScored'] and self.info['Flagged']):
+            error("❌ Run risk scoring and transaction flagging first.")
+            return
+
+        show_banner()
+        exporter = SQLiteExporter(self.df)
+        path = self._run_stage(
+            "Exporting SQLite", lambda progress: exporter.export_database(progress=progress),
+            total=len(self.df) + self.df['nameOrig'].nunique()
+        )
+        if path is None:
+            return
+
+        print(f"\n{SPACE}🗄️ SQLite Database Exported Successfully\n")
+        print(f"{SPACE}Path: {path}")
+        print(f"{SPACE}Tables: transactions, customers")
+        wait()
+
+    def evaluate_thresholds(self):
+        """Sweep flag and risk thresholds against the label column and show the best trade-offs."""
+        if not self.info['Loaded']:
+            error("❌ Load data first.")
+            return
+
+        if not (self.info['RiskScored'] and self.info['Flagged']):
+            error("❌ Run risk scoring and transaction flagging first.")
+            return
+
+        if LABEL_COLUMN not in self.df.columns:
+            error(f"❌ Dataset has no '{LABEL_COLUMN}' label column to evaluate against.")
+            return
+
+        show_banner()
+        result = self._run_stage(
+            "Threshold sweep",
+            self._single_step(lambda: ThresholdEvaluator.export_all(
+                self.df, max_z=self.session['max_zscore'],
+                flag_threshold=self.session['flag_threshold'],
+                risk_cutoff=self.session['risk_bins'][-1]
+            ), len(self.df)),
+            total=len(self.df)
+        )
+        if result is None:
+            return
+
+        columns = ['threshold', 'alerts', 'flag_rate', 'precision', 'recall', 'f1']
+        transactions = result['transactions']
+        customers = result['customers']
+
+        flag_table = pd.DataFrame([
+            ThresholdEvaluator.at(transactions, self.session['flag_threshold']),
+            ThresholdEvaluator.best(transactions, 'f1')
+        ], index=['Current', 'Best F1'])[columns]
+        risk_table = pd.DataFrame([
+            ThresholdEvaluator.at(customers, self.session['risk_bins'][-1]),
+            ThresholdEvaluator.best(customers, 'f1')
+        ], index=['Current critical cut-off', 'Best F1'])[columns]
+
+        print(f"\n{SPACE}🎯 Transaction Flag Threshold ({len(transactions):,} candidates)\n")
+        print(tabulate(flag_table, headers="keys", tablefmt="grid", floatfmt=".4f"))
+
+        print(f"\n{SPACE}🧐 Customer Risk Score Cut-off ({len(customers):,} candidates)\n")
+        print(tabulate(risk_table, headers="keys", tablefmt="grid", floatfmt=".4f"))
+
+        table = [[k.replace("_", " ").title(), v] for k, v in result['paths'].items()]
+        print(f"\n{SPACE}📁 Sweep Outputs\n")
+        print(tabulate(table, headers=["Output", "Path"], tablefmt="grid"))
+        wait()
+
+    @staticmethod
+    def _ask_load_filter() -> LoadFilter:
+        """Ask for an optional step range and transaction types; Enter loads everything."""
+        print(f"\n{SPACE}Restrict the load (Enter to load everything):\n")
+        steps = input(f"{SPACE}🔹 Step range, e.g. 0-167: ").strip()
+        types = input(f"{SPACE}🔹 Transaction types, e.g. TRANSFER,CASH_OUT: ").strip()
+        if steps:
+            first, last = (int(value) for value in steps.split('-'))
+            if first > last:
+                raise ValueError("Empty step range.")
+            steps = (first, last)
+        types = [value.strip() for value in types.split(',') if value.strip()]
+        return LoadFilter(steps or None, types or None)
+
+    @staticmethod
+    def _ask_float_list(prompt: str, count: int):
+        """Read `count` comma separated increasing numbers; None keeps the current value."""
+        raw = input(prompt).strip()
+        if not raw:
+            return None
+        values = [float(v) for v in raw.split(',')]
+        if len(values) != count or values != sorted(set(values)):
+            raise ValueError(f"Expected {count} increasing numbers.")
+        return values
+
+    def what_if_thresholds(self):
+        """Re-flag and re-class instantly from the cached scores with a new threshold and bins."""
+        if not self.info['Loaded']:
+            error("❌ Load data first.")
+            return
+
+        if not (self.info['RiskScored'] and self.info['Flagged']) or self.session['max_zscore'] is None:
+            error("❌ Run risk scoring and transaction flagging first.")
+            return
+
+        show_banner()
+        print(f"\n{SPACE}Current flag threshold: {self.session['flag_threshold']}")
+        print(f"{SPACE}Current risk bins (low/medium/high upper edges): {self.session['risk_bins']}\n")
+        try:
+            threshold = self._ask_float_list(f"{SPACE}🔹 New flag threshold (Enter to keep): ", 1)
+            bins = self._ask_float_list(f"{SPACE}🔹 New risk bins, e.g. 0.5,1,2 (Enter to keep): ", 3)
+        except ValueError:
+            error("⚠️  Invalid input. Thresholds left unchanged.")
+            return
+
+        start = time.perf_counter()
+        if threshold is not None:
+            self.session['flag_threshold'] = threshold[0]
+            self.df['transaction_flag'] = TransactionFlagger.flags_from_scores(
+                self.session['max_zscore'], self.session['flag_threshold']
+            )
+        if bins is not None:
+            self.session['risk_bins'] = bins
+            self.df['risk_class'] = CustomerRiskScorer.risk_class(self.df['risk_score'], bins)
+        elapsed = (time.perf_counter() - start) * 1000
+
+        print(f"\n{SPACE}⚡ Re-flagged from cached scores in {elapsed:.1f} ms")
+        wait()
+        clear_screen()
+        self.show_summary()
+
+    def investigate_customer(self):
+        """Drill down into one customer's transactions using the sorted customer index."""
+        if not self.info['Loaded']:
+            error("❌ Load data first.")
+            return
+
+        if not self.info['RiskScored'] or self.index is None:
+            error("❌ Run risk scoring first to build the customer index.")
+            return
+
+        show_banner()
+        customer = input(f"\n{SPACE}🔹 Customer ID: ").strip()
+        if not self.index.contains(customer):
+            error(f"⚠️  Customer '{customer}' not found.")
+            return
+
+        sent = self.index.sent(customer)
+        received = self.index.received(customer)
+        flagged = self.index.flagged(customer)
+
+        profile = [
+            ["Sent Transactions", len(sent)],
+            ["Received Transactions", len(received)],
+            ["Total Sent", f"{sent['amount'].sum():,.2f}"],
+            ["Total Received", f"{received['amount'].sum():,.2f}"],
+            ["Flagged Transactions", len(flagged) if self.info['Flagged'] else "-"]
+        ]
+        if len(sent):
+            profile.append(["Risk Score", f"{sent['risk_score'].iloc[0]:.2f}"])
+            profile.append(["Risk Class", sent['risk_class'].iloc[0]])
+
+        history_cols = ['step', 'type', 'nameOrig', 'nameDest', 'amount']
+        if self.info['Flagged']:
+            history_cols.append('transaction_flag')
+
+        print(f"\n{SPACE}🔎 Customer Profile: {customer}\n")
+        print(tabulate(profile, headers=["Metric", "Value"], tablefmt="grid"))
+
+        print(f"\n{SPACE}🤝 Top 10 Counterparties\n")
+        print(tabulate(self.index.counterparties(customer).head(10), headers="keys",
+                       tablefmt="grid", showindex=False))
+
+        if self.info['Flagged']:
+            print(f"\n{SPACE}🚨 Flagged Transactions\n")
+            if flagged.empty:
+                print(f"{SPACE}- No flagged transactions.")
+            else:
+                reason_cols = [col for col in ('flag_reason_1', 'flag_reason_1_zscore') if col in flagged.columns]
+                print(tabulate(flagged[history_cols + reason_cols].head(20), headers="keys",
+                               tablefmt="grid", showindex=False))
+
+        print(f"\n{SPACE}🕒 Latest 20 Transactions\n")
+        print(tabulate(self.index.history(customer)[history_cols].tail(20), headers="keys",
+                       tablefmt="grid", showindex=False))
+        wait()
+
+    def run_out_of_core(self):
+        """Run the full pipeline from disk in sender partitions, within `OUT_OF_CORE_MEMORY_MB`."""
+        show_banner()
+        print(f"\n{SPACE}Memory budget per partition: {OUT_OF_CORE_MEMORY_MB} MiB")
+        try:
+            runner = OutOfCoreRunner(
+                self._requested_features(), data_path=DATA_PATH, output_dir=OUTPUT_PATH,
+                memory_mb=OUT_OF_CORE_MEMORY_MB, spill_dir=OUT_OF_CORE_SPILL_DIR,
+                flag_threshold=self.session['flag_threshold'], risk_bins=self.session['risk_bins']
+            )
+            result = self._run_stage("Out-of-core run", runner.run)
+        except ValueError as e:
+            error(f"❌ {e}")
+            return
+        except OSError as e:
+            error(f"❌ Cannot create the spill directory: {e}")
+            return
+        if result is None:
+            return
+
+        if result['not_matches']:
+            print(f"\n{SPACE}⚠️  Skipped files with a different schema: {', '.join(result['not_matches'])}")
+
+        table = [
+            ["Input Rows", f"{result['rows']:,}"],
+            ["Partitions", result['partitions']],
+            ["Removed Rows", f"{sum(result['stats'].values()):,}"],
+            ["Scored Transactions", f"{result['transactions']:,}"],
+            ["Flagged (Z-score)", f"{result['flagged']:,}"],
+            ["Flagged (Mahalanobis)", f"{result['mahalanobis_flagged']:,}"]
+        ]
+        table += [[f"Risk Class: {label}", f"{count:,}"] for label, count in result['risk_distribution'].items()]
+
+        print(f"\n{SPACE}💾 Out-of-core Run Summary\n")
+        print(tabulate(table, headers=["Metric", "Value"], tablefmt="grid"))
+        print(f"\n{SPACE}📁 Outputs: {result['output_dir']}")
+        wait()
+
+    def run_preview(self):
+        """Estimate the risk class distribution and flag rate from a sample of whole senders."""
+        show_banner()
+        print(f"\n{SPACE}Senders sampled by default: {PREVIEW_FRACTION:.1%}\n")
+        try:
+            fraction = self._ask_float_list(f"{SPACE}🔹 Sample fraction, e.g. 0.02 (Enter to keep): ", 1)
+            runner = PreviewRunner(
+                self._requested_features(), data_path=DATA_PATH,
+                fraction=PREVIEW_FRACTION if fraction is None else fraction[0],
+                flag_threshold=self.session['flag_threshold'], risk_bins=self.session['risk_bins']
+            )
+        except ValueError as e:
+            error(f"⚠️  Invalid input. {e}")
+            return
+
+        try:
+            result = self._run_stage("Preview run", runner.run)
+        except ValueError as e:
+            error(f"❌ {e}")
+            return
+        if result is None:
+            return
+
+        def interval(rate):
+            return f"{rate['estimate']:.3%} [{rate['low']:.3%}, {rate['high']:.3%}]"
+
+        table = [
+            ["Input Rows", f"{result['rows']:,}"],
+            ["Sampled Senders", f"{result['sample_senders']:,}"],
+            ["Sampled Rows (cleaned)", f"{result['sample_rows']:,} ({result['sample_rows'] / result['rows']:.1%})"],
+            ["Removed Rows", f"{sum(result['stats'].values()):,}"],
+            ["Flag Rate (Z-score)", interval(result['flag_rate'])],
+            ["Flag Rate (Mahalanobis)", interval(result['mahalanobis_rate'])]
+        ]
+        classes = [
+            [label, f"{row['count']:,}", interval(row)]
+            for label, row in result['risk_classes'].iterrows()
+        ]
+
+        print(f"\n{SPACE}🔬 Preview from {runner.fraction:.1%} of senders "
+              f"({runner.confidence:.0%} confidence intervals)\n")
+        print(tabulate(table, headers=["Metric", "Estimate"], tablefmt="grid"))
+        print()
+        print(tabulate(classes, headers=["Risk Class", "Sample Rows", "Share of Transactions"], tablefmt="grid"))
+        print(f"\n{SPACE}ℹ️  Session data left unchanged; load and run the pipeline for full results.")
+        wait()
+
+    def run_duckdb_pipeline(self):
+        """Load, clean, featurize, score and flag DATA_PATH as SQL on DuckDB and load the result."""
+        show_banner()
+        try:
+            engine = DuckDBEngine(DATA_PATH)
+        except ImportError:
+            error("❌ DuckDB is not installed. Run: pip install duckdb")
+            return
+
+        requested = self._requested_features()
+
+        def stage(progress):
+            result = engine.run(
+                requested, self.session['flag_threshold'], self.session['risk_bins'], progress=progress
+            )
+            result['index'] = CustomerIndex(result['data_frame'])
+            return result
+
+        try:
+            result = self._run_stage("DuckDB pipeline", stage, total=5, unit='steps')
+        except ValueError as e:
+            engine.close()
+            error(f"❌ {e}")
+            return
+        if result is None:
+            engine.close()
+            return
+
+        self.df = result['data_frame']
+        self.index = result['index']
+        self._set_engine(engine)
+        self.session['max_zscore'] = result['max_zscore']
+        self.info = {key: True for key in self.info}
+
+        table = [["Rows", self.df.shape[0]], ["Columns", self.df.shape[1]],
+                 ["Matched Files", ", ".join(result['matches'])],
+                 ["Invalid Files", ", ".join(result['not_matches'])]]
+        table += [[k.replace("_", " ").title(), v] for k, v in result['stats'].items()]
+        table.append(["Flagged Transactions", int(self.df['transaction_flag'].sum())])
+
+        print(f"\n{SPACE}🦆 DuckDB Pipeline Completed\n")
+        print(tabulate(table, headers=["Metric", "Value"], tablefmt="grid"))
+        wait()
+        clear_screen()
+        self.show_summary()
@@ -0,0 +1,310 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from src.constants.config import (
+    DATA_PATH, SPACE, WATCH_POLL_SECONDS, WATCH_ALERTS_FILE, WATCH_METRICS_FILE,
+    FLAG_ZSCORE_THRESHOLD, RISK_CLASS_BINS, ZSCORE_SEGMENT, ROLLING_WINDOWS
+)
+from src.data_manipulator import DataManager, TransactionCleaner
+from src.features_builder import (
+    FeatureRegistry, CustomerFeaturesBuilder, EWMBaselineBuilder, SketchFeaturesBuilder
+)
+from src.calculations import (
+    CustomerRiskScorer, TransactionFlagger, MahalanobisScorer, SegmentNormalizer, ReasonCodes
+)
+
+
+class DirectoryWatcher:
+    """
+    Watch the dataset directory and score new transaction files in micro-batches.
+
+    On start the files already in the directory are cleaned and featurized
+    once to fit the scoring baseline: the population mean/std of the risk and
+    flag features and the Mahalanobis model. From then on the directory is
+    polled (plain `os.scandir`, no OS notification API); every new CSV (plain
+    or compressed) or JSON Lines file whose size and mtime held still for one
+    poll joins the next micro-batch, which is:
+
+    1. cleaned (`TransactionCleaner.clean`, duplicates removed within the batch),
+    2. featurized together with the earlier rows of its senders, so per-sender
+       aggregates (daily, weekly, rolling windows, ...) see the whole history,
+    3. scored against the fixed baseline, and
+    4. its flagged rows (Z-score or Mahalanobis) appended to the alert file.
+
+    Every batch appends its size, throughput and lag (time from the file's
+    last write to its alerts being written) to the metrics file.
+    Only sender-local features can be built per batch.
+
+    Memory stays bounded: only the rows of the last `HORIZON` steps (whole
+    days) are kept as context, which covers the daily, weekly and rolling
+    aggregates of the next batches. Features over a sender's whole history
+    resume from carried per-sender state instead of its rows: the EW
+    baselines (`EWMBaselineBuilder.export_state`), the distinct-count
+    sketches and the number of active days of the dropped rows. Files are
+    expected in step order; rows older than the kept context only see the
+    carried state.
+    """
+
+    # steps of history kept as context: one week (weekly aggregates) or the longest rolling window
+    HORIZON = max(7 * 24, *ROLLING_WINDOWS.values())
+
+    EXTENSIONS = tuple(DataManager.COMPRESSIONS) + ('.jsonl',)
+
+    ALERT_COLUMNS = [
+        'step', 'type', 'amount', 'nameOrig', 'nameDest', 'risk_score', 'risk_class',
+        'transaction_flag', 'flag_reason_1', 'flag_reason_1_zscore',
+        'mahalanobis_distance', 'mahalanobis_flag'
+    ]
+
+    def __init__(self, requested: list, data_path: str = DATA_PATH,
+                 alerts_path: str = WATCH_ALERTS_FILE, metrics_path: str = WATCH_METRICS_FILE,
+                 poll_seconds: float = WATCH_POLL_SECONDS, flag_threshold: float = FLAG_ZSCORE_THRESHOLD,
+                 risk_bins: list = None, segment: str = ZSCORE_SEGMENT):
+        """Configure the watcher; `requested` are the feature columns to build (as in the console)."""
+        self.requested = requested
+        self.data_path = data_path
+        self.alerts_path = alerts_path
+        self.metrics_path = metrics_path
+        self.poll_seconds = poll_seconds
+        self.flag_threshold = flag_threshold
+        self.risk_bins = list(RISK_CLASS_BINS if risk_bins is None else risk_bins)
+        self.segment = segment
+
+        self.history: Optional[pd.DataFrame] = None
+        # per-sender state of the rows seen so far (see `_remember`)
+        self.ewm_state: Optional[pd.DataFrame] = None
+        self.sketches: Optional[dict] = None
+        self.earlier_days: Optional[pd.Series] = None
+        self.baseline: Optional[dict] = None
+        self.seen: Dict[str, Tuple[int, int]] = {}
+        # files that could not be read, retried once their size or mtime changes
+        self.failed: Dict[str, Tuple[int, int]] = {}
+        self.pending: Dict[str, Tuple[int, int]] = {}
+        self.next_id = 0
+        self.totals = {'batches': 0, 'files': 0, 'rows': 0, 'alerts': 0, 'seconds': 0.0}
+
+    def _files(self) -> Dict[str, Tuple[int, int]]:
+        """Return the (size, mtime_ns) of every CSV (plain or compressed) / JSON Lines file in the directory."""
+        if not os.path.isdir(self.data_path):
+            return {}
+        return {
+            entry.name: (entry.stat().st_size, entry.stat().st_mtime_ns)
+            for entry in os.scandir(self.data_path)
+            if entry.is_file() and entry.name.lower().endswith(DirectoryWatcher.EXTENSIONS)
+        }
+
+    def _ready(self) -> Dict[str, Tuple[int, int]]:
+        """Return the new files whose size and mtime did not change since the previous poll."""
+        current = {
+            name: stat for name, stat in self._files().items()
+            if name not in self.seen and self.failed.get(name) != stat
+        }
+        ready = {name: stat for name, stat in sorted(current.items()) if self.pending.get(name) == stat}
+        self.pending = {name: stat for name, stat in current.items() if name not in ready}
+        return ready
+
+    def _read(self, files: Dict[str, Tuple[int, int]]) -> Tuple[pd.DataFrame, pd.Series]:
+        """Read files into one frame with unique row ids; also return each row's source file."""
+        frames, sources = [], []
+        for name, stat in files.items():
+            try:
+                df = DataManager.read_file(os.path.join(self.data_path, name))
+            except (pd.errors.EmptyDataError, pd.errors.ParserError, UnicodeDecodeError, OSError, ValueError) as e:
+                print(f"{SPACE}⚠️  Skipped {name}: cannot be read ({type(e).__name__}: {e})")
+                self.failed[name] = stat
+                continue
+            self.seen[name] = stat
+            self.failed.pop(name, None)
+            if df is None:
+                print(f"{SPACE}⚠️  Skipped {name}: missing required columns")
+                continue
+            df.index = pd.RangeIndex(self.next_id, self.next_id + len(df))
+            self.next_id += len(df)
+            frames.append(df)
+            sources.append(pd.Series(name, index=df.index))
+
+        if not frames:
+            return pd.DataFrame(), pd.Series(dtype=object)
+        return pd.concat(frames), pd.concat(sources)
+
+    def _planned(self, columns, feature: str) -> bool:
+        """Return True if building the requested features computes `feature`."""
+        return any(feature in entry['outputs'] for entry in FeatureRegistry.plan(columns, self.requested))
+
+    def _context(self, batch: pd.DataFrame) -> pd.DataFrame:
+        """Return the batch's features, computed over the batch and the kept rows of its senders.
+
+        Whole-history features are computed from the carried state and filled
+        in before the build, which then skips them.
+        """
+        if self.history is None:
+            global_features = FeatureRegistry.global_features(batch.columns, self.requested)
+            if global_features:
+                raise ValueError(
+                    f"Features {global_features} depend on other senders' rows and cannot be built per batch."
+                )
+            rows = batch
+        else:
+            earlier = self.history[self.history['nameOrig'].isin(batch['nameOrig'].unique())]
+            rows = pd.concat([earlier, batch])
+
+        if self.ewm_state is not None and self._planned(rows.columns, EWMBaselineBuilder.FEATURES[0]):
+            baselines = EWMBaselineBuilder.compute(batch, state=self.ewm_state)
+            rows = rows.join(pd.DataFrame(baselines, index=batch.index))
+        if self.sketches is not None and self._planned(rows.columns, SketchFeaturesBuilder.FEATURES[0]):
+            sketches = SketchFeaturesBuilder.merge(self.sketches, SketchFeaturesBuilder.sketch(batch))
+            rows = rows.assign(**SketchFeaturesBuilder.compute(rows, sketches))
+
+        features = FeatureRegistry.build(rows, self.requested, stage='customer')
+        if self.earlier_days is not None and 'daily_tx_velocity' in features:
+            features['daily_tx_velocity'] = CustomerFeaturesBuilder.daily_tx_velocity(features, self.earlier_days)
+        return FeatureRegistry.build(features, self.requested)
+
+    def _remember(self, batch: pd.DataFrame, features: pd.DataFrame):
+        """
+        Add a scored batch to the context and drop the rows no later batch needs.
+
+        The whole-history state of the batch's senders is carried forward from
+        its featurized rows `features`; the kept rows are those of the days
+        overlapping the last `HORIZON` steps.
+        """
+        if self._planned(batch.columns, EWMBaselineBuilder.FEATURES[0]):
+            self.ewm_state = EWMBaselineBuilder.export_state(features.loc[batch.index], self.ewm_state)
+        if self._planned(batch.columns, SketchFeaturesBuilder.FEATURES[0]):
+            sketches = SketchFeaturesBuilder.sketch(batch)
+            self.sketches = sketches if self.sketches is None else SketchFeaturesBuilder.merge(self.sketches, sketches)
+
+        history = batch if self.history is None else pd.concat([self.history, batch])
+        day = history['step'] // 24
+        dropped = day < (history['step'].max() - DirectoryWatcher.HORIZON + 1) // 24
+        days = day[dropped].groupby(history.loc[dropped, 'nameOrig']).nunique()
+        self.earlier_days = days if self.earlier_days is None else self.earlier_days.add(days, fill_value=0)
+        self.history = history[~dropped]
+
+    def _fit(self, features: pd.DataFrame):
+        """Fit the scoring baseline on featurized rows."""
+        self.baseline = {
+            'risk': SegmentNormalizer.accumulate(features, CustomerRiskScorer.RISK_FEATURES, self.segment),
+            'flag': SegmentNormalizer.accumulate(features, TransactionFlagger.FLAG_FEATURES, self.segment),
+            'mahalanobis': MahalanobisScorer.fit(features)
+        }
+
+    def _score(self, context: pd.DataFrame, ids: pd.Index) -> pd.DataFrame:
+        """Score the rows `ids` of `context` against the fitted baseline."""
+        risk_z = SegmentNormalizer.transform(
+            context, CustomerRiskScorer.RISK_FEATURES, self.segment, self.baseline['risk']
+        ).abs().loc[ids]
+        flag_z = SegmentNormalizer.transform(
+            context, TransactionFlagger.FLAG_FEATURES, self.segment, self.baseline['flag']
+        ).abs().loc[ids]
+
+        df = CustomerRiskScorer.build(context.loc[ids], self.risk_bins, z_df=risk_z)
+        df = TransactionFlagger.build(
+            df, self.flag_threshold, max_z=flag_z.max(axis=1),
+            reasons=ReasonCodes.top_features(flag_z, 'flag_reason')
+        )
+        return MahalanobisScorer.build(df, model=self.baseline['mahalanobis'])
+
+    @staticmethod
+    def _append(df: pd.DataFrame, path: str):
+        """Append rows to a CSV file, writing the header if the file is new."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        df.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+    def start(self):
+        """Fit the baseline on the files already in the directory and mark them as seen."""
+        files = dict(sorted(self._files().items()))
+        batch, _ = self._read(files)
+        if not len(batch):
+            print(f"{SPACE}⚠️  No data to fit the baseline yet; the first batch will be used.")
+            return
+
+        batch = TransactionCleaner.clean(batch)['cleaned_data']
+        features = self._context(batch)
+        self._fit(features)
+        self._remember(batch, features)
+        print(f"{SPACE}📐 Baseline fitted on {len(batch):,} rows from {len(files)} file(s)")
+
+    def poll(self) -> Optional[dict]:
+        """
+        Run one polling round: score the files that became ready, if any.
+
+        Returns
+        -------
+        Optional[dict]
+            The batch metrics, or None if no file was ready.
+        """
+        files = self._ready()
+        if not files:
+            return None
+
+        started = time.time()
+        raw, sources = self._read(files)
+        metrics = {
+            'batch_at': datetime.now().isoformat(timespec='seconds'),
+            'files': len(files), 'rows': len(raw), 'cleaned_rows': 0, 'alerts': 0
+        }
+
+        if len(raw):
+            batch = TransactionCleaner.clean(raw)['cleaned_data']
+            context = self._context(batch)
+            if self.baseline is None:
+                self._fit(context)
+            scored = self._score(context, batch.index)
+            self._remember(batch, context)
+
+            alerts = scored[(scored['transaction_flag'] == 1) | (scored['mahalanobis_flag'] == 1)]
+            alerts = alerts[[col for col in DirectoryWatcher.ALERT_COLUMNS if col in alerts.columns]]
+            alerts.insert(0, 'source_file', sources.loc[alerts.index].to_numpy())
+            alerts.insert(0, 'detected_at', metrics['batch_at'])
+            DirectoryWatcher._append(alerts, self.alerts_path)
+            metrics.update(cleaned_rows=len(batch), alerts=len(alerts))
+
+        finished = time.time()
+        lags = [finished - mtime_ns / 1e9 for _, mtime_ns in files.values()]
+        metrics.update(
+            seconds=round(finished - started, 3),
+            rows_per_second=round(metrics['rows'] / max(finished - started, 1e-9), 1),
+            max_lag_seconds=round(max(lags), 3),
+            mean_lag_seconds=round(float(np.mean(lags)), 3)
+        )
+        DirectoryWatcher._append(pd.DataFrame([metrics]), self.metrics_path)
+
+        self.totals['batches'] += 1
+        for key in ('files', 'rows', 'alerts', 'seconds'):
+            self.totals[key] += metrics[key]
+        print(
+            f"{SPACE}📥 [{metrics['batch_at']}] {metrics['files']} file(s), {metrics['rows']:,} rows, "
+            f"{metrics['alerts']:,} alerts, {metrics['rows_per_second']:,.0f} rows/s, "
+            f"lag {metrics['max_lag_seconds']:.1f}s"
+        )
+        return metrics
+
+    def run(self, max_batches: int = None):
+        """Fit the baseline, then poll until interrupted (Ctrl+C) or `max_batches` batches ran."""
+        self.start()
+        print(f"{SPACE}👀 Watching '{self.data_path}' every {self.poll_seconds}s (Ctrl+C to stop)")
+        try:
+            while max_batches is None or self.totals['batches'] < max_batches:
+                try:
+                    metrics = self.poll()
+                except Exception as e:
+                    # the batch's files stay seen: log it and keep watching for new ones
+                    print(f"{SPACE}❌ Batch failed ({type(e).__name__}: {e}); its files were skipped")
+                    metrics = None
+                if metrics is None:
+                    time.sleep(self.poll_seconds)
+        except KeyboardInterrupt:
+            pass
+
+        seconds = self.totals['seconds']
+        print(
+            f"{SPACE}🛑 Stopped after {self.totals['batches']} batch(es): {self.totals['files']} file(s), "
+            f"{self.totals['rows']:,} rows, {self.totals['alerts']:,} alerts"
+            + (f", {self.totals['rows'] / seconds:,.0f} rows/s" if seconds else "")
+        )
@@ -0,0 +1,419 @@
+import os
+import pandas as pd
+from src.constants.config import (
+    DATA_PATH, COLUMNS, NUMERIC_COLUMNS, CATEGORICAL_COLUMNS, E, ROLLING_WINDOWS,
+    FLAG_ZSCORE_THRESHOLD, RISK_CLASS_BINS, RISK_CLASS_LABELS, ZSCORE_SEGMENT,
+    ACTIVITY_TIER_BINS, DUCKDB_THREADS, DUCKDB_MEMORY_LIMIT
+)
+from src.data_manipulator import DataManager
+from src.features_builder import FeatureRegistry
+from src.calculations import (
+    CustomerRiskScorer, TransactionFlagger, MahalanobisScorer, SegmentNormalizer, ReasonCodes
+)
+from src.report_generator import ReportGenerator
+
+
+def _window(partition: str, order: str = '', frame: str = '') -> str:
+    """Return an OVER clause."""
+    return f"OVER ({' '.join(part for part in (partition, order, frame) if part)})"
+
+
+SENDER_DAY = _window('PARTITION BY nameOrig, day')
+SENDER_WEEK = _window('PARTITION BY nameOrig, week')
+
+
+def _rolling(size: int) -> str:
+    """Window of the sender's transactions in the last `size` steps, (step - size, step]."""
+    return _window('PARTITION BY nameOrig', 'ORDER BY step', f'RANGE BETWEEN {size - 1} PRECEDING AND CURRENT ROW')
+
+
+class DuckDBEngine:
+    """
+    Run the pipeline as SQL on an embedded DuckDB database instead of pandas.
+
+    DuckDB reads the CSV files itself and executes cleaning, the customer and
+    transaction features, the Z-scores, risk scores and flags as vectorized
+    window queries on all cores, spilling to disk when the data outgrows
+    `DUCKDB_MEMORY_LIMIT`. Only the final table is handed to pandas, where the
+    reason codes and the Mahalanobis score (a matrix inverse) are added, so the
+    result has the same columns, order and index as the pandas pipeline.
+
+    Every registered feature with an SQL expression in `FEATURE_SQL` can be
+    built; `None` marks helper columns the window clauses make unnecessary.
+    Features with recursive or graph definitions (EWM baselines, graph and
+    sketch features) have no SQL form and are rejected.
+    """
+
+    # pandas' default NA markers, so the same fields count as missing
+    NA_VALUES = [
+        '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND',
+        '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+    ]
+
+    FEATURE_SQL = {
+        'day': "step // 24",
+        'week': "day // 7",
+        'sender_day_group': None,
+        'sender_week_group': None,
+        'daily_tx_count_sender': f"count(*) {SENDER_DAY}",
+        'daily_total_amount_sender': f"sum(amount) {SENDER_DAY}",
+        'weekly_tx_count_sender': f"count(*) {SENDER_WEEK}",
+        'weekly_avg_amount_sender': f"avg(amount) {SENDER_WEEK}",
+        'daily_tx_velocity':
+            f"daily_tx_count_sender / (count(DISTINCT day) {_window('PARTITION BY nameOrig')} + {E})",
+        'balance_gap_sender': "oldbalanceOrg - amount - newbalanceOrig",
+        **{
+            f'{stat}_{window}_sender': f"{aggregate} {_rolling(size)}"
+            for window, size in ROLLING_WINDOWS.items()
+            for stat, aggregate in (('tx_count', 'count(*)'), ('tx_amount', 'sum(amount)'))
+        },
+        'amount_weekly_ratio': f"amount / (weekly_avg_amount_sender + {E})",
+        'amount_daily_ratio': f"amount / (daily_total_amount_sender + {E})",
+        'transaction_share_of_day': f"1 / (daily_tx_count_sender + {E})",
+        'balance_change_ratio_sender': f"amount / (oldbalanceOrg + {E})"
+    }
+
+    def __init__(self, data_path: str = DATA_PATH, threads: int = DUCKDB_THREADS,
+                 memory_limit: str = DUCKDB_MEMORY_LIMIT):
+        """Open an in-memory DuckDB database; `threads` None uses every core."""
+        import duckdb
+
+        self.data_path = data_path
+        self.con = duckdb.connect()
+        if threads is not None:
+            self.con.execute(f"SET threads = {int(threads)}")
+        if memory_limit is not None:
+            self.con.execute("SET memory_limit = ?", [memory_limit])
+
+    @staticmethod
+    def _quote(name: str) -> str:
+        """Quote an identifier."""
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def _literal(value: str) -> str:
+        """Quote a string literal."""
+        return "'" + value.replace("'", "''") + "'"
+
+    @staticmethod
+    def _positioned(df: pd.DataFrame) -> pd.DataFrame:
+        """`df` with its row position as `report_position`, since a scan does not keep row order."""
+        return df.assign(report_position=range(len(df)))
+
+    @staticmethod
+    def _first(expression: str) -> str:
+        """Aggregate taking the first non-null `expression` in row order, like pandas `first`."""
+        return f"first({expression} ORDER BY report_position) FILTER (WHERE {expression} IS NOT NULL)"
+
+    def load(self) -> dict:
+        """
+        Read every valid CSV file of the data directory into the `raw` table.
+
+        Files are validated on their header like `DataManager.read_csv`, and
+        only the columns it parses are selected. The required columns are
+        read as text so cleaning decides what is valid; the label keeps
+        DuckDB's inferred type. `file_id` / `row_id`
+        record the file order and the row's position in its file (the index
+        pandas gives it). `.csv.gz` and `.zst` files are decompressed by
+        DuckDB itself; `.zip` archives are not supported.
+
+        Returns
+        -------
+        dict
+            'matches' / 'not_matches': valid and invalid file names.
+
+        Raises
+        ------
+        ValueError
+            If there is no valid file or one of them is a `.zip` archive.
+        """
+        info = {'matches': [], 'not_matches': []}
+        selects = []
+        for file in DataManager._csv_files(DataManager._get_all_files(self.data_path)):
+            path = os.path.join(self.data_path, file)
+            if DataManager._compression(path) == 'zip':
+                raise ValueError(f"DuckDB cannot read zip archives ('{file}'); use .csv.gz or .zst instead.")
+            header = DataManager.header(path)
+            if not DataManager._valid_columns_name(header):
+                info['not_matches'].append(file)
+                continue
+            info['matches'].append(file)
+            columns = ', '.join(self._quote(col) for col in DataManager._projection(header))
+            selects.append(
+                f"SELECT {len(selects)} AS file_id, row_number() OVER () - 1 AS row_id, {columns} "
+                f"FROM read_csv({self._literal(path)}, header = true, "
+                f"types = {{{', '.join(f'{self._literal(col)}: VARCHAR' for col in COLUMNS)}}}, "
+                f"nullstr = [{', '.join(self._literal(value) for value in self.NA_VALUES)}])"
+            )
+
+        if not selects:
+            raise ValueError(f"No CSV file with the required columns in '{self.data_path}'.")
+        self.con.execute(f"CREATE OR REPLACE TABLE raw AS {' UNION ALL BY NAME '.join(selects)}")
+        return info
+
+    def clean(self) -> dict:
+        """
+        Apply `TransactionCleaner.clean` as SQL, from `raw` into the `cleaned` table.
+
+        Returns
+        -------
+        dict
+            The same statistics as the pandas cleaning.
+        """
+        columns = [name for name in self._columns('raw') if name not in ('file_id', 'row_id')]
+        q = {name: self._quote(name) for name in columns}
+
+        casts = {
+            col: f"TRY_CAST(trim({q[col]}) AS DOUBLE)" for col in NUMERIC_COLUMNS
+        }
+        typed = {
+            col: (f"TRY_CAST(trunc({casts[col]}) AS BIGINT)" if NUMERIC_COLUMNS[col] is int else casts[col])
+            for col in NUMERIC_COLUMNS
+        }
+        typed.update({col: f"trim({q[col]})" for col in CATEGORICAL_COLUMNS})
+
+        not_missing = ' AND '.join(f"{q[col]} IS NOT NULL" for col in columns)
+        valid_types = ' AND '.join(f"{q[col]} IS NOT NULL" for col in NUMERIC_COLUMNS)
+        valid_values = ' AND '.join(f"{q[col]} >= 0" for col in NUMERIC_COLUMNS)
+        select = ', '.join(f"{typed.get(col, q[col])} AS {q[col]}" for col in columns)
+        every_column = ', '.join(q.values())
+
+        self.con.execute(f"""
+            CREATE OR REPLACE TEMP TABLE staged AS
+            SELECT * EXCLUDE (present),
+                   CASE WHEN NOT present THEN 'missing'
+                        WHEN NOT ({valid_types}) THEN 'invalid_types'
+                        WHEN NOT ({valid_values}) THEN 'invalid_values' END AS rejected
+            FROM (SELECT file_id, row_id, {select}, {not_missing} AS present FROM raw)
+        """)
+        # duplicates keep their first occurrence, like `drop_duplicates`
+        self.con.execute(f"""
+            CREATE OR REPLACE TABLE cleaned AS
+            SELECT first_seen.file_id AS file_id, first_seen.row_id AS row_id, {every_column}
+            FROM (
+                SELECT min({{'file_id': file_id, 'row_id': row_id}}) AS first_seen, {every_column}
+                FROM staged
+                WHERE rejected IS NULL
+                GROUP BY {every_column}
+            )
+        """)
+
+        counts = dict(self.con.execute("SELECT rejected, count(*) FROM staged GROUP BY rejected").fetchall())
+        remaining = self.con.execute("SELECT count(*) FROM cleaned").fetchone()[0]
+        self.con.execute("DROP TABLE staged")
+        return {
+            'removed_missing': counts.get('missing', 0),
+            'removed_invalid_types': counts.get('invalid_types', 0),
+            'removed_invalid_values': counts.get('invalid_values', 0),
+            'removed_duplicates': counts.get(None, 0) - remaining
+        }
+
+    def _columns(self, table: str) -> list:
+        """Return the column names of a table."""
+        return [row[0] for row in self.con.execute(f"DESCRIBE {table}").fetchall()]
+
+    def build_features(self, requested: list):
+        """
+        Build the requested features and their inputs into the `features` table.
+
+        The columns are resolved with `FeatureRegistry.plan` and added in the
+        same order as the console's customer and transaction stages.
+
+        Raises
+        ------
+        ValueError
+            If a needed feature has no SQL expression.
+        """
+        columns = self._columns('cleaned')
+        plan = FeatureRegistry.plan(columns, requested)
+        entries = [e for e in plan if e['stage'] == 'customer'] + [e for e in plan if e['stage'] != 'customer']
+
+        unsupported = [
+            name for entry in entries for name in entry['outputs'] if name not in DuckDBEngine.FEATURE_SQL
+        ]
+        if unsupported:
+            raise ValueError(f"Features {unsupported} cannot be computed by the DuckDB engine.")
+
+        query = "SELECT * FROM cleaned"
+        for entry in entries:
+            outputs = [name for name in entry['outputs'] if DuckDBEngine.FEATURE_SQL[name] is not None]
+            if outputs:
+                added = ', '.join(f"{DuckDBEngine.FEATURE_SQL[name]} AS {self._quote(name)}" for name in outputs)
+                query = f"SELECT *, {added} FROM ({query})"
+        self.con.execute(f"CREATE OR REPLACE TABLE features AS {query}")
+
+    @staticmethod
+    def _zscore(feature: str, segment: str) -> str:
+        """Return the SQL absolute Z-score of a feature, within its segment if one is given."""
+        col = DuckDBEngine._quote(feature)
+        partition = '' if segment is None else 'PARTITION BY segment'
+        mean = f"avg({col}) {_window(partition)}"
+        std = f"stddev_pop({col}) {_window(partition)}"
+        if segment is not None:
+            std = f"CASE WHEN {std} > {SegmentNormalizer.SPREAD_TOLERANCE} * abs({mean}) THEN {std} END"
+        z = f"abs(({col} - {mean}) / nullif({std}, 0))"
+        return f"CASE WHEN isfinite({z}) THEN {z} END"
+
+    @staticmethod
+    def _segment(segment: str) -> str:
+        """Return the SQL segment label of every row (see `SegmentNormalizer.segment_values`)."""
+        if segment is None:
+            return "0"
+        if segment == 'type':
+            return "type"
+        if segment == 'activity_tier':
+            count = f"count(*) {_window('PARTITION BY nameOrig')}"
+            return ' + '.join(f"CAST({count} > {edge} AS INTEGER)" for edge in ACTIVITY_TIER_BINS)
+        raise ValueError(f"Unknown segment '{segment}', expected one of {SegmentNormalizer.SEGMENTS}.")
+
+    def score(self, threshold: float = FLAG_ZSCORE_THRESHOLD, bins: list = None,
+              segment: str = ZSCORE_SEGMENT):
+        """
+        Compute the risk and flag Z-scores, `risk_score`, `risk_class`, the row-wise max
+        flag Z-score and `transaction_flag` into the `scored` table.
+
+        Z-score columns are kept as `z_risk_<feature>` / `z_flag_<feature>` for
+        the reason codes.
+        """
+        edges = RISK_CLASS_BINS if bins is None else bins
+        risk = CustomerRiskScorer.RISK_FEATURES
+        flag = TransactionFlagger.FLAG_FEATURES
+
+        zscores = ', '.join(
+            [f"{self._zscore(f, segment)} AS {self._quote('z_risk_' + f)}" for f in risk]
+            + [f"{self._zscore(f, segment)} AS {self._quote('z_flag_' + f)}" for f in flag]
+        )
+        risk_list = ', '.join(self._quote('z_risk_' + f) for f in risk)
+        flag_list = ', '.join(self._quote('z_flag_' + f) for f in flag)
+        classes = ' '.join(
+            f"WHEN risk_score <= {edge} THEN {self._literal(label)}"
+            for edge, label in zip(edges, RISK_CLASS_LABELS)
+        )
+
+        self.con.execute(f"""
+            CREATE OR REPLACE TABLE scored AS
+            SELECT *,
+                   CASE {classes} WHEN risk_score IS NOT NULL THEN {self._literal(RISK_CLASS_LABELS[-1])} END
+                       AS risk_class,
+                   CAST(coalesce(max_zscore > {threshold}, false) AS BIGINT) AS transaction_flag
+            FROM (
+                SELECT *, list_avg([{risk_list}]) AS risk_score, list_max([{flag_list}]) AS max_zscore
+                FROM (SELECT * EXCLUDE (segment), {zscores}
+                      FROM (SELECT *, {self._segment(segment)} AS segment FROM features))
+            )
+        """)
+
+    def fetch(self) -> dict:
+        """
+        Return the scored table as the pandas pipeline would have it.
+
+        Returns
+        -------
+        dict
+            'data_frame': rows in input order, indexed by their position in
+            their file, with reason codes and the Mahalanobis score added;
+            'max_zscore': the row-wise max flag Z-score.
+        """
+        df = self.con.execute("SELECT * FROM scored ORDER BY file_id, row_id").df()
+        df = df.set_index('row_id').drop(columns='file_id').rename_axis(None)
+
+        z = {}
+        for prefix, features in (('risk', CustomerRiskScorer.RISK_FEATURES),
+                                 ('flag', TransactionFlagger.FLAG_FEATURES)):
+            columns = [f"z_{prefix}_{feature}" for feature in features]
+            z[prefix] = df[columns].set_axis(features, axis=1)
+            df = df.drop(columns=columns)
+        max_z = df.pop('max_zscore')
+        flags = df.pop('transaction_flag')
+
+        df['risk_class'] = pd.Categorical(df['risk_class'], categories=RISK_CLASS_LABELS, ordered=True)
+        reasons = ReasonCodes.top_features(z['risk'], 'risk_reason')
+        df[reasons.columns] = reasons
+        df['transaction_flag'] = flags
+        reasons = ReasonCodes.top_features(z['flag'], 'flag_reason')
+        df[reasons.columns] = reasons
+
+        return {'data_frame': MahalanobisScorer.build(df), 'max_zscore': max_z}
+
+    def run(self, requested: list, threshold: float = FLAG_ZSCORE_THRESHOLD, bins: list = None,
+            segment: str = ZSCORE_SEGMENT, progress=None) -> dict:
+        """
+        Load, clean, featurize and score the data directory.
+
+        `progress` (optional StageProgress) advances by one per step (5 steps).
+
+        Returns
+        -------
+        dict
+            'data_frame' and 'max_zscore' (see `fetch`), 'matches' /
+            'not_matches' (see `load`) and the cleaning 'stats'.
+        """
+        steps = [
+            self.load,
+            self.clean,
+            lambda: self.build_features(requested),
+            lambda: self.score(threshold, bins, segment),
+            self.fetch
+        ]
+        results = []
+        for step in steps:
+            results.append(step())
+            if progress is not None:
+                progress.update(1)
+                progress.check()
+
+        info, stats, _, _, fetched = results
+        return {**fetched, **info, 'stats': stats}
+
+    def customer_risk_table(self, df: pd.DataFrame) -> pd.DataFrame:
+        """SQL version of `ReportGenerator.customer_risk_table`, over a scored DataFrame."""
+        reason_cols = [col for col in df.columns if col.startswith('risk_reason_')]
+        reasons = ''.join(f", {self._first(self._quote(col))} AS {self._quote(col)}" for col in reason_cols)
+        self.con.register('report_rows', self._positioned(df))
+        try:
+            table = self.con.execute(f"""
+                SELECT *,
+                       round_even(flagged_count / transaction_count * 100, 2) AS flagged_percentage,
+                       rank() OVER (ORDER BY risk_score DESC) AS risk_rank
+                FROM (
+                    SELECT nameOrig AS customer_id,
+                           sum(amount) AS total_amount,
+                           avg(amount) AS avg_amount,
+                           count(*) AS transaction_count,
+                           max(amount) AS max_transaction,
+                           CAST(sum(transaction_flag) AS BIGINT) AS flagged_count,
+                           {self._first('risk_score')} AS risk_score,
+                           {self._first('CAST(risk_class AS VARCHAR)')} AS risk_class{reasons}
+                    FROM report_rows
+                    GROUP BY nameOrig
+                )
+                ORDER BY risk_score DESC, customer_id
+            """).df()
+        finally:
+            self.con.unregister('report_rows')
+        return table
+
+    def flagged_table(self, df: pd.DataFrame) -> pd.DataFrame:
+        """SQL version of `ReportGenerator.flagged_table`, over a scored DataFrame."""
+        columns = ReportGenerator.flagged_columns(list(df.columns) + ['pct_of_customer_volume'])
+        cols = [self._quote(col) for col in columns]
+        self.con.register('report_rows', self._positioned(df))
+        try:
+            table = self.con.execute(f"""
+                SELECT {', '.join(cols)}
+                FROM (
+                    SELECT *,
+                           round_even(amount / sum(amount) OVER (PARTITION BY nameOrig) * 100, 2)
+                               AS pct_of_customer_volume
+                    FROM report_rows
+                )
+                WHERE transaction_flag = 1
+                ORDER BY report_position
+            """).df()
+        finally:
+            self.con.unregister('report_rows')
+        return table
+
+    def close(self):
+        """Close the database."""
+        self.con.close()
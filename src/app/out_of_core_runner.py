@@ -0,0 +1,173 @@
+import os
+import glob
+import shutil
+import tempfile
+import pandas as pd
+from src.constants.config import (
+    DATA_PATH, OUTPUT_PATH, OUT_OF_CORE_MEMORY_MB, ZSCORE_SEGMENT,
+    FLAG_ZSCORE_THRESHOLD, RISK_CLASS_BINS, RISK_CLASS_LABELS
+)
+from src.data_manipulator import SenderPartitioner
+from src.features_builder import FeatureRegistry
+from src.calculations import (
+    CustomerRiskScorer, TransactionFlagger, MahalanobisScorer, SegmentNormalizer, ReasonCodes
+)
+from src.report_generator import ReportGenerator
+
+
+class OutOfCoreRunner:
+    """
+    Run the whole pipeline on data larger than memory.
+
+    The cleaned rows are partitioned by sender into spill files
+    (`SenderPartitioner`), so every per-sender aggregate sees all of a sender's
+    rows while only one partition is in memory at a time. Two passes follow:
+
+    1. Features: each partition gets its features built and is spilled again,
+       while the population statistics the scorers need (Z-score mean/std and
+       the Mahalanobis covariance) are merged across partitions.
+    2. Scoring: each partition is scored against those global statistics and
+       written to the output directory.
+
+    Results match the in-memory pipeline, up to floating-point rounding of the
+    merged statistics. Only sender-local features can be built this way.
+    """
+
+    def __init__(self, requested: list, data_path: str = DATA_PATH, output_dir: str = OUTPUT_PATH,
+                 memory_mb: int = OUT_OF_CORE_MEMORY_MB, spill_dir: str = None,
+                 flag_threshold: float = FLAG_ZSCORE_THRESHOLD, risk_bins: list = None,
+                 segment: str = ZSCORE_SEGMENT):
+        """Configure a run; `requested` are the feature columns to build (as in the console)."""
+        self.requested = requested
+        self.data_path = data_path
+        self.output_dir = os.path.join(output_dir, 'out_of_core')
+        # parent of the spill directory each run creates and deletes (None = system temp directory)
+        self.spill_dir = spill_dir
+        self.memory_mb = memory_mb
+        self.flag_threshold = flag_threshold
+        self.risk_bins = list(RISK_CLASS_BINS if risk_bins is None else risk_bins)
+        self.segment = segment
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    def _check_features(self, columns):
+        """Raise ValueError if a requested feature needs rows of other senders."""
+        global_features = FeatureRegistry.global_features(columns, self.requested)
+        if global_features:
+            raise ValueError(
+                f"Features {global_features} depend on other senders' rows and cannot be built out of core."
+            )
+
+    def _featurize(self, partitioner: SenderPartitioner, spill_dir: str, progress=None) -> dict:
+        """First pass: build features per partition, spill them to `spill_dir` and gather the global scoring statistics."""
+        stats = {'flag': None, 'risk': None, 'mahalanobis': None, 'removed_duplicates': 0, 'files': {}}
+
+        for part in partitioner:
+            loaded = partitioner.load(part)
+            stats['removed_duplicates'] += loaded['number_of_removed_samples']
+            df = loaded['cleaned_data']
+            if not stats['files']:
+                self._check_features(df.columns)
+
+            df = FeatureRegistry.build(df, self.requested, stage='customer')
+            df = FeatureRegistry.build(df, self.requested)
+            stats['flag'] = SegmentNormalizer.accumulate(
+                df, TransactionFlagger.FLAG_FEATURES, self.segment, stats['flag']
+            )
+            stats['risk'] = SegmentNormalizer.accumulate(
+                df, CustomerRiskScorer.RISK_FEATURES, self.segment, stats['risk']
+            )
+            stats['mahalanobis'] = MahalanobisScorer.accumulate(df, stats['mahalanobis'])
+
+            path = os.path.join(spill_dir, f"featured_{part:05d}.pkl")
+            df.to_pickle(path)
+            stats['files'][part] = path
+            for file in partitioner.files.pop(part):
+                os.remove(file)
+
+            if progress is not None:
+                progress.update(len(df))
+                progress.check()
+        return stats
+
+    def _score(self, stats: dict, progress=None) -> dict:
+        """Second pass: score every featured partition and write it out."""
+        model = MahalanobisScorer.finalize(stats['mahalanobis'])
+        for stale in glob.glob(os.path.join(self.output_dir, 'transactions_*.csv')):
+            os.remove(stale)
+        customers, risk_classes, paths = [], [], []
+        summary = {'transactions': 0, 'flagged': 0, 'mahalanobis_flagged': 0}
+
+        for part, path in sorted(stats['files'].items()):
+            df = pd.read_pickle(path)
+
+            risk_z = SegmentNormalizer.transform(
+                df, CustomerRiskScorer.RISK_FEATURES, self.segment, stats['risk']
+            ).abs()
+            df = CustomerRiskScorer.build(df, self.risk_bins, z_df=risk_z)
+
+            flag_z = SegmentNormalizer.transform(
+                df, TransactionFlagger.FLAG_FEATURES, self.segment, stats['flag']
+            ).abs()
+            df = TransactionFlagger.build(
+                df, self.flag_threshold, max_z=flag_z.max(axis=1),
+                reasons=ReasonCodes.top_features(flag_z, 'flag_reason')
+            )
+            df = MahalanobisScorer.build(df, model=model)
+
+            out = os.path.join(self.output_dir, f"transactions_{part:05d}.csv")
+            df.to_csv(out, index_label='row_id')
+            paths.append(out)
+
+            customers.append(ReportGenerator.customer_risk_table(df))
+            risk_classes.append(df['risk_class'].value_counts())
+            summary['transactions'] += len(df)
+            summary['flagged'] += int(df['transaction_flag'].sum())
+            summary['mahalanobis_flagged'] += int(df['mahalanobis_flag'].sum())
+            os.remove(path)
+
+            if progress is not None:
+                progress.update(len(df))
+                progress.check()
+
+        customer_table = pd.concat(customers) if customers else pd.DataFrame()
+        if len(customer_table):
+            customer_table['risk_rank'] = customer_table['risk_score'].rank(
+                ascending=False, method='min'
+            ).astype(int)
+            customer_table = customer_table.sort_values('risk_score', ascending=False, kind='stable')
+        summary['customers_csv'] = os.path.join(self.output_dir, 'customer_risk_summary.csv')
+        customer_table.to_csv(summary['customers_csv'], index=False)
+
+        summary['risk_distribution'] = (
+            pd.concat(risk_classes, axis=1).sum(axis=1) if risk_classes else pd.Series(dtype=int)
+        ).reindex(RISK_CLASS_LABELS, fill_value=0).astype(int)
+        summary['transaction_files'] = paths
+        return summary
+
+    def run(self, progress=None) -> dict:
+        """
+        Partition, featurize and score the dataset, then delete the spill files.
+
+        Returns
+        -------
+        dict
+            Input rows, partition count, cleaning statistics, scored and
+            flagged counts, risk class distribution and output paths.
+            Scored rows are written per partition as
+            `out_of_core/transactions_<partition>.csv`; `row_id` is the row's
+            position in the input, to restore the original order.
+        """
+        spill_dir = tempfile.mkdtemp(prefix='fraudlens_spill_', dir=self.spill_dir)
+        try:
+            partitioner = SenderPartitioner(os.path.join(spill_dir, 'raw'), self.memory_mb)
+            result = partitioner.partition(self.data_path, progress=progress)
+            if progress is not None:
+                progress.set_total(3 * result['rows'])
+
+            stats = self._featurize(partitioner, spill_dir, progress)
+            result['stats']['removed_duplicates'] = stats['removed_duplicates']
+            result.update(self._score(stats, progress))
+            result['output_dir'] = self.output_dir
+            return result
+        finally:
+            shutil.rmtree(spill_dir, ignore_errors=True)
@@ -0,0 +1,79 @@
+from src.constants.config import (
+    DATA_PATH, PREVIEW_FRACTION, PREVIEW_SEED, PREVIEW_CONFIDENCE,
+    FLAG_ZSCORE_THRESHOLD, RISK_CLASS_BINS, ZSCORE_SEGMENT
+)
+from src.data_manipulator import SenderSampler, TransactionCleaner
+from src.features_builder import FeatureRegistry
+from src.calculations import CustomerRiskScorer, TransactionFlagger, MahalanobisScorer, SampleEstimator
+
+
+class PreviewRunner:
+    """
+    Run the pipeline on a sample of whole senders to preview its outcome.
+
+    The dataset is streamed once and only the rows of a `fraction` of the
+    senders are kept (`SenderSampler`), so per-sender features are exact
+    on the sample. The sample is cleaned, featurized, scored and flagged
+    like the full data; Z-score statistics are estimated from the sample.
+    The risk class distribution and the flag rate are reported as
+    population estimates with confidence intervals (`SampleEstimator`).
+    Only sender-local features can be built this way.
+    """
+
+    def __init__(self, requested: list, data_path: str = DATA_PATH, fraction: float = PREVIEW_FRACTION,
+                 seed: int = PREVIEW_SEED, confidence: float = PREVIEW_CONFIDENCE,
+                 flag_threshold: float = FLAG_ZSCORE_THRESHOLD, risk_bins: list = None,
+                 segment: str = ZSCORE_SEGMENT):
+        """Configure a preview; `requested` are the feature columns to build (as in the console)."""
+        if not 0 < fraction <= 1:
+            raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}.")
+        self.requested = requested
+        self.data_path = data_path
+        self.fraction = fraction
+        self.seed = seed
+        self.confidence = confidence
+        self.flag_threshold = flag_threshold
+        self.risk_bins = list(RISK_CLASS_BINS if risk_bins is None else risk_bins)
+        self.segment = segment
+
+    def run(self, progress=None) -> dict:
+        """
+        Sample, clean, featurize, score and flag, then estimate the population rates.
+
+        Returns
+        -------
+        dict
+            Input rows, sampled rows and senders, cleaning statistics, the
+            `SampleEstimator.summarize` estimates ('risk_classes',
+            'flag_rate', 'mahalanobis_rate') and the scored sample.
+        """
+        sampled = SenderSampler.sample(self.data_path, self.fraction, self.seed, progress=progress)
+        if not len(sampled['data_frame']):
+            raise ValueError("The sample is empty; increase the sample fraction.")
+
+        cleaned = TransactionCleaner.clean(sampled['data_frame'])
+        df = cleaned['cleaned_data']
+        global_features = FeatureRegistry.global_features(df.columns, self.requested)
+        if global_features:
+            raise ValueError(
+                f"Features {global_features} depend on other senders' rows and cannot be built on a sample."
+            )
+        if progress is not None:
+            progress.check()
+
+        df = FeatureRegistry.build(df, self.requested, stage='customer')
+        df = FeatureRegistry.build(df, self.requested)
+        df = CustomerRiskScorer.build(df, self.risk_bins, segment=self.segment)
+        df = TransactionFlagger.build(df, self.flag_threshold, segment=self.segment)
+        df = MahalanobisScorer.build(df)
+
+        return {
+            'rows': sampled['rows'],
+            'matches': sampled['matches'],
+            'not_matches': sampled['not_matches'],
+            'sample_rows': len(df),
+            'sample_senders': int(df['nameOrig'].nunique()),
+            'stats': cleaned['stats'],
+            **SampleEstimator.summarize(df, self.fraction, self.confidence),
+            'data_frame': df
+        }
@@ -0,0 +1,124 @@
+import threading
+import msvcrt
+from typing import Callable, Optional
+from tqdm import tqdm
+from src.constants import SPACE, ESC
+
+
+class StageCancelled(Exception):
+    """Raised inside a running stage once the user has requested cancellation."""
+
+
+class StageProgress:
+    """
+    Progress handle shared between the UI thread and a stage running on a worker.
+
+    Stages report processed work with `update` after every chunk and call `check`
+    between chunks. Cancellation is cooperative: `check` raises StageCancelled
+    once `cancel` was called, so a stage is only interrupted at chunk boundaries.
+    """
+
+    def __init__(self, desc: str, total: Optional[int] = None, unit: str = 'rows'):
+        """Create a tqdm bar showing processed units, throughput and ETA."""
+        self._cancelled = threading.Event()
+        self._bar = tqdm(
+            total=total,
+            desc=f"{SPACE}{desc}",
+            unit=f" {unit}",
+            unit_scale=True,
+            dynamic_ncols=True
+        )
+
+    @property
+    def cancelled(self) -> bool:
+        """Return True once cancellation has been requested."""
+        return self._cancelled.is_set()
+
+    def set_total(self, total: int):
+        """Update the expected amount of work (e.g. once a row estimate is known)."""
+        self._bar.total = total
+        self._bar.refresh()
+
+    def update(self, n: int = 1):
+        """Advance the bar by `n` processed units."""
+        self._bar.update(n)
+
+    def check(self):
+        """Raise StageCancelled if the user asked to stop the stage."""
+        if self._cancelled.is_set():
+            raise StageCancelled()
+
+    def cancel(self):
+        """Request cancellation; the stage stops at its next `check`."""
+        self._cancelled.set()
+
+    def close(self):
+        """Close the underlying progress bar."""
+        self._bar.close()
+
+
+class StageRunner:
+    """
+    Run a long pipeline stage on a background worker thread.
+
+    The UI thread keeps polling the keyboard while the worker runs, so the user
+    can press ESC to cancel. The stage function receives a StageProgress and must
+    not mutate application state: its return value is handed back to the caller,
+    which commits it only when the stage completed.
+    """
+
+    POLL_INTERVAL = 0.1
+
+    @staticmethod
+    def run(desc: str, stage: Callable[[StageProgress], object],
+            total: Optional[int] = None, unit: str = 'rows'):
+        """Execute `stage(progress)` on a worker thread and return its result.
+
+        Parameters
+        ----------
+        desc : str
+            Label shown next to the progress bar.
+        stage : Callable[[StageProgress], object]
+            Function doing the work; it reports progress and checks for cancellation.
+        total : int, optional
+            Expected number of units, used for the ETA.
+        unit : str
+            Name of the unit being counted (rows, features, reports ...).
+
+        Returns
+        -------
+        object
+            Whatever the stage returned.
+
+        Raises
+        ------
+        StageCancelled
+            If the user cancelled the stage before it finished.
+        """
+        print(f"{SPACE}⏳ Press ESC to cancel\n")
+        progress = StageProgress(desc, total=total, unit=unit)
+        outcome = {}
+
+        def worker():
+            try:
+                outcome['result'] = stage(progress)
+            except BaseException as exc:
+                outcome['error'] = exc
+
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+
+        while thread.is_alive():
+            while msvcrt.kbhit():
+                if msvcrt.getch() == ESC:
+                    progress.cancel()
+            thread.join(StageRunner.POLL_INTERVAL)
+
+        progress.close()
+
+        if 'error' in outcome:
+            raise outcome['error']
+        # ESC pressed after the stage's last check: its result is discarded too
+        if progress.cancelled:
+            raise StageCancelled()
+        return outcome['result']
@@ -1,2 +1,7 @@
 from .risk_score import CustomerRiskScorer
-from .transaction_flager import TransactionFlagger
\ No newline at end of file
+from .transaction_flager import TransactionFlagger
+from .threshold_evaluator import ThresholdEvaluator
+from .segment_normalizer import SegmentNormalizer
+from .mahalanobis_scorer import MahalanobisScorer
+from .reason_codes import ReasonCodes
+from .sample_estimator import SampleEstimator
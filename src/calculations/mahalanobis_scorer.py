@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+from src.constants.config import CHUNK_SIZE, MAHALANOBIS_SHRINKAGE, MAHALANOBIS_ALPHA
+from src.calculations.transaction_flager import TransactionFlagger
+
+
+class MahalanobisScorer:
+    """
+    Score transactions by their Mahalanobis distance to the population.
+
+    Unlike the per-feature Z-scores of `TransactionFlagger`, the distance accounts
+    for correlation between features, so a row is only unusual if the combination
+    of its values is. The covariance is fitted in one streaming pass over row
+    blocks, and distances are computed block by block with matrix products, so
+    memory stays bounded by the block size whatever the number of rows.
+    """
+
+    FEATURES = TransactionFlagger.FLAG_FEATURES
+
+    @staticmethod
+    def _blocks(df: pd.DataFrame, features: list, block_size: int):
+        """Yield successive row blocks of the feature columns as float matrices."""
+        for start in range(0, len(df), block_size):
+            yield df.iloc[start:start + block_size][features].to_numpy(dtype=float)
+
+    @staticmethod
+    def fit(df: pd.DataFrame, features: list = None, shrinkage: float = MAHALANOBIS_SHRINKAGE,
+            block_size: int = CHUNK_SIZE, progress=None) -> dict:
+        """Fit the mean and precision matrix of `features` in one pass over row blocks.
+
+        Every block contributes its row count, mean and centered scatter matrix,
+        which are merged into the running totals with the pairwise update of
+        Chan et al., so the result matches a two-pass covariance without keeping
+        more than one block in memory. Rows with a missing or infinite value
+        are skipped.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Transactions with the feature columns.
+        features : list, optional
+            Columns to use; defaults to `FEATURES`.
+        shrinkage : float
+            Weight in [0, 1] of the scaled identity blended into the covariance,
+            which keeps it well conditioned when features are strongly correlated.
+        block_size : int
+            Number of rows per block.
+        progress : StageProgress, optional
+            Advanced by the number of rows of every block.
+
+        Returns
+        -------
+        dict
+            - 'features': feature names
+            - 'count': number of rows used
+            - 'mean': feature means
+            - 'covariance': (shrunk) covariance matrix
+            - 'precision': inverse of the covariance matrix
+        """
+        state = MahalanobisScorer.accumulate(df, features=features, block_size=block_size, progress=progress)
+        return MahalanobisScorer.finalize(state, shrinkage)
+
+    @staticmethod
+    def accumulate(df: pd.DataFrame, state: dict = None, features: list = None,
+                   block_size: int = CHUNK_SIZE, progress=None) -> dict:
+        """Merge the row count, mean and scatter matrix of `df` into a running fit state.
+
+        Calling it once per partition and then `finalize` fits the model over
+        data that never sits in memory at once.
+        """
+        if state is None:
+            features = list(MahalanobisScorer.FEATURES if features is None else features)
+            k = len(features)
+            state = {'features': features, 'count': 0, 'mean': np.zeros(k), 'scatter': np.zeros((k, k))}
+
+        for block in MahalanobisScorer._blocks(df, state['features'], block_size):
+            valid = block[np.isfinite(block).all(axis=1)]
+            n = len(valid)
+            if n:
+                block_mean = valid.mean(axis=0)
+                centered = valid - block_mean
+                delta = block_mean - state['mean']
+                count = state['count']
+                total = count + n
+                state['scatter'] += centered.T @ centered + np.outer(delta, delta) * (count * n / total)
+                state['mean'] += delta * (n / total)
+                state['count'] = total
+            if progress is not None:
+                progress.update(len(block))
+                progress.check()
+        return state
+
+    @staticmethod
+    def finalize(state: dict, shrinkage: float = MAHALANOBIS_SHRINKAGE) -> dict:
+        """Turn an accumulated fit state into a model (see `fit`)."""
+        k = len(state['features'])
+        count = state['count']
+        covariance = state['scatter'] / count if count else np.eye(k)
+        if shrinkage:
+            target = np.trace(covariance) / k * np.eye(k)
+            covariance = (1 - shrinkage) * covariance + shrinkage * target
+
+        return {
+            'features': state['features'],
+            'count': count,
+            'mean': state['mean'].copy(),
+            'covariance': covariance,
+            'precision': np.linalg.pinv(covariance, hermitian=True)
+        }
+
+    @staticmethod
+    def score(df: pd.DataFrame, model: dict, block_size: int = CHUNK_SIZE, progress=None) -> pd.Series:
+        """Return the Mahalanobis distance of every row to a fitted model.
+
+        Each block is centered and multiplied by the precision matrix in a single
+        matrix product; rows with a missing value get NaN.
+        """
+        distance = np.empty(len(df))
+
+        start = 0
+        for block in MahalanobisScorer._blocks(df, model['features'], block_size):
+            centered = block - model['mean']
+            squared = np.einsum('ij,ij->i', centered @ model['precision'], centered)
+            squared[~np.isfinite(block).all(axis=1)] = np.nan
+            distance[start:start + len(block)] = np.sqrt(np.maximum(squared, 0))
+            start += len(block)
+            if progress is not None:
+                progress.update(len(block))
+                progress.check()
+        return pd.Series(distance, index=df.index)
+
+    @staticmethod
+    def threshold(model: dict, alpha: float = MAHALANOBIS_ALPHA) -> float:
+        """Return the distance above which a row is flagged.
+
+        For normally distributed features the squared distance follows a
+        chi-square distribution with one degree of freedom per feature, so
+        `alpha` is the expected flag rate on normal data.
+        """
+        return float(np.sqrt(chi2.ppf(1 - alpha, len(model['features']))))
+
+    @staticmethod
+    def build(df: pd.DataFrame, model: dict = None, alpha: float = MAHALANOBIS_ALPHA,
+              block_size: int = CHUNK_SIZE, progress=None) -> pd.DataFrame:
+        """Append `mahalanobis_distance` and `mahalanobis_flag` columns to a copy of the DataFrame.
+
+        Fits the model on `df` unless a previously fitted `model` is given.
+        """
+        scored = df.copy()
+        if model is None:
+            model = MahalanobisScorer.fit(scored, block_size=block_size, progress=progress)
+        scored['mahalanobis_distance'] = MahalanobisScorer.score(scored, model, block_size, progress)
+        scored['mahalanobis_flag'] = (
+            scored['mahalanobis_distance'] > MahalanobisScorer.threshold(model, alpha)
+        ).astype(int)
+        return scored
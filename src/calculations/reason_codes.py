@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+from src.constants.config import CHUNK_SIZE, REASON_CODE_COUNT
+
+
+class ReasonCodes:
+    """
+    Turn a matrix of absolute Z-scores into per-row reason codes:
+    the names and Z-scores of the features that contributed most.
+    """
+
+    @staticmethod
+    def top_features(z: pd.DataFrame, prefix: str, top: int = REASON_CODE_COUNT,
+                     block_size: int = CHUNK_SIZE, progress=None) -> pd.DataFrame:
+        """Rank the features of every row by absolute Z-score with one argsort per row block.
+
+        Parameters
+        ----------
+        z : pd.DataFrame
+            Absolute Z-scores, one column per feature.
+        prefix : str
+            Prefix of the output columns.
+        top : int
+            Number of reasons kept per row.
+        block_size : int
+            Number of rows ranked per argsort.
+        progress : StageProgress, optional
+            Advanced by the number of rows of every block.
+
+        Returns
+        -------
+        pd.DataFrame
+            For every rank, the feature name (categorical, NaN when its Z-score
+            is missing) and its Z-score, aligned with `z`.
+        """
+        features = list(z.columns)
+        top = min(top, len(features))
+        values = z.to_numpy(dtype=float)
+
+        order = np.empty((len(values), top), dtype=np.intp)
+        scores = np.empty((len(values), top))
+        for start in range(0, len(values), block_size):
+            block = values[start:start + block_size]
+            block_order = np.argsort(-np.nan_to_num(block, nan=-np.inf), axis=1, kind='stable')[:, :top]
+            order[start:start + len(block)] = block_order
+            scores[start:start + len(block)] = np.take_along_axis(block, block_order, axis=1)
+            if progress is not None:
+                progress.update(len(block))
+                progress.check()
+        order[np.isnan(scores)] = -1
+
+        reasons = {}
+        for rank in range(top):
+            reasons[f"{prefix}_{rank + 1}"] = pd.Categorical.from_codes(order[:, rank], features)
+            reasons[f"{prefix}_{rank + 1}_zscore"] = scores[:, rank]
+        return pd.DataFrame(reasons, index=z.index)
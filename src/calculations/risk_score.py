@@ -1,6 +1,9 @@
 import pandas as pd
 import numpy as np
 from scipy.stats import zscore
+from src.constants.config import RISK_CLASS_BINS, RISK_CLASS_LABELS, ZSCORE_SEGMENT
+from src.calculations.segment_normalizer import SegmentNormalizer
+from src.calculations.reason_codes import ReasonCodes
 
 
 class CustomerRiskScorer:
@@ -15,13 +18,15 @@ class CustomerRiskScorer:
     ]
 
     @staticmethod
-    def compute_zscore(df: pd.DataFrame) -> pd.DataFrame:
+    def compute_zscore(df: pd.DataFrame, segment: str = ZSCORE_SEGMENT) -> pd.DataFrame:
         """Compute absolute Z-scores for the configured risk features.
 
         Parameters
         ----------
         df : pd.DataFrame
             DataFrame containing the risk features.
+        segment : str, optional
+            Segment to normalize within ('type', 'activity_tier'); None is global.
 
         Returns
         -------
@@ -29,6 +34,11 @@ class CustomerRiskScorer:
             Copy of the input with the risk features replaced by their absolute Z-scores.
         """
         z_df = df.copy()
+        if segment is not None:
+            z_df[CustomerRiskScorer.RISK_FEATURES] = SegmentNormalizer.zscores(
+                df, CustomerRiskScorer.RISK_FEATURES, segment
+            ).abs()
+            return z_df
         z_df[CustomerRiskScorer.RISK_FEATURES] = (
             z_df[CustomerRiskScorer.RISK_FEATURES]
             .apply(lambda col: zscore(col, nan_policy='omit'))
@@ -42,22 +52,45 @@ class CustomerRiskScorer:
         return z_df[CustomerRiskScorer.RISK_FEATURES].mean(axis=1)
 
     @staticmethod
-    def risk_class(score: pd.Series) -> pd.Series:
-        """Map numeric risk scores into categorical risk classes."""
+    def risk_class(score: pd.Series, bins: list = None) -> pd.Series:
+        """Map numeric risk scores into categorical risk classes.
+
+        `bins` are the upper edges of the low / medium / high classes
+        (defaults to `RISK_CLASS_BINS`); scores above the last edge are critical.
+        """
+        edges = RISK_CLASS_BINS if bins is None else bins
         return pd.cut(
             score,
-            bins=[-np.inf, 0.5, 1.0, 2.0, np.inf],
-            labels=['low', 'medium', 'high', 'critical']
+            bins=[-np.inf, *edges, np.inf],
+            labels=RISK_CLASS_LABELS
         )
 
     @staticmethod
-    def build(customer_df: pd.DataFrame) -> pd.DataFrame:
-        """Compute risk score and risk class for each record in the provided DataFrame."""
+    def build(customer_df: pd.DataFrame, bins: list = None,
+              segment: str = ZSCORE_SEGMENT, z_df: pd.DataFrame = None, progress=None) -> pd.DataFrame:
+        """Compute risk score, risk class and reason codes for each record in the provided DataFrame.
+
+        Reason codes (`risk_reason_<n>` / `risk_reason_<n>_zscore`) name the
+        risk features with the largest Z-scores, taken from the same Z-score pass.
+        Pass precomputed absolute Z-scores of the risk features as `z_df`
+        (e.g. against statistics of the whole dataset) to skip the Z-score pass.
+        `progress` (optional StageProgress) is checked between the passes and
+        advances by rows while the reason codes are ranked.
+        """
         df = customer_df.copy()
 
-        z_df = CustomerRiskScorer.compute_zscore(df)
+        if z_df is None:
+            z_df = CustomerRiskScorer.compute_zscore(df, segment)
+        if progress is not None:
+            progress.check()
 
         df['risk_score'] = CustomerRiskScorer.compute_risk_score(z_df)
-        df['risk_class'] = CustomerRiskScorer.risk_class(df['risk_score'])
+        df['risk_class'] = CustomerRiskScorer.risk_class(df['risk_score'], bins)
+        if progress is not None:
+            progress.check()
+        reasons = ReasonCodes.top_features(
+            z_df[CustomerRiskScorer.RISK_FEATURES], 'risk_reason', progress=progress
+        )
+        df[reasons.columns] = reasons
 
         return df
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+from src.constants.config import RISK_CLASS_LABELS
+
+
+class SampleEstimator:
+    """
+    Estimate population rates, with confidence intervals, from a sample of
+    whole senders.
+
+    Transactions of a sender are correlated (they share the per-sender
+    features), so the sample is a cluster sample: every sender is one
+    cluster drawn with the same probability `fraction`. Rates are ratio
+    estimates (sum over sampled senders of the rows that count, divided by
+    their rows), and their variance is the standard linearized ratio
+    variance over clusters with a finite population correction, which
+    stays honest when a few busy senders dominate the sample.
+    """
+
+    @staticmethod
+    def ratio(hits, sizes, fraction: float, confidence: float) -> dict:
+        """Estimate sum(hits) / sum(sizes) and its confidence interval.
+
+        Parameters
+        ----------
+        hits : array-like
+            Per sender, the number of rows that count (e.g. flagged rows).
+        sizes : array-like
+            Per sender, the number of rows.
+        fraction : float
+            Probability with which each sender was sampled.
+        confidence : float
+            Confidence level of the interval, e.g. 0.95.
+
+        Returns
+        -------
+        dict
+            'estimate', 'low', 'high' (clipped to [0, 1]) and 'std_error'.
+        """
+        hits = np.asarray(hits, dtype=float)
+        sizes = np.asarray(sizes, dtype=float)
+        n, total = len(sizes), sizes.sum()
+        if not n or not total:
+            return {'estimate': np.nan, 'low': np.nan, 'high': np.nan, 'std_error': np.nan}
+
+        estimate = hits.sum() / total
+        residuals = hits - estimate * sizes
+        variance = (1 - min(fraction, 1.0)) * n / max(n - 1, 1) * (residuals ** 2).sum() / total ** 2
+        std_error = float(np.sqrt(variance))
+        margin = norm.ppf(0.5 + confidence / 2) * std_error
+        return {
+            'estimate': float(estimate),
+            'low': float(max(estimate - margin, 0.0)),
+            'high': float(min(estimate + margin, 1.0)),
+            'std_error': std_error
+        }
+
+    @staticmethod
+    def summarize(df: pd.DataFrame, fraction: float, confidence: float) -> dict:
+        """Estimate the risk class distribution and the flag rate from a scored sample.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Scored and flagged rows of the sampled senders.
+        fraction : float
+            Probability with which each sender was sampled.
+        confidence : float
+            Confidence level of the intervals.
+
+        Returns
+        -------
+        dict
+            - 'risk_classes': DataFrame indexed by `RISK_CLASS_LABELS` with the
+              sample count and the estimated share of transactions per class
+              (estimate, low, high, std_error)
+            - 'flag_rate': `ratio` of flagged transactions
+            - 'mahalanobis_rate': `ratio` of Mahalanobis flags, if scored
+        """
+        codes, _ = pd.factorize(df['nameOrig'])
+        sizes = np.bincount(codes)
+
+        def per_sender(mask: pd.Series) -> np.ndarray:
+            return np.bincount(codes, weights=mask.to_numpy(dtype=float), minlength=len(sizes))
+
+        classes = {}
+        for label in RISK_CLASS_LABELS:
+            mask = df['risk_class'] == label
+            classes[label] = {
+                'count': int(mask.sum()),
+                **SampleEstimator.ratio(per_sender(mask), sizes, fraction, confidence)
+            }
+
+        result = {
+            'risk_classes': pd.DataFrame.from_dict(classes, orient='index'),
+            'flag_rate': SampleEstimator.ratio(
+                per_sender(df['transaction_flag'] == 1), sizes, fraction, confidence
+            )
+        }
+        if 'mahalanobis_flag' in df.columns:
+            result['mahalanobis_rate'] = SampleEstimator.ratio(
+                per_sender(df['mahalanobis_flag'] == 1), sizes, fraction, confidence
+            )
+        return result
@@ -0,0 +1,185 @@
+import os
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from src.constants.config import (
+    LABEL_COLUMN, SWEEP_THRESHOLDS, FLAG_ZSCORE_THRESHOLD, RISK_CLASS_BINS
+)
+from src.calculations.transaction_flager import TransactionFlagger
+
+
+class ThresholdEvaluator:
+    """
+    Evaluate flagging thresholds against labelled data (e.g. PaySim `isFraud`).
+
+    Scores are sorted once; the number of alerts and true positives above every
+    candidate threshold then comes from a binary search into the sorted scores and
+    a cumulative sum of the labels, so thousands of thresholds cost about as much
+    as one.
+    """
+
+    @staticmethod
+    def default_thresholds(sorted_scores: np.ndarray) -> np.ndarray:
+        """Pick up to `SWEEP_THRESHOLDS` candidates at evenly spaced score quantiles.
+
+        Quantile spacing puts roughly the same number of rows between two
+        candidates, so heavy score tails do not waste the grid.
+        """
+        if not len(sorted_scores):
+            return np.zeros(1)
+        picks = np.linspace(0, len(sorted_scores) - 1, SWEEP_THRESHOLDS).astype(np.int64)
+        return np.unique(np.concatenate([[0.0], sorted_scores[picks]]))
+
+    @staticmethod
+    def sweep(scores, labels, thresholds=None, amounts=None) -> pd.DataFrame:
+        """Compute precision, recall, flag rate and alert volume for many thresholds at once.
+
+        A row is flagged when its score is strictly above the threshold, matching
+        `TransactionFlagger.compute_flags`; NaN scores are never flagged.
+
+        Parameters
+        ----------
+        scores : array-like
+            Anomaly score per row.
+        labels : array-like
+            Ground truth per row (1 = fraud).
+        thresholds : array-like, optional
+            Candidate thresholds; defaults to `default_thresholds` of the scores.
+        amounts : array-like, optional
+            Transaction amounts, to also report the flagged volume.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per threshold with alerts, flag_rate, true_positives,
+            precision, recall, f1 (and flagged_amount when amounts are given).
+        """
+        scores = np.asarray(scores, dtype=float)
+        labels = np.asarray(labels, dtype=float)
+        valid = ~np.isnan(scores)
+        total_rows = len(scores)
+        total_positives = labels.sum()
+
+        order = np.argsort(scores[valid], kind='stable')
+        sorted_scores = scores[valid][order]
+        positives_below = np.concatenate([[0.0], np.cumsum(labels[valid][order])])
+
+        if thresholds is None:
+            thresholds = ThresholdEvaluator.default_thresholds(sorted_scores)
+        thresholds = np.asarray(thresholds, dtype=float)
+
+        cut = np.searchsorted(sorted_scores, thresholds, side='right')
+        alerts = len(sorted_scores) - cut
+        true_positives = positives_below[-1] - positives_below[cut]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            precision = np.where(alerts > 0, true_positives / alerts, np.nan)
+            recall = true_positives / total_positives if total_positives else np.full(len(cut), np.nan)
+            f1 = 2 * precision * recall / (precision + recall)
+
+        table = pd.DataFrame({
+            'threshold': thresholds,
+            'alerts': alerts,
+            'flag_rate': alerts / total_rows if total_rows else np.nan,
+            'true_positives': true_positives.astype(int),
+            'precision': precision,
+            'recall': recall,
+            'f1': np.nan_to_num(f1)
+        })
+
+        if amounts is not None:
+            sorted_amounts = np.asarray(amounts, dtype=float)[valid][order]
+            amount_below = np.concatenate([[0.0], np.cumsum(sorted_amounts)])
+            table['flagged_amount'] = amount_below[-1] - amount_below[cut]
+        return table
+
+    @staticmethod
+    def evaluate_transactions(df: pd.DataFrame, thresholds=None, max_z: pd.Series = None) -> pd.DataFrame:
+        """Sweep the transaction flag threshold over the max absolute Z-score.
+
+        A cached `max_z` (from `TransactionFlagger.max_zscore`) skips the Z-score pass.
+        """
+        if max_z is None:
+            max_z = TransactionFlagger.max_zscore(df)
+        return ThresholdEvaluator.sweep(max_z, df[LABEL_COLUMN], thresholds, df['amount'])
+
+    @staticmethod
+    def evaluate_customers(df: pd.DataFrame, thresholds=None) -> pd.DataFrame:
+        """Sweep a risk-score cut-off per customer; a customer is positive if any transaction is fraud."""
+        customers = df.groupby('nameOrig', sort=False).agg(
+            risk_score=('risk_score', 'max'),
+            label=(LABEL_COLUMN, 'max')
+        )
+        return ThresholdEvaluator.sweep(customers['risk_score'], customers['label'], thresholds)
+
+    @staticmethod
+    def best(table: pd.DataFrame, metric: str = 'f1') -> pd.Series:
+        """Return the sweep row with the highest `metric`."""
+        return table.loc[table[metric].idxmax()]
+
+    @staticmethod
+    def at(table: pd.DataFrame, threshold: float) -> pd.Series:
+        """Return the sweep row closest to `threshold`."""
+        return table.loc[(table['threshold'] - threshold).abs().idxmin()]
+
+    @staticmethod
+    def plot(table: pd.DataFrame, path: str, title: str, current: float = None) -> str:
+        """Save a precision / recall / flag rate chart of a sweep table and return its path."""
+        fig, ax = plt.subplots(figsize=(10, 6))
+        ax.plot(table['threshold'], table['precision'], label='Precision', color='#1a237e', linewidth=2)
+        ax.plot(table['threshold'], table['recall'], label='Recall', color='#F44336', linewidth=2)
+        ax.plot(table['threshold'], table['f1'], label='F1', color='#5e35b1', linewidth=1.5, linestyle='--')
+        ax.plot(table['threshold'], table['flag_rate'], label='Flag Rate', color='#FF9800', linewidth=1.5)
+
+        if current is not None:
+            ax.axvline(current, color='black', linestyle=':', linewidth=1.5, label=f'Current ({current:g})')
+        best = ThresholdEvaluator.best(table)
+        ax.axvline(best['threshold'], color='#43A047', linestyle=':', linewidth=1.5,
+                   label=f"Best F1 ({best['threshold']:.2f})")
+
+        ax.set_xlabel('Threshold', fontsize=14, weight='bold', color='#1a237e')
+        ax.set_ylabel('Rate', fontsize=14, weight='bold', color='#1a237e')
+        ax.set_title(title, fontsize=18, weight='bold', pad=20, color='#1a237e')
+        ax.set_ylim(0, 1.05)
+        ax.set_xlim(0, max(table['threshold'].quantile(0.99), current or 0) * 1.1)
+        ax.grid(True, alpha=0.3, linestyle='--')
+        ax.legend()
+
+        plt.tight_layout()
+        plt.savefig(path, bbox_inches='tight', dpi=150, facecolor='white')
+        plt.close()
+        return path
+
+    @staticmethod
+    def export_all(df: pd.DataFrame, output_dir: str = "outputs", max_z: pd.Series = None,
+                   flag_threshold: float = FLAG_ZSCORE_THRESHOLD,
+                   risk_cutoff: float = RISK_CLASS_BINS[-1]) -> dict:
+        """Run both sweeps, write their tables and charts, and return the sweeps and paths.
+
+        `flag_threshold` and `risk_cutoff` are the values in use, marked on the charts.
+        """
+        chart_dir = os.path.join(output_dir, 'charts')
+        os.makedirs(chart_dir, exist_ok=True)
+
+        transactions = ThresholdEvaluator.evaluate_transactions(df, max_z=max_z)
+        customers = ThresholdEvaluator.evaluate_customers(df)
+
+        paths = {
+            'transaction_sweep_csv': os.path.join(output_dir, 'threshold_sweep_transactions.csv'),
+            'customer_sweep_csv': os.path.join(output_dir, 'threshold_sweep_customers.csv')
+        }
+        transactions.to_csv(paths['transaction_sweep_csv'], index=False)
+        customers.to_csv(paths['customer_sweep_csv'], index=False)
+
+        paths['transaction_chart'] = ThresholdEvaluator.plot(
+            transactions, os.path.join(chart_dir, 'threshold_sweep_transactions.png'),
+            'Transaction Flag Threshold', current=flag_threshold
+        )
+        paths['customer_chart'] = ThresholdEvaluator.plot(
+            customers, os.path.join(chart_dir, 'threshold_sweep_customers.png'),
+            'Customer Risk Score Cut-off', current=risk_cutoff
+        )
+
+        return {'transactions': transactions, 'customers': customers, 'paths': paths}
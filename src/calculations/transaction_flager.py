@@ -1,5 +1,8 @@
 import pandas as pd
 from scipy.stats import zscore
+from src.constants.config import FLAG_ZSCORE_THRESHOLD, ZSCORE_SEGMENT
+from src.calculations.segment_normalizer import SegmentNormalizer
+from src.calculations.reason_codes import ReasonCodes
 
 
 class TransactionFlagger:
@@ -14,7 +17,51 @@ class TransactionFlagger:
     ]
 
     @staticmethod
-    def compute_flags(df: pd.DataFrame, threshold: float = 3.0) -> pd.Series:
+    def compute_zscores(df: pd.DataFrame, segment: str = ZSCORE_SEGMENT) -> pd.DataFrame:
+        """Return absolute Z-scores of the configured flag features.
+
+        With a `segment` ('type' or 'activity_tier') every feature is normalized
+        within its segment instead of against the whole population.
+        """
+        if segment is not None:
+            return SegmentNormalizer.zscores(df, TransactionFlagger.FLAG_FEATURES, segment).abs()
+        return (
+            df[TransactionFlagger.FLAG_FEATURES]
+            .apply(lambda col: zscore(col, nan_policy='omit'))
+            .abs()
+        )
+
+    @staticmethod
+    def max_zscore(df: pd.DataFrame, segment: str = ZSCORE_SEGMENT) -> pd.Series:
+        """Return the row-wise maximum absolute Z-score, the score compared to the threshold."""
+        return TransactionFlagger.compute_zscores(df, segment).max(axis=1)
+
+    @staticmethod
+    def score(df: pd.DataFrame, segment: str = ZSCORE_SEGMENT, progress=None):
+        """Return the row-wise max absolute Z-score and the reason codes from one Z-score pass.
+
+        Reason codes (`flag_reason_<n>` / `flag_reason_<n>_zscore`) name the
+        features with the largest Z-scores of every row. `progress` (optional
+        StageProgress) is checked after the Z-score pass and advances by rows
+        while the reason codes are ranked.
+        """
+        z = TransactionFlagger.compute_zscores(df, segment)
+        if progress is not None:
+            progress.check()
+        return z.max(axis=1), ReasonCodes.top_features(z, 'flag_reason', progress=progress)
+
+    @staticmethod
+    def flags_from_scores(max_z: pd.Series, threshold: float = FLAG_ZSCORE_THRESHOLD) -> pd.Series:
+        """Turn row-wise max Z-scores into binary flags with a single vectorized compare.
+
+        Keeping `max_zscore` around lets callers try another threshold
+        without recomputing any Z-score.
+        """
+        return (max_z > threshold).astype(int)
+
+    @staticmethod
+    def compute_flags(df: pd.DataFrame, threshold: float = FLAG_ZSCORE_THRESHOLD,
+                      segment: str = ZSCORE_SEGMENT) -> pd.Series:
         """Compute binary transaction flags based on configured features and threshold.
 
         Parameters
@@ -23,24 +70,29 @@ class TransactionFlagger:
             DataFrame with features used for flagging.
         threshold : float
             Z-score threshold above which a transaction is considered anomalous.
+        segment : str, optional
+            Segment to normalize within ('type', 'activity_tier'); None is global.
 
         Returns
         -------
         pd.Series
             Binary series where 1 indicates a flagged transaction.
         """
-        z = (
-            df[TransactionFlagger.FLAG_FEATURES]
-            .apply(lambda col: zscore(col, nan_policy='omit'))
-            .abs()
-        )
-        return (z.max(axis=1) > threshold).astype(int)
+        return TransactionFlagger.flags_from_scores(TransactionFlagger.max_zscore(df, segment), threshold)
 
     @staticmethod
-    def build(df: pd.DataFrame) -> pd.DataFrame:
-        """Append a `transaction_flag` column to a copy of the DataFrame."""
+    def build(df: pd.DataFrame, threshold: float = FLAG_ZSCORE_THRESHOLD,
+              max_z: pd.Series = None, segment: str = ZSCORE_SEGMENT,
+              reasons: pd.DataFrame = None, progress=None) -> pd.DataFrame:
+        """Append `transaction_flag` and reason code columns to a copy of the DataFrame.
+
+        Pass a previously computed `max_z` and `reasons` (from `score`) to skip the Z-score pass;
+        otherwise `progress` is handed to it.
+        """
         flagged = df.copy()
-        flagged['transaction_flag'] = (
-            TransactionFlagger.compute_flags(flagged)
-        )
+        if max_z is None:
+            max_z, reasons = TransactionFlagger.score(flagged, segment, progress=progress)
+        flagged['transaction_flag'] = TransactionFlagger.flags_from_scores(max_z, threshold)
+        if reasons is not None:
+            flagged[reasons.columns] = reasons
         return flagged
@@ -33,6 +33,102 @@ CATEGORICAL_COLUMNS = [
 
 E = 1e-6
 
+CHUNK_SIZE = 500_000
+
+# threads reading (and decompressing) dataset files in parallel; None = one per CPU core
+READ_WORKERS = None
+# CSV parser of whole-file loads: 'c' (pandas, chunked) or 'pyarrow' (multi-threaded)
+PARSE_ENGINE = 'c'
+
+# sliding windows for sender velocity features, in steps (1 step = 1 hour)
+ROLLING_WINDOWS = {
+    '1h': 1,
+    '24h': 24,
+    '7d': 168
+}
+
+# smoothing factor of the per-sender exponentially weighted baselines
+EWM_ALPHA = 0.2
+
+# HyperLogLog precision p: 2**p registers per sender, relative error ~1.04 / sqrt(2**p)
+HLL_PRECISION = 10
+
+# registered features the pipeline builds even though no scorer reads them,
+# e.g. ['balance_gap_sender', 'tx_count_24h_sender', 'fan_out_sender', 'amount_ewm_deviation']
+EXTRA_FEATURES = []
+
+# z-score above which TransactionFlagger flags a transaction
+FLAG_ZSCORE_THRESHOLD = 3.0
+
+# segment used to normalize Z-scores: None (global population), 'type' or 'activity_tier'
+ZSCORE_SEGMENT = None
+# upper edges of the sender transaction-count tiers used by the 'activity_tier' segment
+ACTIVITY_TIER_BINS = [1, 5, 20]
+
+# weight of the scaled identity blended into the Mahalanobis covariance (0 = none)
+MAHALANOBIS_SHRINKAGE = 0.05
+# expected flag rate of MahalanobisScorer on normally distributed features
+MAHALANOBIS_ALPHA = 0.001
+
+# number of top contributing features reported as reason codes per row
+REASON_CODE_COUNT = 2
+
+# upper edges of the low / medium / high risk classes (anything above is critical)
+RISK_CLASS_BINS = [0.5, 1.0, 2.0]
+RISK_CLASS_LABELS = ['low', 'medium', 'high', 'critical']
+
+# ground-truth column used to evaluate thresholds (PaySim `isFraud`)
+LABEL_COLUMN = 'isFraud'
+SWEEP_THRESHOLDS = 2000
+
+# watch mode (`python main.py --watch`): seconds between directory polls, and the
+# files receiving the alerts and the per-batch throughput / lag metrics
+WATCH_POLL_SECONDS = 5
+WATCH_ALERTS_FILE = 'outputs/alerts.csv'
+WATCH_METRICS_FILE = 'outputs/watch_metrics.csv'
+
+# load only new or changed dataset files, reusing the cached rows of the others
+INCREMENTAL_LOAD = True
+# rows per row group of the ingestion cache; filtered loads skip groups by their step/type statistics
+ROW_GROUP_ROWS = 100_000
+# directory of the ingestion manifest and the cached rows of already loaded files
+INGEST_CACHE_DIR = 'outputs/.ingest_cache'
+
+# self-contained HTML dashboard: bins per histogram, rows per top-k table and the most
+# points of a time series (longer series are merged into wider buckets)
+HTML_HISTOGRAM_BINS = 40
+HTML_TOP_K = 25
+HTML_MAX_POINTS = 500
+
+# hours per bucket of the trend analytics (PaySim `step` is one hour), and the
+# bucket plotted on the dashboard timeline
+TREND_PERIODS = {'hour': 1, 'day': 24, 'week': 168}
+TREND_CHART_PERIOD = 'day'
+
+# critical customers given their own dashboard page (top N by risk score), and the
+# processes rendering those pages (None = all cores, 1 = render in this process)
+DASHBOARD_CUSTOMER_PAGES = 50
+DASHBOARD_WORKERS = None
+
+SQLITE_DB = 'fraudlens.db'
+SQLITE_BATCH_SIZE = 50_000
+
+# worker threads of the DuckDB engine (None = all cores) and its memory limit before spilling
+# to disk, as a DuckDB size string such as '4GB' (None = DuckDB's default, 80% of RAM)
+DUCKDB_THREADS = None
+DUCKDB_MEMORY_LIMIT = None
+
+# memory budget of one sender partition in out-of-core mode, in MiB
+OUT_OF_CORE_MEMORY_MB = 1024
+# parent directory of the out-of-core spill files (None = system temp directory)
+OUT_OF_CORE_SPILL_DIR = None
+
+# preview run: share of senders sampled (whole senders), sample selector and
+# confidence level of the reported intervals
+PREVIEW_FRACTION = 0.05
+PREVIEW_SEED = 0
+PREVIEW_CONFIDENCE = 0.95
+
 
 MENU = [
     "📂 Loading dataset(s)",
@@ -44,6 +140,14 @@ MENU = [
     "📊 Display Summary",
     "🗃️ Export Reports",
     "💹 Export Dashboard",
+    "🔎 Investigate Customer",
+    "🗄️ Export SQLite Database",
+    "🎯 Evaluate Thresholds",
+    "🎚️ What-if Thresholds",
+    "💾 Out-of-core Run",
+    "🦆 DuckDB Pipeline",
+    "🔬 Preview Run",
+    "🌐 Export HTML Dashboard",
     "👋 Exiting FRAUDLENS"
 ]
 
@@ -1,2 +1,8 @@
 from .data_manager import DataManager
 from .transactions_cleaner import TransactionCleaner
+from .customer_index import CustomerIndex
+from .shared_frame import SharedFrame
+from .sender_partitioner import SenderPartitioner
+from .sender_sampler import SenderSampler
+from .ingestion_manifest import IngestionManifest
+from .load_filter import LoadFilter
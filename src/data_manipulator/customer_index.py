@@ -0,0 +1,209 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+
+
+class CustomerIndex:
+    """
+    CustomerIndex is a sorted in-memory index over scored transactions
+    used to drill down into a single customer.
+
+    The index is built once: row positions are sorted by sender and by
+    receiver, and every account owns a contiguous slice of those orders
+    delimited by an offsets array. A lookup is a binary search over the
+    sorted account names, so fetching a customer's rows costs
+    O(log n) plus the size of the result instead of a full-frame scan.
+
+    Responsibilities:
+    - Fetch a customer's sent, received and full transaction history
+    - Summarize a customer's counterparties
+    - List a customer's flagged transactions
+    - Collect the rows of many customers in one pass
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Build the sender and receiver indexes over `df`.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Transactions with `nameOrig` and `nameDest` columns.
+        """
+        self.df = df
+        self.sender = CustomerIndex._build_side(df['nameOrig'], df['step'])
+        self.receiver = CustomerIndex._build_side(df['nameDest'], df['step'])
+
+    @staticmethod
+    def _build_side(values: pd.Series, steps: pd.Series) -> Dict[str, np.ndarray]:
+        """
+        Sort row positions by account name and compute per-account offsets.
+
+        Names are hashed into integer codes first so only the distinct
+        names are sorted as strings; rows are then ordered by integer rank
+        and step, so every account slice is already in time order.
+
+        Parameters
+        ----------
+        values : pd.Series
+            Account name of every row.
+        steps : pd.Series
+            Step of every row.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            - 'names': sorted distinct account names
+            - 'order': row positions grouped by account
+            - 'offsets': slice bounds of every account within 'order'
+        """
+        codes, uniques = pd.factorize(values)
+        sorter = np.argsort(np.asarray(uniques, dtype=object), kind='stable')
+        rank = np.empty(len(uniques), dtype=np.int64)
+        rank[sorter] = np.arange(len(uniques))
+
+        row_rank = rank[codes]
+        offsets = np.zeros(len(uniques) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(row_rank, minlength=len(uniques)), out=offsets[1:])
+
+        return {
+            'names': np.asarray(uniques, dtype=object)[sorter],
+            'order': np.lexsort((steps.to_numpy(), row_rank)),
+            'offsets': offsets
+        }
+
+    def rebind(self, df: pd.DataFrame) -> 'CustomerIndex':
+        """
+        Reuse the index for a new frame with the same rows in the same order.
+
+        Pipeline stages append columns to a copy of the frame without
+        reordering it, so the sorted positions stay valid.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Frame derived from the indexed one.
+
+        Returns
+        -------
+        CustomerIndex
+            Index sharing the sorted arrays but reading rows from `df`.
+        """
+        if len(df) != len(self.df):
+            raise ValueError("Cannot rebind the index to a frame with different rows.")
+        index = object.__new__(CustomerIndex)
+        index.df = df
+        index.sender = self.sender
+        index.receiver = self.receiver
+        return index
+
+    @staticmethod
+    def _positions(side: Dict[str, np.ndarray], customer: str) -> np.ndarray:
+        """Return the row positions of `customer` on one side (empty if unknown)."""
+        names = side['names']
+        k = np.searchsorted(names, customer)
+        if k == len(names) or names[k] != customer:
+            return np.empty(0, dtype=np.int64)
+        return side['order'][side['offsets'][k]:side['offsets'][k + 1]]
+
+    def positions(self, customers: List[str], side: str = 'sender') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Collect the row positions of several customers in one pass.
+
+        Parameters
+        ----------
+        customers : List[str]
+            Account names; unknown names get an empty slice.
+        side : str
+            'sender' for the rows they sent, 'receiver' for the rows they received.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            Row positions of every customer concatenated in the order of
+            `customers` (each slice in step order), and the bounds of every
+            customer's slice within them.
+        """
+        index = self.sender if side == 'sender' else self.receiver
+        slices = [CustomerIndex._positions(index, customer) for customer in customers]
+        offsets = np.zeros(len(slices) + 1, dtype=np.int64)
+        np.cumsum([len(s) for s in slices], out=offsets[1:])
+        rows = np.concatenate(slices) if slices else np.empty(0, dtype=np.int64)
+        return rows, offsets
+
+    def contains(self, customer: str) -> bool:
+        """Return True if the customer sent or received at least one transaction."""
+        return bool(
+            len(CustomerIndex._positions(self.sender, customer)) or
+            len(CustomerIndex._positions(self.receiver, customer))
+        )
+
+    def sent(self, customer: str) -> pd.DataFrame:
+        """Return the transactions sent by `customer`, in step order."""
+        return self.df.iloc[CustomerIndex._positions(self.sender, customer)]
+
+    def received(self, customer: str) -> pd.DataFrame:
+        """Return the transactions received by `customer`, in step order."""
+        return self.df.iloc[CustomerIndex._positions(self.receiver, customer)]
+
+    def history(self, customer: str) -> pd.DataFrame:
+        """Return all transactions sent or received by `customer`, in step order."""
+        positions = np.union1d(
+            CustomerIndex._positions(self.sender, customer),
+            CustomerIndex._positions(self.receiver, customer)
+        )
+        return self.df.iloc[positions].sort_values('step', kind='stable')
+
+    def flagged(self, customer: str) -> pd.DataFrame:
+        """Return the flagged transactions sent by `customer`."""
+        sent = self.sent(customer)
+        if 'transaction_flag' not in sent.columns:
+            return sent.iloc[0:0]
+        return sent[sent['transaction_flag'] == 1]
+
+    @staticmethod
+    def counterparty_table(sent: pd.DataFrame, received: pd.DataFrame) -> pd.DataFrame:
+        """
+        Summarize the counterparties of a customer's sent and received rows.
+
+        Parameters
+        ----------
+        sent : pd.DataFrame
+            Transactions sent by the customer.
+        received : pd.DataFrame
+            Transactions received by the customer.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per counterparty and direction with the number of
+            transactions and total amount, largest volume first.
+        """
+        table = pd.concat([
+            pd.DataFrame({'counterparty': np.asarray(sent['nameDest'], dtype=object),
+                          'direction': 'sent', 'amount': sent['amount'].to_numpy()}),
+            pd.DataFrame({'counterparty': np.asarray(received['nameOrig'], dtype=object),
+                          'direction': 'received', 'amount': received['amount'].to_numpy()})
+        ])
+        return (
+            table.groupby(['counterparty', 'direction'])['amount']
+            .agg(transactions='size', total_amount='sum')
+            .reset_index()
+            .sort_values('total_amount', ascending=False)
+        )
+
+    def counterparties(self, customer: str) -> pd.DataFrame:
+        """
+        Summarize the accounts `customer` exchanged money with.
+
+        Parameters
+        ----------
+        customer : str
+            Account name.
+
+        Returns
+        -------
+        pd.DataFrame
+            See `counterparty_table`.
+        """
+        return CustomerIndex.counterparty_table(self.sent(customer), self.received(customer))
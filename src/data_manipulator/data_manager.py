@@ -1,7 +1,14 @@
 import pandas as pd
 import os
-from typing import List, Dict
-from src.constants.config import DATA_PATH, COLUMNS
+import gzip
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Iterator, Optional, Tuple, BinaryIO
+from src.constants.config import (
+    DATA_PATH, COLUMNS, NUMERIC_COLUMNS, CATEGORICAL_COLUMNS, LABEL_COLUMN,
+    CHUNK_SIZE, READ_WORKERS, PARSE_ENGINE
+)
+from src.data_manipulator.load_filter import LoadFilter
 
 
 class DataManager:
@@ -10,11 +17,30 @@ class DataManager:
     from disk and validating their schema.
 
     Responsibilities:
-    - Load CSV files from a directory
+    - Load CSV files from a directory, plain or compressed
     - Validate required column names
     - Merge valid datasets into a single DataFrame
+
+    Compressed files (`.csv.gz`, `.zst`, `.zip`) are decompressed as a
+    stream while they are parsed, never to disk. Reading `.zst` files
+    needs the `zstandard` package.
+
+    Only the required `COLUMNS` (plus `LABEL_COLUMN`, if present) are
+    parsed, and numeric columns are parsed straight to float. A chunk
+    holding a value that is not a number is parsed again as text, so
+    `TransactionCleaner` only converts the chunks that failed.
     """
 
+    # accepted file suffixes and their compression (None: plain CSV)
+    COMPRESSIONS = {'.csv': None, '.csv.gz': 'gzip', '.zst': 'zstd', '.zip': 'zip'}
+
+    # dtypes applied while parsing; float keeps missing values parseable,
+    # cleaning casts to the final `NUMERIC_COLUMNS` types
+    PARSE_DTYPES = {
+        **{col: 'float64' for col in NUMERIC_COLUMNS},
+        **{col: object for col in CATEGORICAL_COLUMNS}
+    }
+
     def __init__(self):
         """
         Initialize DataManager.
@@ -54,9 +80,148 @@ class DataManager:
         Returns
         -------
         List[str]
-            List containing only files with `.csv` extension.
+            List containing only CSV files, plain (`.csv`) or compressed
+            (`.csv.gz`, `.zst`, `.zip`).
+        """
+        return list(filter(lambda x: x.lower().endswith(tuple(DataManager.COMPRESSIONS)), files))
+
+    @staticmethod
+    def _compression(file_path: str) -> Optional[str]:
+        """
+        Return the compression of a dataset file from its suffix.
+
+        Parameters
+        ----------
+        file_path : str
+            Path or name of the file.
+
+        Returns
+        -------
+        Optional[str]
+            'gzip', 'zstd' or 'zip' (as understood by `pd.read_csv`),
+            or None for a plain file.
+        """
+        for suffix, compression in DataManager.COMPRESSIONS.items():
+            if file_path.lower().endswith(suffix):
+                return compression
+        return None
+
+    @staticmethod
+    def _open(file_path: str) -> BinaryIO:
+        """
+        Open a dataset file as a stream of its decompressed bytes.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file.
+
+        Returns
+        -------
+        BinaryIO
+            Binary file object; only the bytes read are decompressed.
+            For a `.zip` archive this is its first member.
+        """
+        compression = DataManager._compression(file_path)
+        if compression == 'gzip':
+            return gzip.open(file_path, 'rb')
+        if compression == 'zip':
+            archive = zipfile.ZipFile(file_path)
+            return archive.open(archive.namelist()[0])
+        if compression == 'zstd':
+            import zstandard
+            return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+        return open(file_path, 'rb')
+
+    @staticmethod
+    def file_sizes(file_path: str) -> Tuple[int, Optional[int]]:
+        """
+        Return the size of a dataset file on disk and decompressed, without
+        decompressing it.
+
+        The decompressed size is the one the archive records: the gzip
+        trailer (modulo 4 GiB, as in the format), the zip directory or the
+        zstd frame header.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file.
+
+        Returns
+        -------
+        Tuple[int, Optional[int]]
+            Bytes on disk and decompressed bytes; the latter is None if the
+            archive does not record it (e.g. a zstd stream compressed from
+            a pipe).
+        """
+        size = os.path.getsize(file_path)
+        compression = DataManager._compression(file_path)
+        if compression is None:
+            return size, size
+        if compression == 'gzip':
+            with open(file_path, 'rb') as f:
+                f.seek(-4, os.SEEK_END)
+                return size, int.from_bytes(f.read(4), 'little')
+        if compression == 'zip':
+            with zipfile.ZipFile(file_path) as archive:
+                return size, archive.infolist()[0].file_size
+        try:
+            import zstandard
+        except ImportError:
+            return size, None
+        with open(file_path, 'rb') as f:
+            content_size = zstandard.frame_content_size(f.read(18))
+        return size, content_size if content_size >= 0 else None
+
+    @staticmethod
+    def io_savings(file_paths: List[str]) -> Dict[str, int]:
+        """
+        Compare the bytes read from disk with the size of the CSV data they hold.
+
+        Parameters
+        ----------
+        file_paths : List[str]
+            Paths of the files read.
+
+        Returns
+        -------
+        Dict[str, int]
+            - 'compressed_files': number of compressed files
+            - 'disk_bytes': bytes read from disk
+            - 'csv_bytes': bytes of CSV data; a file with an unknown
+              decompressed size counts with its size on disk
+            - 'saved_bytes': `csv_bytes - disk_bytes`
+        """
+        report = {'compressed_files': 0, 'disk_bytes': 0, 'csv_bytes': 0}
+        for file_path in file_paths:
+            size, data_size = DataManager.file_sizes(file_path)
+            report['compressed_files'] += DataManager._compression(file_path) is not None
+            report['disk_bytes'] += size
+            report['csv_bytes'] += size if data_size is None else data_size
+        report['saved_bytes'] = report['csv_bytes'] - report['disk_bytes']
+        return report
+
+    @staticmethod
+    def header(file_path: str) -> List[str]:
+        """
+        Read the column names of a CSV file, plain or compressed.
+
+        Only the first line is decompressed and parsed.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the file.
+
+        Returns
+        -------
+        List[str]
+            Column names.
         """
-        return list(filter(lambda x: x.split('.')[-1] == 'csv', files))
+        return list(pd.read_csv(
+            file_path, nrows=0, compression=DataManager._compression(file_path)
+        ).columns)
 
     @staticmethod
     def _valid_columns_name(columns: List[str]) -> bool:
@@ -80,20 +245,271 @@ class DataManager:
         return True
 
     @staticmethod
-    def read_csv(path: str) -> Dict[str, object]:
+    def _projection(columns: List[str]) -> List[str]:
+        """
+        Select the columns worth parsing from a file's header.
+
+        Parameters
+        ----------
+        columns : List[str]
+            Column names of the file.
+
+        Returns
+        -------
+        List[str]
+            The required `COLUMNS` and `LABEL_COLUMN` among them, in file order.
+        """
+        return [col for col in columns if col in COLUMNS or col == LABEL_COLUMN]
+
+    @staticmethod
+    def _estimate_rows(file_path: str, sample_bytes: int = 1 << 20) -> int:
+        """
+        Estimate the number of data rows of a CSV file without parsing it.
+
+        The average line length is measured on the first `sample_bytes`
+        bytes and extrapolated to the file size. For a compressed file only
+        the sample is decompressed and extrapolated to the decompressed
+        size the archive records (or to the size on disk if unknown).
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the CSV file.
+        sample_bytes : int
+            Number of leading bytes used for the estimate.
+
+        Returns
+        -------
+        int
+            Estimated number of rows (header excluded).
+        """
+        disk_size, size = DataManager.file_sizes(file_path)
+        size = disk_size if size is None else size
+        with DataManager._open(file_path) as f:
+            sample = f.read(sample_bytes)
+        lines = sample.count(b'\n')
+        if not lines or len(sample) == size:
+            return max(lines - 1, 0)
+        return int(size * lines / len(sample)) - 1
+
+    @staticmethod
+    def iter_csv_chunks(path: str, info: Dict[str, list] = None, chunk_size: int = CHUNK_SIZE,
+                        progress=None) -> Iterator[pd.DataFrame]:
+        """
+        Stream the rows of every valid CSV file in a directory chunk by chunk.
+
+        The schema is checked on the first chunk of each file; files with
+        missing columns are skipped.
+
+        Parameters
+        ----------
+        path : str
+            Path to the directory containing CSV files.
+        info : Dict[str, list], optional
+            Receives the valid and invalid file names under 'matches'
+            and 'not_matches' as files are read.
+        chunk_size : int
+            Number of rows per chunk.
+        progress : StageProgress, optional
+            Progress handle updated with the number of parsed rows.
+
+        Yields
+        ------
+        pd.DataFrame
+            Chunks of at most `chunk_size` rows, in file order.
+        """
+        info = info if info is not None else {'matches': [], 'not_matches': []}
+        csv_files = DataManager._csv_files(DataManager._get_all_files(path))
+        if progress is not None:
+            progress.set_total(sum(
+                DataManager._estimate_rows(os.path.join(path, file))
+                for file in csv_files
+            ))
+
+        for file in csv_files:
+            valid = False
+            for chunk in DataManager._file_chunks(os.path.join(path, file), chunk_size):
+                valid = True
+                yield chunk
+                if progress is not None:
+                    progress.update(len(chunk))
+                    progress.check()
+            (info['matches'] if valid else info['not_matches']).append(file)
+
+    @staticmethod
+    def _file_chunks(file_path: str, chunk_size: int = CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Stream the rows of one CSV (or JSON Lines, `.jsonl`) file chunk by chunk.
+
+        Nothing is yielded if the file misses a required column. A CSV
+        file's header is checked before any row is parsed, so an invalid
+        compressed file is never inflated beyond its first line.
+
+        Only the projected columns are parsed, with `PARSE_DTYPES`. If a
+        chunk fails to parse with them, that chunk alone is parsed again
+        without dtypes and typed parsing resumes after it.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the CSV or JSON Lines file.
+        chunk_size : int
+            Number of rows per chunk.
+
+        Yields
+        ------
+        pd.DataFrame
+            Chunks of at most `chunk_size` rows.
+        """
+        if file_path.endswith('.jsonl'):
+            reader = pd.read_json(file_path, lines=True, chunksize=chunk_size, dtype=False, convert_dates=False)
+            with reader:
+                for chunk in reader:
+                    if not DataManager._valid_columns_name(chunk.columns):
+                        return
+                    yield chunk[DataManager._projection(chunk.columns)]
+            return
+
+        header = DataManager.header(file_path)
+        if not DataManager._valid_columns_name(header):
+            return
+
+        start, typed = 0, True
+        while True:
+            begin = start
+            reader = pd.read_csv(
+                file_path, chunksize=chunk_size, compression=DataManager._compression(file_path),
+                usecols=DataManager._projection(header), skiprows=range(1, start + 1),
+                dtype=DataManager.PARSE_DTYPES if typed else None, nrows=None if typed else chunk_size
+            )
+            try:
+                with reader:
+                    for chunk in reader:
+                        if begin and not len(chunk):
+                            continue
+                        chunk.index = pd.RangeIndex(start, start + len(chunk))
+                        start += len(chunk)
+                        yield chunk
+            except ValueError:
+                if not typed:
+                    raise
+                typed = False
+                continue
+            if typed or start - begin < chunk_size:
+                return
+            typed = True
+
+    @staticmethod
+    def read_file(file_path: str, progress=None, engine: str = PARSE_ENGINE,
+                  row_filter: LoadFilter = None) -> Optional[pd.DataFrame]:
+        """
+        Load and validate a single CSV or JSON Lines file.
+
+        Parameters
+        ----------
+        file_path : str
+            Path to the CSV or JSON Lines file.
+        progress : StageProgress, optional
+            Progress handle updated with the number of parsed rows.
+        engine : str
+            'c' parses in chunks (`_file_chunks`); 'pyarrow' parses a CSV
+            file at once on all cores, falling back to 'c' if a value does
+            not match `PARSE_DTYPES`. Needs the `pyarrow` package.
+        row_filter : LoadFilter, optional
+            Keeps only the matching rows of every parsed chunk.
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            The file's (matching) rows, or None if its schema is invalid.
+        """
+        row_filter = row_filter or LoadFilter()
+        if engine == 'pyarrow' and not file_path.endswith('.jsonl'):
+            header = DataManager.header(file_path)
+            if not DataManager._valid_columns_name(header):
+                return None
+            try:
+                df = pd.read_csv(
+                    file_path, engine='pyarrow', compression=DataManager._compression(file_path),
+                    usecols=DataManager._projection(header), dtype=DataManager.PARSE_DTYPES
+                )
+            except ValueError:
+                pass
+            else:
+                if progress is not None:
+                    progress.update(len(df))
+                    progress.check()
+                return row_filter.apply(df)
+
+        chunks = []
+        for chunk in DataManager._file_chunks(file_path):
+            chunks.append(row_filter.apply(chunk))
+            if progress is not None:
+                progress.update(len(chunk))
+                progress.check()
+        return pd.concat(chunks) if chunks else None
+
+    @staticmethod
+    def read_files(file_paths: List[str], progress=None, workers: Optional[int] = READ_WORKERS,
+                   engine: str = PARSE_ENGINE, row_filter: LoadFilter = None) -> List[Optional[pd.DataFrame]]:
+        """
+        Load and validate several files, decompressing and parsing them in parallel.
+
+        zlib, zstd and the pandas C parser release the GIL while they work,
+        so threads overlap the decompression and parsing of different files.
+
+        Parameters
+        ----------
+        file_paths : List[str]
+            Paths of the CSV or JSON Lines files.
+        progress : StageProgress, optional
+            Progress handle updated with the number of parsed rows.
+        workers : int, optional
+            Number of threads; None uses one per CPU core. Never more
+            threads than files are started.
+        engine : str
+            CSV parser, see `read_file`.
+        row_filter : LoadFilter, optional
+            Keeps only the matching rows, see `read_file`.
+
+        Returns
+        -------
+        List[Optional[pd.DataFrame]]
+            The rows of every file in input order, None for invalid files.
+        """
+        workers = min(len(file_paths), workers or os.cpu_count() or 1)
+        def read(file_path):
+            return DataManager.read_file(file_path, progress, engine, row_filter)
+
+        if workers <= 1:
+            return [read(file_path) for file_path in file_paths]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(read, file_paths))
+
+    @staticmethod
+    def read_csv(path: str, progress=None, row_filter: LoadFilter = None) -> Dict[str, object]:
         """
         Load and validate CSV datasets from a directory.
 
         The method:
-        - Reads all CSV files in the directory
+        - Reads all CSV files in the directory, plain or compressed
         - Validates their column schema
         - Merges valid files into a single DataFrame
         - Tracks valid and invalid files
 
+        Files are read in parallel (`read_files`) and parsed in chunks of
+        `CHUNK_SIZE` rows so a long load can report progress and be
+        cancelled between chunks. With a `row_filter`, every chunk is
+        filtered as soon as it is parsed, so only matching rows are kept.
+
         Parameters
         ----------
         path : str
             Path to the directory containing CSV files.
+        progress : StageProgress, optional
+            Progress handle updated with the number of parsed rows.
+        row_filter : LoadFilter, optional
+            Restricts the load to a step range and/or transaction types.
 
         Returns
         -------
@@ -106,6 +522,8 @@ class DataManager:
                 Names of CSV files with valid schema.
             - 'not_matches': List[str]
                 Names of CSV files with invalid schema.
+            - 'io': Dict[str, int]
+                `io_savings` of the valid files.
         """
         info = {
             'data_frame': None,
@@ -113,30 +531,20 @@ class DataManager:
             'not_matches': []
         }
 
-        files = DataManager._get_all_files(path)
-        if not files:
-            info['data_frame'] = pd.DataFrame()
-            return info
-
-        matches = []
-        not_matches = []
-        data_frames = []
+        files = DataManager._csv_files(DataManager._get_all_files(path))
+        paths = [os.path.join(path, file) for file in files]
+        if progress is not None:
+            progress.set_total(sum(DataManager._estimate_rows(file_path) for file_path in paths))
 
-        for file in DataManager._csv_files(files):
-            file_path = os.path.join(path, file)
-            current_data = pd.read_csv(file_path)
-
-            if not DataManager._valid_columns_name(current_data.columns):
-                not_matches.append(file)
-            else:
-                matches.append(file)
-                data_frames.append(current_data)
+        frames = DataManager.read_files(paths, progress=progress, row_filter=row_filter)
+        for file, df in zip(files, frames):
+            (info['matches'] if df is not None else info['not_matches']).append(file)
+        frames = [df for df in frames if df is not None]
 
         info['data_frame'] = (
-            pd.concat(data_frames) if len(data_frames) else pd.DataFrame()
+            pd.concat(frames) if len(frames) else pd.DataFrame()
         )
-        info['matches'] = matches
-        info['not_matches'] = not_matches
+        info['io'] = DataManager.io_savings([os.path.join(path, file) for file in info['matches']])
 
         return info
 
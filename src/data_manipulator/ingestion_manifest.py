@@ -0,0 +1,260 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Optional
+from src.constants.config import DATA_PATH, INGEST_CACHE_DIR, ROW_GROUP_ROWS
+from src.data_manipulator.data_manager import DataManager
+from src.data_manipulator.load_filter import LoadFilter
+
+
+class IngestionManifest:
+    """
+    IngestionManifest makes repeated loads of a dataset directory
+    incremental.
+
+    It records, for every CSV file ever ingested, its size, modification
+    time and SHA-256 content hash together with its validation result and
+    row count, and keeps the parsed rows of valid files in a local cache.
+    A later load only parses files that are new or whose content changed;
+    unchanged files come from the cache, and files that disappeared from
+    the directory are reported and dropped from the manifest.
+
+    Change detection is cheap first: a file whose size and modification
+    time match the manifest is unchanged without being read. Otherwise its
+    hash decides, so a file that was only touched or copied is not parsed
+    again. A file is hashed at most once per load (the hash taken by the
+    scan is reused when it is parsed), and a file modified while it was
+    being parsed is not cached, so it is parsed again on the next load.
+
+    The merged result is the same DataFrame `DataManager.read_csv` builds:
+    files in directory order, each indexed by row position.
+
+    Cached rows are stored in row groups of `ROW_GROUP_ROWS` rows, and the
+    manifest keeps each group's `LoadFilter.stats` (step min/max, types).
+    A filtered load skips whole files and row groups whose statistics
+    cannot match without reading them.
+
+    Responsibilities:
+    - Detect new, changed, unchanged and removed files
+    - Parse only new and changed files
+    - Merge them with the cached rows of unchanged files
+    - Skip cached data that cannot match a load filter
+    - Persist the manifest and the cache between runs
+    """
+
+    MANIFEST_FILE = 'manifest.json'
+
+    # bumped whenever the cached rows change shape (2: projected, typed columns;
+    # 3: row groups with statistics)
+    VERSION = 3
+
+    def __init__(self, path: str = DATA_PATH, cache_dir: str = INGEST_CACHE_DIR):
+        """
+        Load the manifest of a dataset directory, or start an empty one.
+
+        Parameters
+        ----------
+        path : str
+            Directory containing the CSV files.
+        cache_dir : str
+            Directory holding the manifests and cached rows; every dataset
+            directory gets its own subdirectory.
+        """
+        self.path = path
+        key = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        self.cache_dir = os.path.join(cache_dir, key)
+        self.manifest_path = os.path.join(self.cache_dir, IngestionManifest.MANIFEST_FILE)
+        self.entries: Dict[str, dict] = {}
+        # file -> ((size, mtime_ns), sha256) of the hashes taken by this instance
+        self._hashes: Dict[str, tuple] = {}
+
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == IngestionManifest.VERSION:
+                self.entries = manifest['files']
+
+    @staticmethod
+    def file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+        """Return the SHA-256 hex digest of a file, read in blocks."""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _hash(self, file: str, stat: os.stat_result) -> str:
+        """Return the hash of `file`, reusing the one already taken at the same size and mtime."""
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self._hashes.get(file)
+        if cached is None or cached[0] != key:
+            cached = (key, IngestionManifest.file_hash(os.path.join(self.path, file)))
+            self._hashes[file] = cached
+        return cached[1]
+
+    def scan(self, files: List[str] = None) -> Dict[str, List[str]]:
+        """
+        Compare the directory with the manifest without parsing any file.
+
+        Parameters
+        ----------
+        files : List[str], optional
+            CSV file names of the directory, if already listed.
+
+        Returns
+        -------
+        Dict[str, List[str]]
+            File names under 'new', 'changed', 'unchanged' and 'removed'.
+            Files whose size or mtime changed but whose content did not are
+            'unchanged' (their manifest entry gets the new stat values); files
+            whose cached rows are gone are 'changed'.
+        """
+        status = {'new': [], 'changed': [], 'unchanged': [], 'removed': []}
+        if files is None:
+            files = DataManager._csv_files(DataManager._get_all_files(self.path))
+
+        for file in files:
+            entry = self.entries.get(file)
+            if entry is None:
+                status['new'].append(file)
+                continue
+            stat = os.stat(os.path.join(self.path, file))
+            if entry['valid'] and not all(map(os.path.exists, self._cache_paths(entry))):
+                status['changed'].append(file)
+            elif stat.st_size == entry['size'] and stat.st_mtime_ns == entry['mtime_ns']:
+                status['unchanged'].append(file)
+            elif self._hash(file, stat) == entry['sha256']:
+                entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                status['unchanged'].append(file)
+            else:
+                status['changed'].append(file)
+
+        status['removed'] = [file for file in self.entries if file not in files]
+        return status
+
+    def _cache_paths(self, entry: dict) -> List[str]:
+        """Return the cache files of a manifest entry, one per row group."""
+        return [
+            os.path.join(self.cache_dir, f"{entry['sha256']}_{group:05d}.pkl")
+            for group in range(len(entry.get('groups', [])))
+        ]
+
+    def _ingest(self, file: str, df: Optional[pd.DataFrame], stat: os.stat_result,
+                digest: str) -> Optional[pd.DataFrame]:
+        """
+        Cache one parsed file (None if invalid) under the stat and hash taken before parsing.
+
+        If the file's size or mtime changed while it was parsed, the rows may
+        not match `digest`: they are returned but neither cached nor recorded.
+        """
+        after = os.stat(os.path.join(self.path, file))
+        if (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            return df
+        entry = {
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest,
+            'valid': df is not None,
+            'rows': 0 if df is None else len(df),
+            'ingested_at': datetime.now().isoformat(timespec='seconds')
+        }
+        if df is not None:
+            groups = [df.iloc[start:start + ROW_GROUP_ROWS] for start in range(0, max(len(df), 1), ROW_GROUP_ROWS)]
+            entry['groups'] = [LoadFilter.stats(group) for group in groups]
+            entry['stats'] = LoadFilter.merge_stats(entry['groups'])
+            for group, path in zip(groups, self._cache_paths(entry)):
+                group.to_pickle(path)
+        self.entries[file] = entry
+        return df
+
+    def _forget(self, file: str):
+        """Drop a file from the manifest and delete its cached rows unless another file shares them."""
+        entry = self.entries.pop(file)
+        shared = any(other['sha256'] == entry['sha256'] for other in self.entries.values())
+        if entry['valid'] and not shared:
+            for path in self._cache_paths(entry):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def load(self, progress=None, row_filter: LoadFilter = None) -> Dict[str, object]:
+        """
+        Load the dataset directory, parsing only new and changed files.
+
+        Parameters
+        ----------
+        progress : StageProgress, optional
+            Progress handle updated with the number of parsed rows.
+        row_filter : LoadFilter, optional
+            Restricts the result to a step range and/or transaction types.
+            New and changed files are still parsed and cached in full;
+            cached files and row groups that cannot match are not read.
+
+        Returns
+        -------
+        Dict[str, object]
+            The keys of `DataManager.read_csv` ('data_frame', 'matches',
+            'not_matches', 'io' for the parsed files) plus the file names
+            under 'new', 'changed', 'unchanged' and 'removed', and under
+            'pushdown' the number of cached 'row_groups' of the unchanged
+            files, the 'row_groups_read' of them and the 'files_skipped'.
+        """
+        row_filter = row_filter or LoadFilter()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = DataManager._csv_files(DataManager._get_all_files(self.path))
+        status = self.scan(files)
+
+        for file in status['removed'] + status['changed']:
+            self._forget(file)
+
+        pending = [os.path.join(self.path, file) for file in status['new'] + status['changed']]
+        if progress is not None:
+            progress.set_total(sum(DataManager._estimate_rows(file_path) for file_path in pending))
+
+        names = status['new'] + status['changed']
+        stats = [os.stat(file_path) for file_path in pending]
+        digests = [self._hash(file, stat) for file, stat in zip(names, stats)]
+        frames = DataManager.read_files(pending, progress=progress)
+        parsed = {
+            file: self._ingest(file, df, stat, digest)
+            for file, df, stat, digest in zip(names, frames, stats, digests)
+        }
+        self.save()
+
+        info = {'data_frame': None, 'matches': [], 'not_matches': [], **status}
+        info['io'] = DataManager.io_savings([
+            file_path for file_path, df in zip(pending, frames) if df is not None
+        ])
+        info['pushdown'] = {'row_groups': 0, 'row_groups_read': 0, 'files_skipped': 0}
+        frames = []
+        for file in files:
+            entry = self.entries.get(file)
+            if (parsed[file] is None) if file in parsed else not entry['valid']:
+                info['not_matches'].append(file)
+                continue
+            info['matches'].append(file)
+            if file in parsed:
+                frames.append(row_filter.apply(parsed[file]))
+                continue
+            info['pushdown']['row_groups'] += len(entry['groups'])
+            if not row_filter.may_match(entry['stats']):
+                info['pushdown']['files_skipped'] += 1
+            else:
+                for stats, path in zip(entry['groups'], self._cache_paths(entry)):
+                    if row_filter.may_match(stats):
+                        frames.append(row_filter.apply(pd.read_pickle(path)))
+                        info['pushdown']['row_groups_read'] += 1
+
+        info['data_frame'] = pd.concat(frames) if frames else pd.DataFrame()
+        return info
+
+    def save(self):
+        """Write the manifest atomically."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary = self.manifest_path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': IngestionManifest.VERSION, 'path': os.path.abspath(self.path), 'files': self.entries
+            }, f, indent=2)
+        os.replace(temporary, self.manifest_path)
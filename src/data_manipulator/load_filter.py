@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Tuple
+
+
+class LoadFilter:
+    """
+    LoadFilter restricts a load to a `step` range and/or a set of
+    transaction types.
+
+    It is applied while files are read, so rows outside the window never
+    reach memory, and it decides from min/max statistics of a file or a
+    row group whether that data can hold any matching row at all, so it
+    can be skipped without being read.
+
+    Rows are matched on the values cleaning will keep: `step` as a
+    number truncated to an integer, `type` stripped of whitespace. Rows
+    whose `step` is not a number cannot match a step range (cleaning
+    would drop them anyway), so filtering before cleaning gives the same
+    rows as filtering after it.
+
+    Responsibilities:
+    - Select the matching rows of a chunk
+    - Summarize a chunk as min/max statistics
+    - Decide from statistics whether a chunk can be skipped
+    """
+
+    def __init__(self, steps: Optional[Tuple[int, int]] = None, types: Optional[List[str]] = None):
+        """
+        Initialize the filter.
+
+        Parameters
+        ----------
+        steps : Tuple[int, int], optional
+            Inclusive first and last `step` to load; None loads every step.
+        types : List[str], optional
+            Transaction types to load; None loads every type.
+        """
+        self.steps = None if steps is None else (int(steps[0]), int(steps[1]))
+        self.types = None if types is None else sorted({str(t).strip() for t in types})
+
+    @property
+    def active(self) -> bool:
+        """Return True if the filter excludes anything."""
+        return self.steps is not None or self.types is not None
+
+    @staticmethod
+    def _steps(df: pd.DataFrame) -> pd.Series:
+        """Return `step` as cleaning will keep it (NaN where it is not a finite number)."""
+        steps = np.trunc(pd.to_numeric(df['step'], errors='coerce'))
+        return steps.where(np.isfinite(steps))
+
+    @staticmethod
+    def _types(df: pd.DataFrame) -> pd.Series:
+        """Return `type` as cleaning will keep it."""
+        return df['type'].astype(str).str.strip()
+
+    def mask(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Flag the rows of a chunk that match the filter.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Raw or cleaned transaction rows.
+
+        Returns
+        -------
+        pd.Series
+            Boolean mask aligned with `df`.
+        """
+        mask = pd.Series(True, index=df.index)
+        if self.steps is not None:
+            mask &= LoadFilter._steps(df).between(*self.steps)
+        if self.types is not None:
+            mask &= LoadFilter._types(df).isin(self.types)
+        return mask
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return the matching rows of a chunk (the chunk itself if the filter is inactive)."""
+        return df[self.mask(df)] if self.active else df
+
+    @staticmethod
+    def stats(df: pd.DataFrame) -> dict:
+        """
+        Summarize a chunk for later skipping decisions.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Raw transaction rows.
+
+        Returns
+        -------
+        dict
+            - 'rows': number of rows
+            - 'step_min' / 'step_max': numeric `step` range, None if no
+              row has a numeric step
+            - 'types': sorted distinct stripped `type` values
+        """
+        steps = LoadFilter._steps(df)
+        valid = steps.notna().any()
+        return {
+            'rows': len(df),
+            'step_min': int(steps.min()) if valid else None,
+            'step_max': int(steps.max()) if valid else None,
+            'types': sorted(LoadFilter._types(df).unique())
+        }
+
+    @staticmethod
+    def merge_stats(stats: List[dict]) -> dict:
+        """Combine the statistics of several chunks, e.g. the row groups of a file."""
+        steps = [s for s in stats if s['step_min'] is not None]
+        return {
+            'rows': sum(s['rows'] for s in stats),
+            'step_min': min(s['step_min'] for s in steps) if steps else None,
+            'step_max': max(s['step_max'] for s in steps) if steps else None,
+            'types': sorted({t for s in stats for t in s['types']})
+        }
+
+    def may_match(self, stats: dict) -> bool:
+        """
+        Decide from chunk statistics whether the chunk can hold a matching row.
+
+        Parameters
+        ----------
+        stats : dict
+            Statistics from `stats` or `merge_stats`.
+
+        Returns
+        -------
+        bool
+            False only if no row of the chunk can match, so it can be skipped.
+        """
+        if not self.active:
+            return True
+        if not stats['rows']:
+            return False
+        if self.steps is not None:
+            if stats['step_min'] is None:
+                return False
+            if stats['step_max'] < self.steps[0] or stats['step_min'] > self.steps[1]:
+                return False
+        if self.types is not None and not set(self.types) & set(stats['types']):
+            return False
+        return True
+
+    def describe(self) -> str:
+        """Return a short human-readable description of the filter."""
+        parts = []
+        if self.steps is not None:
+            parts.append(f"steps {self.steps[0]}-{self.steps[1]}")
+        if self.types is not None:
+            parts.append(f"types {', '.join(self.types)}")
+        return "; ".join(parts) or "none"
@@ -0,0 +1,149 @@
+import os
+import math
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterator, List
+from src.constants.config import CHUNK_SIZE
+from src.data_manipulator.data_manager import DataManager
+from src.data_manipulator.transactions_cleaner import TransactionCleaner
+
+
+class SenderPartitioner:
+    """
+    SenderPartitioner splits a dataset that does not fit in memory into
+    sender-contiguous partitions spilled to local disk.
+
+    Rows are streamed from the CSV files chunk by chunk, cleaned, and
+    routed by a hash of `nameOrig`, so all rows of a sender end up in
+    the same partition. Every partition is small enough to be loaded
+    and processed on its own within the memory budget.
+
+    The index of every row is its position in the input (in file
+    order), so partitions can be restored to the original order and
+    duplicates are resolved exactly as in the in-memory cleaning.
+
+    Responsibilities:
+    - Size the partitions from a memory budget
+    - Write cleaned chunks to per-partition spill files
+    - Load a partition back, deduplicated and in input order
+    """
+
+    def __init__(self, spill_dir: str, memory_mb: int):
+        """
+        Initialize the partitioner.
+
+        Parameters
+        ----------
+        spill_dir : str
+            Directory receiving the spill files.
+        memory_mb : int
+            Memory budget for one partition and its derived columns, in MiB.
+        """
+        self.spill_dir = spill_dir
+        self.memory_bytes = memory_mb * 2 ** 20
+        self.partitions = 1
+        self.files: Dict[int, List[str]] = {}
+        os.makedirs(self.spill_dir, exist_ok=True)
+
+    @staticmethod
+    def partition_of(senders: pd.Series, partitions: int) -> np.ndarray:
+        """Return the partition number of every row, from a stable hash of the sender."""
+        hashes = pd.util.hash_array(senders.to_numpy(dtype=object))
+        return (hashes % np.uint64(partitions)).astype(np.int64)
+
+    def _plan(self, path: str, first: pd.DataFrame, expansion: float) -> int:
+        """
+        Pick the number of partitions from the size of the first chunk.
+
+        The in-memory size per row is measured on the first chunk, scaled
+        to the estimated number of input rows and by `expansion` (the
+        growth from features and scores), then divided by the budget.
+        """
+        rows = sum(
+            DataManager._estimate_rows(os.path.join(path, file))
+            for file in DataManager._csv_files(DataManager._get_all_files(path))
+        )
+        row_bytes = first.memory_usage(deep=True).sum() / max(len(first), 1)
+        return max(1, math.ceil(rows * row_bytes * expansion / self.memory_bytes))
+
+    def partition(self, path: str, expansion: float = 4.0, progress=None) -> dict:
+        """
+        Stream, clean and partition every valid CSV file of a directory.
+
+        Parameters
+        ----------
+        path : str
+            Directory containing the CSV files.
+        expansion : float
+            Expected growth of a partition once features and scores are added.
+        progress : StageProgress, optional
+            Progress handle updated with the number of parsed rows.
+
+        Returns
+        -------
+        dict
+            - 'rows': number of input rows
+            - 'partitions': number of partitions
+            - 'matches' / 'not_matches': valid and invalid file names
+            - 'stats': row-wise cleaning statistics (duplicates are removed
+              when a partition is loaded)
+        """
+        info = {'matches': [], 'not_matches': []}
+        stats = {'removed_missing': 0, 'removed_invalid_types': 0, 'removed_invalid_values': 0}
+        rows = 0
+
+        chunks = DataManager.iter_csv_chunks(path, info, chunk_size=CHUNK_SIZE, progress=progress)
+        for number, chunk in enumerate(chunks):
+            if number == 0:
+                self.partitions = self._plan(path, chunk, expansion)
+
+            chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+            rows += len(chunk)
+
+            cleaned = TransactionCleaner.clean_rows(chunk)
+            for key in stats:
+                stats[key] += cleaned['stats'][key]
+            df = cleaned['cleaned_data']
+
+            parts = SenderPartitioner.partition_of(df['nameOrig'], self.partitions)
+            for part, rows_of_part in df.groupby(parts):
+                file = os.path.join(self.spill_dir, f"part_{part:05d}_{number:06d}.pkl")
+                rows_of_part.to_pickle(file)
+                self.files.setdefault(int(part), []).append(file)
+
+        return {
+            'rows': rows,
+            'partitions': self.partitions,
+            'matches': info['matches'],
+            'not_matches': info['not_matches'],
+            'stats': stats
+        }
+
+    def load(self, part: int) -> dict:
+        """
+        Load one partition in input order with duplicates removed.
+
+        Duplicate rows share their sender, hence their partition, so
+        removing them per partition matches the in-memory cleaning.
+
+        Returns
+        -------
+        dict
+            {
+                'cleaned_data': pd.DataFrame,
+                'number_of_removed_samples': int
+            }
+        """
+        df = pd.concat([pd.read_pickle(file) for file in self.files[part]]).sort_index(kind='stable')
+        return TransactionCleaner._handle_duplicates(df)
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate over the numbers of the non-empty partitions."""
+        return iter(sorted(self.files))
+
+    def remove(self):
+        """Delete the spill files."""
+        for files in self.files.values():
+            for file in files:
+                os.remove(file)
+        self.files = {}
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+from src.constants.config import CHUNK_SIZE
+from src.data_manipulator.data_manager import DataManager
+
+
+class SenderSampler:
+    """
+    SenderSampler draws a sample of whole senders from a dataset in one
+    streaming pass.
+
+    Every sender is kept with the same probability `fraction`, decided by
+    a seeded hash of its (stripped) `nameOrig`. The decision depends on
+    the sender only, so all rows of a kept sender are kept wherever they
+    appear in the files, and per-sender features computed on the sample
+    equal those of the full data. Only the kept rows are held in memory.
+
+    Like `SenderPartitioner`, the index of every row is its position in
+    the input (in file order).
+
+    Responsibilities:
+    - Decide sender membership from a seeded hash
+    - Stream the dataset once, keeping the rows of sampled senders
+    """
+
+    @staticmethod
+    def selected(senders: pd.Series, fraction: float, seed: int = 0) -> np.ndarray:
+        """
+        Flag the rows whose sender belongs to the sample.
+
+        Parameters
+        ----------
+        senders : pd.Series
+            Raw `nameOrig` values.
+        fraction : float
+            Probability of keeping a sender, in (0, 1].
+        seed : int
+            Selects an independent sample for every value.
+
+        Returns
+        -------
+        np.ndarray
+            Boolean mask aligned with `senders`.
+        """
+        names = senders.astype(str).str.strip().to_numpy(dtype=object)
+        hashes = pd.util.hash_array(names, hash_key=f"{seed:016d}"[-16:])
+        return (hashes >> np.uint64(11)).astype(np.float64) / 2.0 ** 53 < fraction
+
+    @staticmethod
+    def sample(path: str, fraction: float, seed: int = 0, progress=None) -> dict:
+        """
+        Stream every valid CSV file of a directory and keep the sampled senders.
+
+        Parameters
+        ----------
+        path : str
+            Directory containing the CSV files.
+        fraction : float
+            Probability of keeping a sender, in (0, 1].
+        seed : int
+            Sample selector, see `selected`.
+        progress : StageProgress, optional
+            Progress handle updated with the number of parsed rows.
+
+        Returns
+        -------
+        dict
+            - 'data_frame': raw rows of the sampled senders
+            - 'rows': number of input rows
+            - 'matches' / 'not_matches': valid and invalid file names
+        """
+        info = {'matches': [], 'not_matches': []}
+        kept, rows = [], 0
+
+        for chunk in DataManager.iter_csv_chunks(path, info, chunk_size=CHUNK_SIZE, progress=progress):
+            chunk.index = pd.RangeIndex(rows, rows + len(chunk))
+            rows += len(chunk)
+            kept.append(chunk[SenderSampler.selected(chunk['nameOrig'], fraction, seed)])
+
+        return {
+            'data_frame': pd.concat(kept) if kept else pd.DataFrame(),
+            'rows': rows,
+            'matches': info['matches'],
+            'not_matches': info['not_matches']
+        }
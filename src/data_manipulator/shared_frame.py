@@ -0,0 +1,267 @@
+import secrets
+import weakref
+import numpy as np
+import pandas as pd
+from multiprocessing import shared_memory, resource_tracker
+from typing import Dict, List
+
+
+class _Pinned:
+    """Array interface of a shared-memory view that also holds its SharedFrame.
+
+    Arrays built from it keep it as their base, so the frame (and its mapped
+    buffers) stays alive for as long as any view of it does.
+    """
+
+    def __init__(self, view: np.ndarray, frame: 'SharedFrame'):
+        self.__array_interface__ = view.__array_interface__
+        self.view = view
+        self.frame = frame
+
+
+class SharedFrame:
+    """
+    SharedFrame publishes a DataFrame as named shared-memory column
+    buffers so worker processes can read it without pickling or copying.
+
+    Numeric and boolean columns are stored as-is and attached as
+    zero-copy numpy views. String and categorical columns are
+    dictionary-encoded: the integer codes live in one buffer and the
+    distinct values in another (UTF-8 bytes plus offsets), so even a
+    column of millions of account names costs two flat buffers.
+    Categories are stored as strings.
+
+    Only the manifest, a small dict of buffer names, dtypes and sizes,
+    is sent to the workers.
+
+    Responsibilities:
+    - Publish a frame into shared memory (owner process)
+    - Attach to a published frame from another process
+    - Rebuild single columns or the whole frame on demand
+    - Release the buffers when the work is done
+    """
+
+    INDEX = '__index__'
+
+    def __init__(self, manifest: dict, buffers: Dict[str, shared_memory.SharedMemory], owner: bool):
+        """
+        Wrap the shared-memory buffers described by a manifest.
+
+        Use `publish` or `attach` instead of calling this directly.
+        """
+        self.manifest = manifest
+        self._buffers = buffers
+        self._owner = owner
+        # live views, which `close` refuses to unmap
+        self._pins = weakref.WeakSet()
+
+    @staticmethod
+    def _create(name: str, array: np.ndarray) -> shared_memory.SharedMemory:
+        """Create a shared-memory block named `name` holding a copy of `array`."""
+        shm = shared_memory.SharedMemory(name=name, create=True, size=max(array.nbytes, 1))
+        np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+        return shm
+
+    @staticmethod
+    def _open(name: str) -> shared_memory.SharedMemory:
+        """
+        Attach to an existing block without taking ownership of it.
+
+        Before Python 3.13 every attached block is registered with the
+        resource tracker, which unlinks it when the worker exits while the
+        owner still uses it; registration is skipped for attached blocks.
+        """
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args: None
+            try:
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+    @staticmethod
+    def _encode_strings(values) -> tuple:
+        """Pack strings into one UTF-8 byte buffer and an offsets array."""
+        encoded = [str(value).encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+    @staticmethod
+    def _decode_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+        """Unpack strings written by `_encode_strings`."""
+        raw = data.tobytes()
+        return [raw[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(len(offsets) - 1)]
+
+    @staticmethod
+    def publish(df: pd.DataFrame, prefix: str = None) -> 'SharedFrame':
+        """
+        Copy `df` into shared memory once and return the owning SharedFrame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Frame to publish (e.g. `ConsoleApp.df`).
+        prefix : str, optional
+            Prefix of the buffer names; a random one is used by default.
+
+        Returns
+        -------
+        SharedFrame
+            Owner handle. Pass its `manifest` to the workers and call
+            `unlink` once they are finished.
+        """
+        prefix = prefix or f"fl{secrets.token_hex(4)}"
+        manifest = {'rows': len(df), 'columns': {}}
+        buffers = {}
+
+        def store(array: np.ndarray) -> dict:
+            name = f"{prefix}_{len(buffers)}"
+            array = np.ascontiguousarray(array)
+            buffers[name] = SharedFrame._create(name, array)
+            return {'name': name, 'dtype': array.dtype.str, 'shape': array.shape}
+
+        columns = {SharedFrame.INDEX: pd.Series(df.index)}
+        columns.update({column: df[column] for column in df.columns})
+
+        try:
+            for column, series in columns.items():
+                categorical = isinstance(series.dtype, pd.CategoricalDtype)
+                if not categorical and (pd.api.types.is_numeric_dtype(series.dtype)
+                                        or pd.api.types.is_bool_dtype(series.dtype)):
+                    manifest['columns'][column] = {
+                        'kind': 'numeric',
+                        'values': store(series.to_numpy())
+                    }
+                    continue
+
+                if categorical:
+                    codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+                else:
+                    codes, uniques = pd.factorize(series)
+                data, offsets = SharedFrame._encode_strings(uniques)
+                manifest['columns'][column] = {
+                    'kind': 'dictionary',
+                    'categorical': categorical,
+                    'ordered': categorical and series.cat.ordered,
+                    'codes': store(codes),
+                    'data': store(data),
+                    'offsets': store(offsets)
+                }
+        except BaseException:
+            for shm in buffers.values():
+                shm.close()
+                shm.unlink()
+            raise
+
+        return SharedFrame(manifest, buffers, owner=True)
+
+    @staticmethod
+    def attach(manifest: dict) -> 'SharedFrame':
+        """
+        Attach to a frame published by another process.
+
+        Nothing is copied: columns are read straight from the shared buffers.
+        Call `close` when done; only the owner unlinks the buffers.
+        """
+        buffers = {}
+        for spec in manifest['columns'].values():
+            for part in ('values', 'codes', 'data', 'offsets'):
+                if part in spec:
+                    buffers[spec[part]['name']] = SharedFrame._open(spec[part]['name'])
+        return SharedFrame(manifest, buffers, owner=False)
+
+    def _view(self, part: dict) -> np.ndarray:
+        """Return a read-only numpy view over one buffer.
+
+        The view references this SharedFrame, so dropping the handle (e.g.
+        `SharedFrame.attach(manifest).to_frame()`) does not unmap the buffers
+        under it.
+        """
+        view = np.ndarray(part['shape'], dtype=np.dtype(part['dtype']), buffer=self._buffers[part['name']].buf)
+        view.flags.writeable = False
+        pinned = _Pinned(view, self)
+        self._pins.add(pinned)
+        return np.asarray(pinned)
+
+    @property
+    def columns(self) -> List[str]:
+        """Return the published column names."""
+        return [column for column in self.manifest['columns'] if column != SharedFrame.INDEX]
+
+    def codes(self, column: str) -> np.ndarray:
+        """Return the zero-copy integer codes of a dictionary-encoded column."""
+        return self._view(self.manifest['columns'][column]['codes'])
+
+    def dictionary(self, column: str) -> List[str]:
+        """Return the distinct values of a dictionary-encoded column (decoded on each call)."""
+        spec = self.manifest['columns'][column]
+        return SharedFrame._decode_strings(self._view(spec['data']), self._view(spec['offsets']))
+
+    def column(self, column: str):
+        """
+        Return one column.
+
+        Numeric columns are zero-copy numpy views; dictionary-encoded
+        columns are returned as a pd.Categorical over the shared codes.
+        """
+        spec = self.manifest['columns'][column]
+        if spec['kind'] == 'numeric':
+            return self._view(spec['values'])
+        return pd.Categorical.from_codes(self.codes(column), self.dictionary(column), ordered=spec['ordered'])
+
+    def to_frame(self, columns: List[str] = None) -> pd.DataFrame:
+        """
+        Rebuild a DataFrame from the shared buffers.
+
+        Parameters
+        ----------
+        columns : List[str], optional
+            Subset of columns to load; all columns by default.
+
+        Returns
+        -------
+        pd.DataFrame
+            Frame with the original index. String columns come back as
+            object columns and categorical columns as categoricals.
+        """
+        data = {}
+        for column in columns or self.columns:
+            values = self.column(column)
+            spec = self.manifest['columns'][column]
+            if spec['kind'] == 'dictionary' and not spec['categorical']:
+                values = np.asarray(values, dtype=object)
+            data[column] = values
+        return pd.DataFrame(data, index=self.column(SharedFrame.INDEX), copy=False)
+
+    def close(self):
+        """Detach this process from the buffers.
+
+        Raises BufferError while views returned by `column`, `codes` or
+        `to_frame` are still alive; release them first.
+        """
+        if len(self._pins):
+            raise BufferError("Shared columns are still in use; release them before closing the frame.")
+        for shm in self._buffers.values():
+            shm.close()
+
+    def unlink(self):
+        """Close and free the buffers (owner only, once every worker is done)."""
+        self.close()
+        if self._owner:
+            for shm in self._buffers.values():
+                shm.unlink()
+        self._buffers = {}
+
+    def __enter__(self) -> 'SharedFrame':
+        """Use the frame as a context manager."""
+        return self
+
+    def __exit__(self, *exc):
+        """Unlink when owned, otherwise just close."""
+        if self._owner:
+            self.unlink()
+        else:
+            self.close()
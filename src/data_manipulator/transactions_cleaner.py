@@ -1,5 +1,5 @@
 import pandas as pd
-from src.constants.config import DATA_PATH, NUMERIC_COLUMNS, CATEGORICAL_COLUMNS
+from src.constants.config import DATA_PATH, NUMERIC_COLUMNS, CATEGORICAL_COLUMNS, CHUNK_SIZE
 
 
 class TransactionCleaner:
@@ -70,7 +70,8 @@ class TransactionCleaner:
         """
         Enforce correct data types for numeric and categorical columns.
 
-        - Numeric columns are converted strictly.
+        - Numeric columns are converted strictly, unless the loader
+          already parsed them as numbers.
         -  Rows failing conversion are removed.
         - Categorical columns are converted safely to strings.
 
@@ -90,7 +91,8 @@ class TransactionCleaner:
         df = data.copy()
 
         for col in NUMERIC_COLUMNS:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
 
         df = df.dropna(subset=NUMERIC_COLUMNS.keys())
 
@@ -149,7 +151,44 @@ class TransactionCleaner:
         }
 
     @staticmethod
-    def clean(data: pd.DataFrame):
+    def clean_rows(data: pd.DataFrame):
+        """
+        Apply the row-wise cleaning steps (missing values, data types, value checks).
+
+        These steps only look at one row at a time, so they can run on any
+        chunk of the data independently. Duplicates are not removed.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Raw transaction rows.
+
+        Returns
+        -------
+        dict
+            {
+                'cleaned_data': pd.DataFrame,
+                'stats': dict
+            }
+        """
+        stats = {}
+
+        result = TransactionCleaner._handle_missing(data)
+        stats['removed_missing'] = result['number_of_removed_samples']
+
+        result = TransactionCleaner._handle_data_types(result['cleaned_data'])
+        stats['removed_invalid_types'] = result['number_of_removed_samples']
+
+        result = TransactionCleaner._values_check(result['cleaned_data'])
+        stats['removed_invalid_values'] = result['number_of_removed_samples']
+
+        return {
+            'cleaned_data': result['cleaned_data'],
+            'stats': stats
+        }
+
+    @staticmethod
+    def clean(data: pd.DataFrame, progress=None):
         """
         Apply the full cleaning pipeline to transaction data.
 
@@ -159,10 +198,16 @@ class TransactionCleaner:
         3. Apply logical value checks
         4. Remove duplicate transactions
 
+        Steps 1-3 are row-wise and run chunk by chunk (`CHUNK_SIZE` rows), which
+        lets a caller follow progress and cancel between chunks. Duplicates can
+        span chunks, so step 4 runs once on the combined result.
+
         Parameters
         ----------
         data : pd.DataFrame
             Raw transaction DataFrame.
+        progress : StageProgress, optional
+            Progress handle updated with the number of processed rows.
 
         Returns
         -------
@@ -172,19 +217,26 @@ class TransactionCleaner:
                 'stats': dict
             }
         """
-        stats = {}
+        stats = {
+            'removed_missing': 0,
+            'removed_invalid_types': 0,
+            'removed_invalid_values': 0
+        }
+        parts = []
 
-        result = TransactionCleaner._handle_missing(data)
-        df = result['cleaned_data']
-        stats['removed_missing'] = result['number_of_removed_samples']
+        for start in range(0, max(len(data), 1), CHUNK_SIZE):
+            chunk = data.iloc[start:start + CHUNK_SIZE]
 
-        result = TransactionCleaner._handle_data_types(df)
-        df = result['cleaned_data']
-        stats['removed_invalid_types'] = result['number_of_removed_samples']
+            result = TransactionCleaner.clean_rows(chunk)
+            parts.append(result['cleaned_data'])
+            for key in stats:
+                stats[key] += result['stats'][key]
 
-        result = TransactionCleaner._values_check(df)
-        df = result['cleaned_data']
-        stats['removed_invalid_values'] = result['number_of_removed_samples']
+            if progress is not None:
+                progress.update(len(chunk))
+                progress.check()
+
+        df = pd.concat(parts) if len(parts) > 1 else parts[0]
 
         result = TransactionCleaner._handle_duplicates(df)
         df = result['cleaned_data']
@@ -1,2 +1,8 @@
+from .feature_registry import FeatureRegistry
 from .customer_features_builder import CustomerFeaturesBuilder
-from .transaction_features_builder import TransactionFeaturesBuilder
\ No newline at end of file
+from .transaction_features_builder import TransactionFeaturesBuilder
+from .graph_features_builder import GraphFeaturesBuilder
+from .transaction_graph import TransactionGraph
+from .ewm_baseline_builder import EWMBaselineBuilder
+from .hyperloglog import HyperLogLog
+from .sketch_features_builder import SketchFeaturesBuilder
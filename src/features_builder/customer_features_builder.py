@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
-from src.constants.config import E
+from src.constants.config import E, ROLLING_WINDOWS
+from src.features_builder.feature_registry import FeatureRegistry
 
 
 class CustomerFeaturesBuilder:
@@ -8,6 +10,21 @@ class CustomerFeaturesBuilder:
     It includes methods to add day and week information, calculate daily and weekly transaction counts,
     """
 
+    ROLLING_FEATURES = [
+        f'{stat}_{window}_sender'
+        for window in ROLLING_WINDOWS
+        for stat in ('tx_count', 'tx_amount')
+    ]
+
+    FEATURES = [
+        'daily_tx_count_sender',
+        'daily_total_amount_sender',
+        'weekly_tx_count_sender',
+        'weekly_avg_amount_sender',
+        'daily_tx_velocity',
+        'balance_gap_sender'
+    ] + ROLLING_FEATURES
+
     @staticmethod
     def add_day(df: pd.DataFrame) -> pd.Series:
         """Return the day index computed from 'step' (hours divided by 24)."""
@@ -19,32 +36,46 @@ class CustomerFeaturesBuilder:
         return df['day'] // 7
 
     @staticmethod
-    def daily_tx_count_sender(g_day) -> pd.Series:
+    def sender_day_group(df: pd.DataFrame) -> pd.Series:
+        """Return an integer id per (sender, day) pair, shared by the daily aggregates."""
+        return df.groupby(['nameOrig', 'day'], sort=False).ngroup()
+
+    @staticmethod
+    def sender_week_group(df: pd.DataFrame) -> pd.Series:
+        """Return an integer id per (sender, week) pair, shared by the weekly aggregates."""
+        return df.groupby(['nameOrig', 'week'], sort=False).ngroup()
+
+    @staticmethod
+    def daily_tx_count_sender(df: pd.DataFrame) -> pd.Series:
         """Return the number of transactions per sender per day."""
-        return g_day['amount'].transform('size')
+        return df.groupby('sender_day_group')['amount'].transform('size')
 
     @staticmethod
-    def daily_total_amount_sender(g_day) -> pd.Series:
+    def daily_total_amount_sender(df: pd.DataFrame) -> pd.Series:
         """Return the total transaction amount per sender per day."""
-        return g_day['amount'].transform('sum')
+        return df.groupby('sender_day_group')['amount'].transform('sum')
 
     @staticmethod
-    def weekly_tx_count_sender(g_week) -> pd.Series:
+    def weekly_tx_count_sender(df: pd.DataFrame) -> pd.Series:
         """Return the number of transactions per sender per week."""
-        return g_week['amount'].transform('size')
+        return df.groupby('sender_week_group')['amount'].transform('size')
 
     @staticmethod
-    def weekly_avg_amount_sender(g_week) -> pd.Series:
+    def weekly_avg_amount_sender(df: pd.DataFrame) -> pd.Series:
         """Return the average transaction amount per sender per week."""
-        return g_week['amount'].transform('mean')
+        return df.groupby('sender_week_group')['amount'].transform('mean')
 
     @staticmethod
-    def daily_tx_velocity(df: pd.DataFrame) -> pd.Series:
+    def daily_tx_velocity(df: pd.DataFrame, earlier_days: pd.Series = None) -> pd.Series:
         """Compute daily transaction velocity for each sender.
 
         The metric is the sender's daily transaction count normalized by active days.
+        `earlier_days` (indexed by sender) adds active days whose rows are not in `df`,
+        e.g. history dropped by watch mode; they must not overlap the days of `df`.
         """
         active_days = df.groupby('nameOrig')['day'].transform('nunique')
+        if earlier_days is not None:
+            active_days = active_days + df['nameOrig'].map(earlier_days).fillna(0)
         return df['daily_tx_count_sender'] / (active_days + E)
 
     @staticmethod
@@ -53,19 +84,109 @@ class CustomerFeaturesBuilder:
         return df['oldbalanceOrg'] - df['amount']- df['newbalanceOrig']
 
     @staticmethod
-    def build(df: pd.DataFrame) -> pd.DataFrame:
-        """Build and append customer-level features to a copy of the DataFrame."""
-        features = df.copy()
-        features['day'] = CustomerFeaturesBuilder.add_day(features)
-        features['week'] = CustomerFeaturesBuilder.add_week(features)
-
-        g_day = features.groupby(['nameOrig', 'day'], sort=False)
-        g_week = features.groupby(['nameOrig', 'week'], sort=False)
-
-        features['daily_tx_count_sender'] = CustomerFeaturesBuilder.daily_tx_count_sender(g_day)
-        features['daily_total_amount_sender'] = CustomerFeaturesBuilder.daily_total_amount_sender(g_day)
-        features['weekly_tx_count_sender'] = CustomerFeaturesBuilder.weekly_tx_count_sender(g_week)
-        features['weekly_avg_amount_sender'] = CustomerFeaturesBuilder.weekly_avg_amount_sender(g_week)
-        features['daily_tx_velocity'] = CustomerFeaturesBuilder.daily_tx_velocity(features)
-        features['balance_gap_sender'] = CustomerFeaturesBuilder.balance_gap_sender(features)
-        return features
+    def sender_sorted(df: pd.DataFrame) -> dict:
+        """Sort transactions by sender then step once for the sliding-window sweeps.
+
+        Returns
+        -------
+        dict
+            'order': row positions in sender/step order,
+            'key': sorted int64 keys packing (sender code, step) so that keys of
+            different senders are more than any window apart,
+            'amount_cumsum': prefix sums of the sorted amounts (leading zero).
+        """
+        codes = pd.factorize(df['nameOrig'])[0].astype(np.int64)
+        steps = df['step'].to_numpy(dtype=np.int64)
+        order = np.lexsort((steps, codes))
+
+        span = (steps.max() if len(steps) else 0) + max(ROLLING_WINDOWS.values()) + 1
+        key = codes[order] * span + steps[order]
+
+        amount_cumsum = np.zeros(len(order) + 1)
+        np.cumsum(df['amount'].to_numpy(dtype=float)[order], out=amount_cumsum[1:])
+        return {'order': order, 'key': key, 'amount_cumsum': amount_cumsum}
+
+    @staticmethod
+    def _count_keys_upto(key: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+        """Return, for each sorted bound, how many sorted keys are <= it.
+
+        This is the two-pointer sweep: both arrays are sorted, so a stable merge
+        (timsort on two runs) walks them once in O(n). A bound placed at merged
+        position p after i earlier bounds has exactly p - i keys before it.
+        """
+        n = len(key)
+        merged = np.argsort(np.concatenate([key, bounds]), kind='stable')
+        position = np.empty(2 * n, dtype=np.int64)
+        position[merged] = np.arange(2 * n)
+        return position[n:] - np.arange(n)
+
+    @staticmethod
+    def rolling_window_sender(sorted_ctx: dict, window: int):
+        """Return count and total amount of the sender's transactions in the last `window` steps.
+
+        The window covers steps in (step - window, step], so it slides across
+        day and week boundaries. Transactions sharing a step are simultaneous
+        and see the same window.
+
+        Returns
+        -------
+        tuple
+            (count, amount) numpy arrays aligned with the original row order.
+        """
+        key = sorted_ctx['key']
+        order = sorted_ctx['order']
+        csum = sorted_ctx['amount_cumsum']
+
+        right = CustomerFeaturesBuilder._count_keys_upto(key, key)
+        left = CustomerFeaturesBuilder._count_keys_upto(key, key - window)
+
+        count = np.empty(len(key), dtype=np.int64)
+        amount = np.empty(len(key))
+        count[order] = right - left
+        amount[order] = csum[right] - csum[left]
+        return count, amount
+
+    @staticmethod
+    def rolling_windows_sender(df: pd.DataFrame) -> dict:
+        """Return the count and amount columns of every window in `ROLLING_WINDOWS` from one sort."""
+        sorted_ctx = CustomerFeaturesBuilder.sender_sorted(df)
+        columns = {}
+        for window, size in ROLLING_WINDOWS.items():
+            count, amount = CustomerFeaturesBuilder.rolling_window_sender(sorted_ctx, size)
+            columns[f'tx_count_{window}_sender'] = count
+            columns[f'tx_amount_{window}_sender'] = amount
+        return columns
+
+    @staticmethod
+    def build(df: pd.DataFrame, progress=None) -> pd.DataFrame:
+        """Build and append all customer-level features to a copy of the DataFrame.
+
+        The pipeline builds only the features it needs through `FeatureRegistry`;
+        this computes every feature of the builder.
+        `progress` (optional StageProgress) advances by one per built column.
+        """
+        return FeatureRegistry.build(
+            df, ['day', 'week'] + CustomerFeaturesBuilder.FEATURES, progress=progress
+        )
+
+
+FeatureRegistry.register('day', ['step'], CustomerFeaturesBuilder.add_day, stage='customer')
+FeatureRegistry.register('week', ['day'], CustomerFeaturesBuilder.add_week, stage='customer')
+FeatureRegistry.register('sender_day_group', ['nameOrig', 'day'],
+                         CustomerFeaturesBuilder.sender_day_group, stage='customer', keep=False)
+FeatureRegistry.register('sender_week_group', ['nameOrig', 'week'],
+                         CustomerFeaturesBuilder.sender_week_group, stage='customer', keep=False)
+FeatureRegistry.register('daily_tx_count_sender', ['sender_day_group', 'amount'],
+                         CustomerFeaturesBuilder.daily_tx_count_sender, stage='customer')
+FeatureRegistry.register('daily_total_amount_sender', ['sender_day_group', 'amount'],
+                         CustomerFeaturesBuilder.daily_total_amount_sender, stage='customer')
+FeatureRegistry.register('weekly_tx_count_sender', ['sender_week_group', 'amount'],
+                         CustomerFeaturesBuilder.weekly_tx_count_sender, stage='customer')
+FeatureRegistry.register('weekly_avg_amount_sender', ['sender_week_group', 'amount'],
+                         CustomerFeaturesBuilder.weekly_avg_amount_sender, stage='customer')
+FeatureRegistry.register('daily_tx_velocity', ['nameOrig', 'day', 'daily_tx_count_sender'],
+                         CustomerFeaturesBuilder.daily_tx_velocity, stage='customer')
+FeatureRegistry.register('balance_gap_sender', ['oldbalanceOrg', 'amount', 'newbalanceOrig'],
+                         CustomerFeaturesBuilder.balance_gap_sender, stage='customer')
+FeatureRegistry.register(CustomerFeaturesBuilder.ROLLING_FEATURES, ['nameOrig', 'step', 'amount'],
+                         CustomerFeaturesBuilder.rolling_windows_sender, stage='customer')
@@ -0,0 +1,213 @@
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from src.constants.config import EWM_ALPHA
+from src.features_builder.feature_registry import FeatureRegistry
+
+
+class EWMBaselineBuilder:
+    """
+    This class is responsible for building per-sender exponentially weighted behaviour baselines.
+    It tracks the EW mean and variance of amount and inter-transaction gap in step order, filtering
+    every sender's run of sender-sorted rows on its own, and can export / resume the final per-sender state.
+
+    Baseline columns describe the sender *before* the transaction (no look-ahead), so a row
+    can be compared against them directly.
+    """
+
+    FEATURES = [
+        'tx_gap_sender',
+        'ewm_amount_mean_sender',
+        'ewm_amount_var_sender',
+        'ewm_gap_mean_sender',
+        'ewm_gap_var_sender'
+    ]
+
+    STATE_COLUMNS = ['last_step', 'amount_mean', 'amount_var', 'gap_mean', 'gap_var']
+
+    @staticmethod
+    def _segmented_ewm(x: np.ndarray, starts: np.ndarray, seed: np.ndarray, alpha: float) -> np.ndarray:
+        """Run an EW mean over consecutive segments of `x`, restarting at every segment start.
+
+        Every segment is filtered on its own, so no value of another segment ever
+        enters its filter state. Segments are padded to the next power of two of
+        their length and filtered as the rows of one 2-D block per padded length,
+        each row starting from the segment's seed (`seed` at the start row, or the
+        first value itself when the seed is NaN).
+        """
+        decay = 1 - alpha
+        n = len(x)
+        first = np.flatnonzero(starts)
+        lengths = np.diff(np.append(first, n))
+        initial = np.where(np.isnan(seed[first]), x[first], seed[first])
+        widths = 1 << np.ceil(np.log2(np.maximum(lengths, 1))).astype(np.int64)
+
+        post = np.empty(n)
+        for width in np.unique(widths):
+            segments = np.flatnonzero(widths == width)
+            rows = first[segments, None] + np.arange(width)
+            valid = rows < (first[segments] + lengths[segments])[:, None]
+            block = np.where(valid, x[np.minimum(rows, n - 1)], 0.0)
+            filtered, _ = lfilter([alpha], [1, -decay], block, axis=1,
+                                  zi=decay * initial[segments, None])
+            post[rows[valid]] = filtered[valid]
+        return post
+
+    @staticmethod
+    def _segmented_ewvar(x: np.ndarray, prior_mean: np.ndarray, starts: np.ndarray,
+                         seed: np.ndarray, alpha: float) -> np.ndarray:
+        """Run the EW variance matching `_segmented_ewm` over the same segments.
+
+        Uses the centred recursion var = (1 - alpha) * (var + alpha * (x - prior_mean) ** 2)
+        (pandas' `ewm(adjust=False).var(bias=True)`), so the variance never comes
+        from the difference of two large, nearly equal moments. A segment without
+        a seed starts at 0, like its first value.
+        """
+        decay = 1 - alpha
+        deviation = np.where(np.isnan(prior_mean), 0.0, x - prior_mean)
+        return EWMBaselineBuilder._segmented_ewm(decay * deviation ** 2, starts, seed, alpha)
+
+    @staticmethod
+    def _prior(post: np.ndarray, starts: np.ndarray, initial: np.ndarray) -> np.ndarray:
+        """Shift post-update values by one row so each row sees only earlier transactions."""
+        prior = np.empty_like(post)
+        prior[1:] = post[:-1]
+        prior[starts] = initial[starts]
+        return prior
+
+    @staticmethod
+    def compute(df: pd.DataFrame, state: pd.DataFrame = None, alpha: float = EWM_ALPHA) -> dict:
+        """Compute the baseline columns for every row.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Transactions with `nameOrig`, `step` and `amount`.
+        state : pd.DataFrame, optional
+            Per-sender state from `export_state`, indexed by `nameOrig`, used to
+            resume the baselines of senders seen in an earlier batch.
+        alpha : float
+            Smoothing factor (weight of the newest transaction).
+
+        Returns
+        -------
+        dict
+            Feature name -> numpy array aligned with the rows of `df`.
+        """
+        codes, senders = pd.factorize(df['nameOrig'])
+        steps = df['step'].to_numpy(dtype=float)
+        order = np.lexsort((steps, codes))
+
+        s_codes = codes[order]
+        s_steps = steps[order]
+        s_amount = df['amount'].to_numpy(dtype=float)[order]
+        n = len(order)
+
+        starts = np.ones(n, dtype=bool)
+        starts[1:] = s_codes[1:] != s_codes[:-1]
+
+        if state is None:
+            state = pd.DataFrame(columns=EWMBaselineBuilder.STATE_COLUMNS, dtype=float)
+        init = state.reindex(senders)[EWMBaselineBuilder.STATE_COLUMNS].to_numpy(dtype=float)[s_codes]
+        last_step, amount_mean, amount_var, gap_mean, gap_var = init.T
+
+        gap = np.empty(n)
+        gap[1:] = s_steps[1:] - s_steps[:-1]
+        gap[starts] = s_steps[starts] - last_step[starts]
+        gap_valid = ~np.isnan(gap)
+        gap_x = np.where(gap_valid, gap, 0.0)
+
+        gap_starts = starts.copy()
+        gap_starts[1:] |= ~gap_valid[:-1]
+        gap_seed = np.where(starts, gap_mean, np.nan)
+        gap_var_seed = np.where(starts, gap_var, np.nan)
+
+        post_amount = EWMBaselineBuilder._segmented_ewm(s_amount, starts, amount_mean, alpha)
+        post_gap = EWMBaselineBuilder._segmented_ewm(gap_x, gap_starts, gap_seed, alpha)
+        post_gap[~gap_valid] = np.nan
+        prior_amount = EWMBaselineBuilder._prior(post_amount, starts, amount_mean)
+        prior_gap = EWMBaselineBuilder._prior(post_gap, starts, gap_mean)
+
+        post_amount_var = EWMBaselineBuilder._segmented_ewvar(s_amount, prior_amount, starts, amount_var, alpha)
+        post_gap_var = EWMBaselineBuilder._segmented_ewvar(gap_x, prior_gap, gap_starts, gap_var_seed, alpha)
+        post_gap_var[~gap_valid] = np.nan
+
+        columns = {
+            'tx_gap_sender': gap,
+            'ewm_amount_mean_sender': prior_amount,
+            'ewm_amount_var_sender': EWMBaselineBuilder._prior(post_amount_var, starts, amount_var),
+            'ewm_gap_mean_sender': prior_gap,
+            'ewm_gap_var_sender': EWMBaselineBuilder._prior(post_gap_var, starts, gap_var)
+        }
+        for name, values in columns.items():
+            aligned = np.empty(n)
+            aligned[order] = values
+            columns[name] = aligned
+        return columns
+
+    @staticmethod
+    def build(df: pd.DataFrame, state: pd.DataFrame = None, alpha: float = EWM_ALPHA,
+              progress=None) -> pd.DataFrame:
+        """Build and append the EW baseline features to a copy of the DataFrame.
+
+        `progress` (optional StageProgress) advances by one per built feature.
+        """
+        features = df.copy()
+        for name, values in EWMBaselineBuilder.compute(features, state=state, alpha=alpha).items():
+            features[name] = values
+            if progress is not None:
+                progress.update(1)
+                progress.check()
+        return features
+
+    @staticmethod
+    def export_state(features: pd.DataFrame, state: pd.DataFrame = None,
+                     alpha: float = EWM_ALPHA) -> pd.DataFrame:
+        """Return the per-sender state after the last transaction of `features`.
+
+        The result is indexed by `nameOrig` and can be saved (e.g. `to_csv`) and
+        passed back to `build` to continue the baselines on a later batch.
+        Senders of `state` that do not appear in `features` are carried over.
+        """
+        last = (
+            features.sort_values('step', kind='stable')
+            .drop_duplicates('nameOrig', keep='last')
+            .set_index('nameOrig')
+        )
+
+        def update(mean, var, x):
+            """Fold `x` into a (mean, variance) pair; a NaN mean means no earlier value."""
+            deviation = x - mean
+            return (
+                np.where(np.isnan(mean), x, mean + alpha * deviation),
+                np.where(np.isnan(mean), 0.0, (1 - alpha) * (var + alpha * deviation ** 2))
+            )
+
+        amount_mean, amount_var = update(
+            last['ewm_amount_mean_sender'].to_numpy(dtype=float),
+            last['ewm_amount_var_sender'].to_numpy(dtype=float),
+            last['amount'].to_numpy(dtype=float)
+        )
+        gap = last['tx_gap_sender'].to_numpy(dtype=float)
+        gap_mean, gap_var = update(
+            last['ewm_gap_mean_sender'].to_numpy(dtype=float),
+            last['ewm_gap_var_sender'].to_numpy(dtype=float),
+            gap
+        )
+
+        new_state = pd.DataFrame({
+            'last_step': last['step'].to_numpy(dtype=float),
+            'amount_mean': amount_mean,
+            'amount_var': amount_var,
+            'gap_mean': np.where(np.isnan(gap), np.nan, gap_mean),
+            'gap_var': np.where(np.isnan(gap), np.nan, gap_var)
+        }, index=last.index)
+
+        if state is not None:
+            carried = state[~state.index.isin(new_state.index)]
+            new_state = pd.concat([carried[EWMBaselineBuilder.STATE_COLUMNS], new_state])
+        return new_state
+
+
+FeatureRegistry.register(EWMBaselineBuilder.FEATURES, ['nameOrig', 'step', 'amount'],
+                         EWMBaselineBuilder.compute, stage='customer')
@@ -0,0 +1,175 @@
+import pandas as pd
+from typing import Callable, Dict, List, Union
+
+
+class FeatureRegistry:
+    """
+    Registry of feature columns and the columns they are computed from.
+
+    Every entry produces one or more output columns from a function of the
+    frame, and declares its input columns. `build` resolves the dependencies of
+    the requested columns and computes only what is missing, in dependency
+    order, so features no consumer asks for are never computed.
+
+    Builders register their features when imported; extra features are added
+    with `register` and asked for with `request`, without editing a builder:
+
+        FeatureRegistry.register(
+            'amount_to_dest_balance', ['amount', 'oldbalanceDest'],
+            lambda df: df['amount'] / (df['oldbalanceDest'] + E)
+        )
+        FeatureRegistry.request('amount_to_dest_balance')
+    """
+
+    _entries: Dict[str, dict] = {}
+    _requested: List[str] = []
+
+    @staticmethod
+    def register(outputs: Union[str, List[str]], inputs: List[str], compute: Callable,
+                 stage: str = 'transaction', keep: bool = True, sender_local: bool = True):
+        """Register a feature computed from `inputs`.
+
+        Parameters
+        ----------
+        outputs : str or list of str
+            Column(s) produced. Several columns computed in one shared pass
+            (e.g. from one sort or one graph) are registered together.
+        inputs : list of str
+            Columns the computation reads: raw columns or other features.
+        compute : Callable
+            `compute(df)` returning the column values for a single output, or a
+            mapping of output name to values for several outputs.
+        stage : str
+            Pipeline stage that builds it: 'customer' or 'transaction'.
+        keep : bool
+            False for helper columns that are dropped once the build finishes
+            unless they were requested themselves.
+        sender_local : bool
+            True if a row's value only depends on rows of the same sender, so
+            the feature can be built on sender partitions (out-of-core mode).
+        """
+        outputs = [outputs] if isinstance(outputs, str) else list(outputs)
+        entry = {
+            'outputs': outputs,
+            'inputs': list(inputs),
+            'compute': compute,
+            'stage': stage,
+            'keep': keep,
+            'sender_local': sender_local
+        }
+        for name in outputs:
+            FeatureRegistry._entries[name] = entry
+
+    @staticmethod
+    def registered() -> List[str]:
+        """Return the names of all registered feature columns."""
+        return list(FeatureRegistry._entries)
+
+    @staticmethod
+    def request(*names: str):
+        """Ask the pipeline to compute `names` in addition to what the scorers read."""
+        for name in names:
+            if name not in FeatureRegistry._entries:
+                raise KeyError(f"Unknown feature '{name}'.")
+            if name not in FeatureRegistry._requested:
+                FeatureRegistry._requested.append(name)
+
+    @staticmethod
+    def requested() -> List[str]:
+        """Return the features requested with `request`."""
+        return list(FeatureRegistry._requested)
+
+    @staticmethod
+    def plan(columns, requested: List[str]) -> List[dict]:
+        """Return the entries needed for `requested`, dependencies first.
+
+        Columns already in `columns` are not recomputed.
+
+        Raises
+        ------
+        KeyError
+            If a needed column is neither available nor registered.
+        ValueError
+            If the dependencies contain a cycle.
+        """
+        available = set(columns)
+        ordered, done, visiting = [], set(), set()
+
+        def visit(name: str):
+            if name in available:
+                return
+            entry = FeatureRegistry._entries.get(name)
+            if entry is None:
+                raise KeyError(f"Column '{name}' is neither in the data nor a registered feature.")
+            key = id(entry)
+            if key in done:
+                return
+            if key in visiting:
+                raise ValueError(f"Feature '{name}' depends on itself.")
+            visiting.add(key)
+            for dependency in entry['inputs']:
+                visit(dependency)
+            visiting.discard(key)
+            done.add(key)
+            ordered.append(entry)
+
+        for name in requested:
+            visit(name)
+        return ordered
+
+    @staticmethod
+    def global_features(columns, requested: List[str]) -> List[str]:
+        """Return the columns `build` would add that are not sender-local (see `register`)."""
+        return [
+            name
+            for entry in FeatureRegistry.plan(columns, requested)
+            if not entry['sender_local']
+            for name in entry['outputs']
+        ]
+
+    @staticmethod
+    def count(columns, requested: List[str], stage: str = None) -> int:
+        """Return how many columns `build` would add, for progress totals."""
+        return sum(
+            len(entry['outputs'])
+            for entry in FeatureRegistry.plan(columns, requested)
+            if stage is None or entry['stage'] == stage
+        )
+
+    @staticmethod
+    def build(df: pd.DataFrame, requested: List[str], stage: str = None, progress=None) -> pd.DataFrame:
+        """Compute the requested features and their missing inputs on a copy of the DataFrame.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Cleaned transactions, possibly with some features already built.
+        requested : list of str
+            Columns the consumers read.
+        stage : str, optional
+            Only build entries of this stage ('customer' or 'transaction');
+            the other entries are left for a later call.
+        progress : StageProgress, optional
+            Advanced by one per added column.
+
+        Returns
+        -------
+        pd.DataFrame
+            Copy of `df` with the computed columns appended.
+        """
+        features = df.copy()
+        helpers = []
+        for entry in FeatureRegistry.plan(features.columns, requested):
+            if stage is not None and entry['stage'] != stage:
+                continue
+            values = entry['compute'](features)
+            if len(entry['outputs']) == 1:
+                values = {entry['outputs'][0]: values}
+            for name in entry['outputs']:
+                features[name] = values[name]
+            if not entry['keep']:
+                helpers += [name for name in entry['outputs'] if name not in requested]
+            if progress is not None:
+                progress.update(len(entry['outputs']))
+                progress.check()
+        return features.drop(columns=helpers)
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from src.features_builder.transaction_graph import TransactionGraph
+from src.features_builder.feature_registry import FeatureRegistry
+
+
+class GraphFeaturesBuilder:
+    """
+    This class is responsible for building sender/receiver network features from transaction data.
+    It indexes the transactions as a TransactionGraph and maps per-account degree statistics back to rows.
+    """
+
+    FEATURES = [
+        'fan_out_sender',
+        'fan_in_receiver',
+        'distinct_counterparties_sender',
+        'two_hop_reach_sender'
+    ]
+
+    @staticmethod
+    def fan_out_sender(graph: TransactionGraph, src: np.ndarray) -> np.ndarray:
+        """Return the number of distinct receivers the sender paid."""
+        return graph.out_degree()[src]
+
+    @staticmethod
+    def fan_in_receiver(graph: TransactionGraph, dst: np.ndarray) -> np.ndarray:
+        """Return the number of distinct senders that paid the receiver."""
+        return graph.in_degree()[dst]
+
+    @staticmethod
+    def distinct_counterparties_sender(graph: TransactionGraph, src: np.ndarray) -> np.ndarray:
+        """Return the number of distinct accounts the sender paid or was paid by."""
+        return graph.counterparties()[src]
+
+    @staticmethod
+    def two_hop_reach_sender(graph: TransactionGraph, src: np.ndarray) -> np.ndarray:
+        """Return the number of distinct accounts the sender's receivers paid (excluding the sender)."""
+        return graph.two_hop_reach()[src]
+
+    @staticmethod
+    def compute(df: pd.DataFrame) -> dict:
+        """Return every graph feature column from one graph index build."""
+        src, dst, accounts = TransactionGraph.encode(df)
+        graph = TransactionGraph.from_codes(src, dst, accounts)
+        return {
+            'fan_out_sender': GraphFeaturesBuilder.fan_out_sender(graph, src),
+            'fan_in_receiver': GraphFeaturesBuilder.fan_in_receiver(graph, dst),
+            'distinct_counterparties_sender': GraphFeaturesBuilder.distinct_counterparties_sender(graph, src),
+            'two_hop_reach_sender': GraphFeaturesBuilder.two_hop_reach_sender(graph, src)
+        }
+
+    @staticmethod
+    def build(df: pd.DataFrame, progress=None) -> pd.DataFrame:
+        """Build and append graph features to a copy of the DataFrame.
+
+        `progress` (optional StageProgress) advances by one per built feature.
+        """
+        features = df.copy()
+        for name, values in GraphFeaturesBuilder.compute(features).items():
+            features[name] = values
+            if progress is not None:
+                progress.update(1)
+                progress.check()
+        return features
+
+
+FeatureRegistry.register(GraphFeaturesBuilder.FEATURES, ['nameOrig', 'nameDest'],
+                         GraphFeaturesBuilder.compute, stage='customer', sender_local=False)
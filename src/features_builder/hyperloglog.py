@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from src.constants.config import HLL_PRECISION
+
+
+class HyperLogLog:
+    """
+    A set of mergeable HyperLogLog sketches, one per key (e.g. one per sender).
+
+    Registers are stored sparsely as one (key, register, rank) row per non-empty
+    register, so a key never holds more than 2 ** precision rows no matter how
+    much history it has seen. Two sketch sets with the same precision merge by
+    taking the register-wise maximum, which makes batches and shards combinable
+    in any order.
+    """
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: pd.DataFrame = None):
+        """Create an empty sketch set, or wrap existing sparse registers."""
+        if not 4 <= precision <= 18:
+            raise ValueError("HyperLogLog precision must be between 4 and 18.")
+        self.precision = precision
+        if registers is None:
+            registers = pd.DataFrame({
+                'key': pd.Series(dtype=object),
+                'register': pd.Series(dtype=np.int32),
+                'rank': pd.Series(dtype=np.uint8)
+            })
+        self.registers = registers
+
+    @property
+    def num_registers(self) -> int:
+        """Return the number of registers per key (2 ** precision)."""
+        return 1 << self.precision
+
+    @staticmethod
+    def _bit_length(values: np.ndarray) -> np.ndarray:
+        """Return the exact bit length of every uint64 value (0 for 0)."""
+        values = values.copy()
+        length = np.zeros(values.shape, dtype=np.uint8)
+        for shift in (32, 16, 8, 4, 2, 1):
+            high = values >= (np.uint64(1) << np.uint64(shift))
+            length[high] += shift
+            values[high] >>= np.uint64(shift)
+        length += (values > 0).astype(np.uint8)
+        return length
+
+    @staticmethod
+    def _reduce(registers: pd.DataFrame) -> pd.DataFrame:
+        """Keep the maximum rank per (key, register)."""
+        return (
+            registers.groupby(['key', 'register'], sort=False)['rank']
+            .max()
+            .reset_index()
+        )
+
+    def add(self, keys, values) -> 'HyperLogLog':
+        """Add `values[i]` to the sketch of `keys[i]` for all i and return self."""
+        hashes = pd.util.hash_array(np.asarray(values))
+        suffix_bits = 64 - self.precision
+        register = (hashes >> np.uint64(suffix_bits)).astype(np.int32)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        rank = (suffix_bits + 1 - HyperLogLog._bit_length(suffix)).astype(np.uint8)
+
+        batch = pd.DataFrame({'key': np.asarray(keys), 'register': register, 'rank': rank})
+        self.registers = HyperLogLog._reduce(pd.concat([self.registers, batch], ignore_index=True))
+        return self
+
+    def merge(self, other: 'HyperLogLog') -> 'HyperLogLog':
+        """Return a new sketch set holding the union of both sets per key."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision.")
+        merged = pd.concat([self.registers, other.registers], ignore_index=True)
+        return HyperLogLog(self.precision, HyperLogLog._reduce(merged))
+
+    def estimate(self) -> pd.Series:
+        """Return the estimated number of distinct values per key.
+
+        Uses the standard HyperLogLog estimator with linear counting for small
+        cardinalities (the 64-bit hash needs no large-range correction).
+        """
+        m = self.num_registers
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+
+        weights = np.ldexp(1.0, -self.registers['rank'].astype(np.int64).to_numpy())
+        per_key = (
+            self.registers.assign(weight=weights)
+            .groupby('key', sort=False)
+            .agg(filled=('rank', 'size'), weight=('weight', 'sum'))
+        )
+        zeros = m - per_key['filled']
+        raw = alpha * m * m / (zeros + per_key['weight'])
+        linear = m * np.log(m / zeros.where(zeros > 0, 1))
+        estimate = raw.where((raw > 2.5 * m) | (zeros == 0), linear)
+        return estimate.rename(None)
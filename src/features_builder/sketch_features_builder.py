@@ -0,0 +1,68 @@
+import pandas as pd
+from src.constants.config import HLL_PRECISION
+from src.features_builder.hyperloglog import HyperLogLog
+from src.features_builder.feature_registry import FeatureRegistry
+
+
+class SketchFeaturesBuilder:
+    """
+    This class is responsible for building approximate per-sender distinct counts.
+    It keeps one HyperLogLog sketch set per counted column, so the counts can be
+    accumulated over batches or shards and merged in constant memory per sender.
+    """
+
+    SKETCHES = {
+        'recipients': 'nameDest',
+        'days': 'day',
+        'types': 'type'
+    }
+
+    FEATURES = [f'approx_distinct_{name}_sender' for name in SKETCHES]
+
+    @staticmethod
+    def sketch(df: pd.DataFrame, precision: int = HLL_PRECISION) -> dict:
+        """Return one HyperLogLog sketch set per counted column, keyed by sender."""
+        day = df['day'] if 'day' in df.columns else df['step'] // 24
+        sketches = {}
+        for name, column in SketchFeaturesBuilder.SKETCHES.items():
+            values = day if column == 'day' else df[column]
+            sketches[name] = HyperLogLog(precision).add(
+                df['nameOrig'].to_numpy(), values.to_numpy()
+            )
+        return sketches
+
+    @staticmethod
+    def merge(left: dict, right: dict) -> dict:
+        """Merge two sketch dictionaries (e.g. from two batches or shards)."""
+        return {name: left[name].merge(right[name]) for name in SketchFeaturesBuilder.SKETCHES}
+
+    @staticmethod
+    def compute(df: pd.DataFrame, sketches: dict = None, precision: int = HLL_PRECISION) -> dict:
+        """Return the approximate distinct count columns, from `sketches` or from `df` itself."""
+        if sketches is None:
+            sketches = SketchFeaturesBuilder.sketch(df, precision)
+        return {
+            f'approx_distinct_{name}_sender': df['nameOrig'].map(sketches[name].estimate())
+            for name in SketchFeaturesBuilder.SKETCHES
+        }
+
+    @staticmethod
+    def build(df: pd.DataFrame, sketches: dict = None, precision: int = HLL_PRECISION,
+              progress=None) -> pd.DataFrame:
+        """Append approximate distinct counts per sender to a copy of the DataFrame.
+
+        When `sketches` is given (e.g. merged over all shards), estimates come
+        from it; otherwise the sketches are built from `df` itself.
+        `progress` (optional StageProgress) advances by one per built feature.
+        """
+        features = df.copy()
+        for name, values in SketchFeaturesBuilder.compute(features, sketches, precision).items():
+            features[name] = values
+            if progress is not None:
+                progress.update(1)
+                progress.check()
+        return features
+
+
+FeatureRegistry.register(SketchFeaturesBuilder.FEATURES, ['nameOrig', 'nameDest', 'step', 'type'],
+                         SketchFeaturesBuilder.compute, stage='customer')
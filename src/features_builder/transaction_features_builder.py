@@ -1,5 +1,7 @@
+import numpy as np
 import pandas as pd
 from src.constants.config import E
+from src.features_builder.feature_registry import FeatureRegistry
 
 
 class TransactionFeaturesBuilder:
@@ -8,6 +10,14 @@ class TransactionFeaturesBuilder:
     It includes methods to calculate ratios and shares related to transaction amounts and balances.
     """
 
+    FEATURES = [
+        'amount_weekly_ratio',
+        'amount_daily_ratio',
+        'transaction_share_of_day',
+        'balance_change_ratio_sender',
+        'amount_ewm_deviation'
+    ]
+
     @staticmethod
     def amount_weekly_ratio(df: pd.DataFrame) -> pd.Series:
         """Return transaction amount divided by sender's weekly average amount."""
@@ -29,11 +39,34 @@ class TransactionFeaturesBuilder:
         return df['amount'] / (df['oldbalanceOrg'] + E)
 
     @staticmethod
-    def build(df: pd.DataFrame) -> pd.DataFrame:
-        """Build and append transaction-level ratio features to the DataFrame."""
-        features = df.copy()
-        features['amount_weekly_ratio'] = TransactionFeaturesBuilder.amount_weekly_ratio(features)
-        features['amount_daily_ratio'] = TransactionFeaturesBuilder.amount_daily_ratio(features)
-        features['transaction_share_of_day'] = TransactionFeaturesBuilder.transaction_share_of_day(features)
-        features['balance_change_ratio_sender'] = TransactionFeaturesBuilder.balance_change_ratio_sender(features)
-        return features
+    def amount_ewm_deviation(df: pd.DataFrame) -> pd.Series:
+        """Return how many EW standard deviations the amount lies from the sender's prior EW mean.
+
+        Baselines only include earlier transactions, so there is no look-ahead.
+        Rows without any spread in their history yet (first or second transaction) get 0.
+        """
+        var = df['ewm_amount_var_sender']
+        deviation = (df['amount'] - df['ewm_amount_mean_sender']) / (np.sqrt(var) + E)
+        return deviation.where(var > 0, 0.0)
+
+    @staticmethod
+    def build(df: pd.DataFrame, progress=None) -> pd.DataFrame:
+        """Build and append all transaction-level ratio features to the DataFrame.
+
+        Missing inputs (e.g. customer features) are built first through `FeatureRegistry`.
+        `progress` (optional StageProgress) advances by one per built column.
+        """
+        return FeatureRegistry.build(df, TransactionFeaturesBuilder.FEATURES, progress=progress)
+
+
+FeatureRegistry.register('amount_weekly_ratio', ['amount', 'weekly_avg_amount_sender'],
+                         TransactionFeaturesBuilder.amount_weekly_ratio)
+FeatureRegistry.register('amount_daily_ratio', ['amount', 'daily_total_amount_sender'],
+                         TransactionFeaturesBuilder.amount_daily_ratio)
+FeatureRegistry.register('transaction_share_of_day', ['daily_tx_count_sender'],
+                         TransactionFeaturesBuilder.transaction_share_of_day)
+FeatureRegistry.register('balance_change_ratio_sender', ['amount', 'oldbalanceOrg'],
+                         TransactionFeaturesBuilder.balance_change_ratio_sender)
+FeatureRegistry.register('amount_ewm_deviation',
+                         ['amount', 'ewm_amount_mean_sender', 'ewm_amount_var_sender'],
+                         TransactionFeaturesBuilder.amount_ewm_deviation)
@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from src.constants.config import CHUNK_SIZE
+
+
+class TransactionGraph:
+    """
+    Compact sender -> receiver graph index built from transaction data.
+
+    Senders and receivers share one integer id space (an account can be both),
+    and distinct edges are stored as CSR adjacency in both directions:
+
+    - `out_indptr` / `out_indices`: receivers of every account
+    - `in_indptr` / `in_indices`: senders of every account
+
+    Neighbors of account `a` are `indices[indptr[a]:indptr[a + 1]]`.
+    """
+
+    def __init__(self, accounts: pd.Index, out_indptr: np.ndarray, out_indices: np.ndarray,
+                 in_indptr: np.ndarray, in_indices: np.ndarray):
+        """Store the account index and both CSR adjacency structures."""
+        self.accounts = accounts
+        self.out_indptr = out_indptr
+        self.out_indices = out_indices
+        self.in_indptr = in_indptr
+        self.in_indices = in_indices
+
+    @property
+    def num_accounts(self) -> int:
+        """Return the number of distinct accounts in the graph."""
+        return len(self.accounts)
+
+    @property
+    def num_edges(self) -> int:
+        """Return the number of distinct sender -> receiver edges."""
+        return len(self.out_indices)
+
+    @staticmethod
+    def encode(df: pd.DataFrame):
+        """Integer-encode senders and receivers into one shared id space.
+
+        Returns
+        -------
+        tuple
+            (sender_codes, receiver_codes, accounts) where `accounts[code]`
+            is the account name.
+        """
+        codes, accounts = pd.factorize(
+            np.concatenate([df['nameOrig'].to_numpy(), df['nameDest'].to_numpy()])
+        )
+        n = len(df)
+        return codes[:n], codes[n:], pd.Index(accounts)
+
+    @staticmethod
+    def from_transactions(df: pd.DataFrame) -> 'TransactionGraph':
+        """Build the graph index from the `nameOrig` / `nameDest` columns."""
+        return TransactionGraph.from_codes(*TransactionGraph.encode(df))
+
+    @staticmethod
+    def from_codes(src: np.ndarray, dst: np.ndarray, accounts: pd.Index) -> 'TransactionGraph':
+        """Build the graph index from integer-encoded sender / receiver arrays.
+
+        Repeated transactions between the same pair collapse into one edge.
+        Construction is fully vectorized: edges are packed into a single int64
+        key, deduplicated with one sort and counted with `np.bincount`.
+        """
+        n = len(accounts)
+        index_dtype = np.int32 if n < 2**31 else np.int64
+
+        keys = np.unique(src.astype(np.int64) * n + dst)
+        edge_src = keys // n
+        edge_dst = keys % n
+
+        out_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_src, minlength=n), out=out_indptr[1:])
+
+        order = np.argsort(edge_dst, kind='stable')
+        in_indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(edge_dst, minlength=n), out=in_indptr[1:])
+
+        return TransactionGraph(
+            accounts,
+            out_indptr, edge_dst.astype(index_dtype),
+            in_indptr, edge_src[order].astype(index_dtype)
+        )
+
+    def code(self, account: str) -> int:
+        """Return the integer id of an account (KeyError if unknown)."""
+        return self.accounts.get_loc(account)
+
+    def out_neighbors(self, account: str) -> np.ndarray:
+        """Return the names of accounts that received money from `account`."""
+        a = self.code(account)
+        return self.accounts[self.out_indices[self.out_indptr[a]:self.out_indptr[a + 1]]].to_numpy()
+
+    def in_neighbors(self, account: str) -> np.ndarray:
+        """Return the names of accounts that sent money to `account`."""
+        a = self.code(account)
+        return self.accounts[self.in_indices[self.in_indptr[a]:self.in_indptr[a + 1]]].to_numpy()
+
+    def out_degree(self) -> np.ndarray:
+        """Return the number of distinct receivers per account (fan-out)."""
+        return np.diff(self.out_indptr)
+
+    def in_degree(self) -> np.ndarray:
+        """Return the number of distinct senders per account (fan-in)."""
+        return np.diff(self.in_indptr)
+
+    def reciprocal_degree(self) -> np.ndarray:
+        """Return, per account, how many neighbors are linked in both directions."""
+        n = self.num_accounts
+        src = np.repeat(np.arange(n, dtype=np.int64), self.out_degree())
+        keys = src * n + self.out_indices
+        reverse = self.out_indices.astype(np.int64) * n + src
+        pos = np.searchsorted(keys, reverse)
+        pos[pos == len(keys)] = 0
+        reciprocal = keys[pos] == reverse if len(keys) else np.zeros(0, dtype=bool)
+        return np.bincount(src[reciprocal], minlength=n)
+
+    def counterparties(self) -> np.ndarray:
+        """Return the number of distinct accounts each account sent to or received from."""
+        return self.out_degree() + self.in_degree() - self.reciprocal_degree()
+
+    def two_hop_paths(self) -> np.ndarray:
+        """Return the number of distinct two-hop paths leaving each account.
+
+        This is the sum of the fan-out of every direct receiver, an upper bound
+        on the number of distinct accounts reachable in two hops that only needs
+        one gather and one segmented sum over the CSR arrays.
+        """
+        out_degree = self.out_degree()
+        per_edge = out_degree[self.out_indices]
+        paths = np.zeros(self.num_accounts, dtype=np.int64)
+        has_edges = out_degree > 0
+        if per_edge.size:
+            paths[has_edges] = np.add.reduceat(per_edge, self.out_indptr[:-1][has_edges])
+        return paths
+
+    def two_hop_reach(self, block_size: int = CHUNK_SIZE) -> np.ndarray:
+        """Return the number of distinct accounts reachable in exactly two hops, excluding the account itself.
+
+        This is the number of nonzeros in every row of the sparse product A·A of
+        the adjacency matrix, minus its diagonal entry. Rows are multiplied in
+        blocks holding about `block_size` two-hop paths (see `two_hop_paths`),
+        so a hub receiver cannot blow up the memory of the product.
+        """
+        n = self.num_accounts
+        reach = np.zeros(n, dtype=np.int64)
+        if not self.num_edges:
+            return reach
+
+        adjacency = csr_matrix(
+            (np.ones(self.num_edges, dtype=np.int32), self.out_indices, self.out_indptr), shape=(n, n)
+        )
+        cumulative = np.cumsum(self.two_hop_paths())
+        edges = np.searchsorted(cumulative, np.arange(block_size, cumulative[-1], block_size), side='right')
+        bounds = np.unique(np.concatenate([[0], edges, [n]]))
+
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            block = adjacency[start:end] @ adjacency
+            reach[start:end] = np.diff(block.indptr) - (block.diagonal(k=start) != 0)
+        return reach
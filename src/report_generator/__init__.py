@@ -1,2 +1,6 @@
 from .report_generator import ReportGenerator
 from .dashboard_generator import DashboardGenerator
+from .sqlite_exporter import SQLiteExporter
+from .trend_analyzer import TrendAnalyzer
+from .customer_pages import CustomerPageRenderer
+from .html_dashboard import HTMLDashboard
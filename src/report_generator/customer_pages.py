@@ -0,0 +1,232 @@
+import os
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
+from src.constants.config import DASHBOARD_WORKERS, FLAG_ZSCORE_THRESHOLD
+from src.calculations import CustomerRiskScorer, TransactionFlagger
+from src.data_manipulator import CustomerIndex, SharedFrame
+
+
+class CustomerPageRenderer:
+    """
+    Render one dashboard page per critical customer, in parallel.
+
+    The rows of all customers are pulled once through the `CustomerIndex`
+    (their sent rows, then their received rows, each customer a contiguous
+    slice) and published as a `SharedFrame`. Worker processes attach to it
+    once and receive only slice bounds per page, so no rows are pickled.
+    Every page is drawn into a JPEG file on disk and only its path comes
+    back; the PDF reads each image from disk when its page is written.
+    """
+
+    COLUMNS = [
+        'step', 'type', 'nameOrig', 'nameDest', 'amount', 'transaction_flag',
+        'flag_reason_1', 'risk_score'
+    ]
+
+    # per worker process: the rows' columns and the population statistics of the features
+    _worker = None
+
+    @staticmethod
+    def features(columns) -> list:
+        """Return the scored features found in `columns`, whose Z-scores the pages show."""
+        features = CustomerRiskScorer.RISK_FEATURES + TransactionFlagger.FLAG_FEATURES
+        return [feature for feature in dict.fromkeys(features) if feature in columns]
+
+    @staticmethod
+    def _attach(manifest: dict, stats: dict):
+        """Pool initializer: attach the shared rows once per worker."""
+        shared = SharedFrame.attach(manifest)
+        CustomerPageRenderer._worker = {
+            'shared': shared,
+            'columns': {column: shared.column(column) for column in shared.columns},
+            'stats': stats
+        }
+
+    @staticmethod
+    def _rows(start: int, end: int) -> pd.DataFrame:
+        """Rebuild the rows of one slice of the shared frame."""
+        columns = CustomerPageRenderer._worker['columns']
+        return pd.DataFrame({column: values[start:end] for column, values in columns.items()})
+
+    @staticmethod
+    def render(task: dict) -> str:
+        """
+        Draw one customer page and save it as a JPEG.
+
+        `task` holds the page 'rank', the 'customer' and its ranking 'score', the
+        bounds of its 'sent' and 'received' slices in the shared frame and the
+        output 'path'. The
+        page shows the amount timeline, the top counterparties, the feature
+        Z-scores (mean of the sent rows against the population) and the
+        largest flagged transactions.
+        """
+        sent = CustomerPageRenderer._rows(*task['sent'])
+        received = CustomerPageRenderer._rows(*task['received'])
+        stats = CustomerPageRenderer._worker['stats']
+        is_flagged = (
+            sent['transaction_flag'] == 1 if 'transaction_flag' in sent else pd.Series(False, index=sent.index)
+        )
+        flagged = sent[is_flagged]
+
+        fig = plt.figure(figsize=(7, 9))
+        grid = fig.add_gridspec(4, 1, height_ratios=[1.2, 0.9, 0.8, 1.1], hspace=0.6,
+                                left=0.3, right=0.95, top=0.9, bottom=0.03)
+        fig.suptitle(
+            f"#{task['rank']}  {task['customer']}  ·  risk score {task['score']:.2f}\n"
+            f"{len(sent):,} sent  ·  {len(received):,} received  ·  {len(flagged):,} flagged",
+            fontsize=12, weight='bold', color='#1a237e'
+        )
+
+        ax = fig.add_subplot(grid[0])
+        ax.scatter(received['step'], received['amount'], s=10, color='#9E9E9E', label='Received')
+        ax.scatter(sent.loc[~is_flagged, 'step'], sent.loc[~is_flagged, 'amount'], s=10,
+                   color='#1a237e', label='Sent')
+        ax.scatter(flagged['step'], flagged['amount'], s=22, color='#F44336', marker='D', label='Flagged')
+        ax.set_title('Amount Timeline', fontsize=11, weight='bold', color='#1a237e')
+        ax.set_xlabel('Step (hour)', fontsize=9)
+        ax.set_ylabel('Amount', fontsize=9)
+        ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f}'))
+        ax.tick_params(labelsize=8)
+        ax.legend(fontsize=8, loc='best')
+        ax.grid(True, alpha=0.3, linestyle='--')
+
+        ax = fig.add_subplot(grid[1])
+        counterparties = CustomerIndex.counterparty_table(sent, received).head(8).iloc[::-1]
+        ax.barh(
+            range(len(counterparties)), counterparties['total_amount'],
+            color=np.where(counterparties['direction'] == 'sent', '#1a237e', '#9E9E9E')
+        )
+        ax.set_yticks(range(len(counterparties)))
+        ax.set_yticklabels([
+            f"{name} ({direction})" for name, direction in
+            zip(counterparties['counterparty'], counterparties['direction'])
+        ])
+        ax.set_title('Top Counterparties', fontsize=11, weight='bold', color='#1a237e')
+        ax.xaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{x:,.0f}'))
+        ax.xaxis.set_major_locator(plt.MaxNLocator(5))
+        ax.tick_params(labelsize=7)
+        ax.grid(True, alpha=0.3, axis='x', linestyle='--')
+
+        ax = fig.add_subplot(grid[2])
+        features = list(stats['mean'])
+        means = sent[features].mean() if len(sent) else pd.Series(np.nan, index=features)
+        zscores = np.array([
+            (means[f] - stats['mean'][f]) / stats['std'][f] if stats['std'][f] else 0.0 for f in features
+        ])
+        ax.barh(features, zscores,
+                color=np.where(np.abs(zscores) >= FLAG_ZSCORE_THRESHOLD, '#F44336', '#5e35b1'))
+        ax.axvline(0, color='black', linewidth=0.8)
+        ax.set_title('Feature Z-scores', fontsize=11, weight='bold', color='#1a237e')
+        ax.tick_params(labelsize=7)
+        ax.grid(True, alpha=0.3, axis='x', linestyle='--')
+
+        ax = fig.add_subplot(grid[3])
+        ax.axis('off')
+        ax.set_title(f'Flagged Transactions (largest {min(len(flagged), 10)} of {len(flagged):,})',
+                     fontsize=11, weight='bold', color='#1a237e')
+        if len(flagged):
+            top = flagged.nlargest(10, 'amount')
+            reason = top['flag_reason_1'] if 'flag_reason_1' in top else pd.Series('-', index=top.index)
+            table = ax.table(
+                cellText=[
+                    [int(row.step), row.type, row.nameDest, f"{row.amount:,.2f}", why]
+                    for row, why in zip(top.itertuples(index=False), reason)
+                ],
+                colLabels=['Step', 'Type', 'To', 'Amount', 'Top Reason'],
+                cellLoc='center',
+                # span the labels margin too, one fixed-height line per row
+                bbox=[-0.38, 1 - 0.09 * (len(top) + 1), 1.38, 0.09 * (len(top) + 1)]
+            )
+            table.auto_set_font_size(False)
+            table.set_fontsize(7)
+        else:
+            ax.text(0.5, 0.5, 'No flagged transactions', ha='center', va='center', fontsize=10)
+
+        fig.savefig(task['path'], dpi=130, facecolor='white', pil_kwargs={'quality': 85})
+        plt.close(fig)
+        return task['path']
+
+    @staticmethod
+    def render_all(df: pd.DataFrame, index: CustomerIndex, customers: pd.Series, output_dir: str,
+                   workers: int = DASHBOARD_WORKERS, progress=None) -> list:
+        """
+        Render the pages of `customers` (in rank order) and return their image paths.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Scored and flagged transactions.
+        index : CustomerIndex
+            Index over the rows of `df`.
+        customers : pd.Series
+            Risk score shown on every page, indexed by account name,
+            highest priority first (see `DashboardGenerator.top_critical_customers`).
+        output_dir : str
+            Directory receiving the page images.
+        workers : int, optional
+            Rendering processes; None uses every core, 1 renders in this process.
+        progress : StageProgress, optional
+            Advanced by one per rendered page.
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        columns = [column for column in CustomerPageRenderer.COLUMNS if column in df.columns]
+        features = CustomerPageRenderer.features(df.columns)
+        columns += [feature for feature in features if feature not in columns]
+
+        names = customers.index.tolist()
+        sent, sent_offsets = index.positions(names, 'sender')
+        received, received_offsets = index.positions(names, 'receiver')
+        rows = df.iloc[np.concatenate([sent, received])][columns].reset_index(drop=True)
+        received_offsets = received_offsets + len(sent)
+
+        stats = {
+            'mean': {feature: float(df[feature].mean()) for feature in features},
+            'std': {feature: float(df[feature].std(ddof=0)) for feature in features}
+        }
+        tasks = [
+            {
+                'rank': rank + 1,
+                'customer': customer,
+                'score': float(score),
+                'sent': (int(sent_offsets[rank]), int(sent_offsets[rank + 1])),
+                'received': (int(received_offsets[rank]), int(received_offsets[rank + 1])),
+                'path': os.path.join(output_dir, f"customer_{rank + 1:04d}.jpg")
+            }
+            for rank, (customer, score) in enumerate(customers.items())
+        ]
+
+        paths = []
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers <= 1:
+            CustomerPageRenderer._worker = {
+                'columns': {column: rows[column].to_numpy() for column in rows.columns},
+                'stats': stats
+            }
+            try:
+                for task in tasks:
+                    paths.append(CustomerPageRenderer.render(task))
+                    if progress is not None:
+                        progress.update(1)
+                        progress.check()
+            finally:
+                CustomerPageRenderer._worker = None
+            return paths
+
+        with SharedFrame.publish(rows) as shared:
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=CustomerPageRenderer._attach, initargs=(shared.manifest, stats)
+            )
+            try:
+                for path in pool.map(CustomerPageRenderer.render, tasks):
+                    paths.append(path)
+                    if progress is not None:
+                        progress.update(1)
+                        progress.check()
+            finally:
+                pool.shutdown(cancel_futures=True)
+        return paths
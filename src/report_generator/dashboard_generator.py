@@ -1,4 +1,7 @@
 import os
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import seaborn as sns
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
@@ -7,6 +10,11 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER
+from src.constants.config import TREND_PERIODS, TREND_CHART_PERIOD, DASHBOARD_CUSTOMER_PAGES, DASHBOARD_WORKERS
+from src.data_manipulator import CustomerIndex
+from src.report_generator.trend_analyzer import TrendAnalyzer
+from src.report_generator.customer_pages import CustomerPageRenderer
+from src.report_generator.html_dashboard import HTMLDashboard
 
 
 class DashboardGenerator:
@@ -14,9 +22,18 @@ class DashboardGenerator:
     Generate a statistical analysis PDF dashboard focusing on critical customers.
     """
 
-    def __init__(self, df, output_dir: str = "outputs"):
-        """Create a DashboardGenerator for the given DataFrame and ensure output folders exist."""
+    def __init__(self, df, output_dir: str = "outputs", index: CustomerIndex = None,
+                 customer_pages: int = DASHBOARD_CUSTOMER_PAGES, workers: int = DASHBOARD_WORKERS):
+        """Create a DashboardGenerator for the given DataFrame and ensure output folders exist.
+
+        `index` is a `CustomerIndex` over the same rows (built when needed if
+        omitted); `customer_pages` is the number of top critical customers
+        given their own page and `workers` the processes rendering them.
+        """
         self.df = df.copy()
+        self.index = index
+        self.customer_pages = customer_pages
+        self.workers = workers
         self.output_dir = output_dir
         self.output_chart_dir = os.path.join(output_dir, 'charts')
         os.makedirs(self.output_dir, exist_ok=True)
@@ -195,8 +212,73 @@ class DashboardGenerator:
         plt.close()
         return path
 
-    def export_dashboard_pdf(self) -> str:
-        """Generate critical customer analysis dashboard"""
+    def _save_trend_timeline(self, period: str = TREND_CHART_PERIOD):
+        """Timeline of flagged transactions, flag rate and critical customer activity per `period`"""
+        trend = TrendAnalyzer.trend(self.df, period)
+        x = trend.index.to_numpy()
+
+        fig, (ax_flag, ax_crit) = plt.subplots(2, 1, figsize=(12, 8), sharex=True)
+
+        ax_flag.bar(x, trend['flagged'], color='#F44336', edgecolor='black', linewidth=0.5,
+                    alpha=0.85, label='Flagged transactions')
+        ax_flag.set_ylabel('Flagged Transactions', fontsize=13, weight='bold', color='#1a237e')
+        ax_rate = ax_flag.twinx()
+        ax_rate.plot(x, trend['flag_rate'], color='#1a237e', marker='o', markersize=3,
+                     linewidth=2, label='Flag rate (%)')
+        ax_rate.set_ylabel('Flag Rate (%)', fontsize=13, weight='bold', color='#1a237e')
+        ax_rate.grid(False)
+        ax_flag.set_title(f'Flagged Transactions per {period.title()} '
+                          f'(Total: {int(trend["flagged"].sum()):,})',
+                          fontsize=18, weight='bold', pad=20, color='#F44336')
+        handles = ax_flag.get_legend_handles_labels()
+        rate_handles = ax_rate.get_legend_handles_labels()
+        ax_flag.legend(handles[0] + rate_handles[0], handles[1] + rate_handles[1], loc='upper left')
+
+        ax_crit.bar(x, trend['critical_transactions'], color='#FF9800', edgecolor='black',
+                    linewidth=0.5, alpha=0.85, label='Critical customer transactions')
+        ax_crit.plot(x, trend['critical_customers'], color='#D32F2F', marker='o', markersize=3,
+                     linewidth=2, label='Active critical customers')
+        ax_crit.set_xlabel(f'{period.title()} ({TREND_PERIODS[period]} steps each)',
+                           fontsize=14, weight='bold', color='#1a237e')
+        ax_crit.set_ylabel('Critical Activity', fontsize=13, weight='bold', color='#1a237e')
+        ax_crit.legend(loc='upper left')
+
+        for ax in (ax_flag, ax_crit):
+            ax.grid(True, alpha=0.3, axis='y', linestyle='--')
+            ax.set_axisbelow(True)
+            ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'{int(x):,}'))
+
+        plt.tight_layout()
+
+        path = os.path.join(self.output_chart_dir, f"trend_timeline_{period}.png")
+        plt.savefig(path, bbox_inches='tight', dpi=150, facecolor='white')
+        plt.close()
+        return path
+
+    def top_critical_customers(self) -> pd.Series:
+        """Return the critical customers given their own page, highest risk score first
+
+        Every customer is ranked by its highest risk score over its critical
+        rows; the result maps account name to that score.
+        """
+        critical = self.df.loc[self.df['risk_class'] == 'critical', ['nameOrig', 'risk_score']]
+        scores = critical.groupby('nameOrig', sort=False, observed=True)['risk_score'].max()
+        return scores.nlargest(self.customer_pages)
+
+    def export_dashboard_html(self, summary: dict = None) -> str:
+        """Generate the self-contained HTML dashboard
+
+        `summary` is a precomputed `HTMLDashboard.summarize` result; it is
+        computed from the DataFrame when omitted.
+        """
+        return HTMLDashboard.export(summary or HTMLDashboard.summarize(self.df), self.output_dir)
+
+    def export_dashboard_pdf(self, progress=None) -> str:
+        """Generate critical customer analysis dashboard
+
+        `progress` (optional StageProgress) advances by one per customer page
+        and once when the PDF is written.
+        """
         pdf_path = os.path.join(self.output_dir, "Dashboard.pdf")
         styles = getSampleStyleSheet()
         
@@ -394,5 +476,28 @@ class DashboardGenerator:
         
         elements.append(summary_table)
 
+        elements.append(PageBreak())
+
+        elements.append(Paragraph("Activity Trends", heading_style))
+        elements.append(Spacer(1, 20))
+
+        trend_chart = self._save_trend_timeline()
+        elements.append(Image(trend_chart, width=7*inch, height=4.7*inch))
+
+        customers = self.top_critical_customers()
+        if len(customers):
+            index = CustomerIndex(self.df) if self.index is None else self.index.rebind(self.df)
+            pages = CustomerPageRenderer.render_all(
+                self.df, index, customers, os.path.join(self.output_chart_dir, 'customers'),
+                workers=self.workers, progress=progress
+            )
+            for rank, page in enumerate(pages, 1):
+                elements.append(PageBreak())
+                elements.append(Paragraph(f"Critical Customer {rank} of {len(pages)}", heading_style))
+                # lazy=2 opens each page image from disk only while its page is drawn
+                elements.append(Image(page, width=7*inch, height=9*inch, lazy=2))
+
         pdf.build(elements)
+        if progress is not None:
+            progress.update(1)
         return pdf_path
\ No newline at end of file
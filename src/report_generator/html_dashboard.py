@@ -0,0 +1,393 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from src.constants.config import RISK_CLASS_LABELS, HTML_HISTOGRAM_BINS, HTML_TOP_K, HTML_MAX_POINTS
+from src.calculations import CustomerRiskScorer, TransactionFlagger
+from src.report_generator.trend_analyzer import TrendAnalyzer
+
+
+class HTMLDashboard:
+    """
+    Write a self-contained HTML dashboard from pre-aggregated data.
+
+    `summarize` reduces the flagged transactions once to small aggregates:
+    totals, risk class and type counts, histograms, quantile summaries,
+    time trends merged down to at most `HTML_MAX_POINTS` buckets and top-k
+    tables. Only that summary is embedded (as JSON) in the page, so its
+    size does not grow with the number of rows. Charts are drawn as inline
+    SVG by a small inline script; the page loads nothing from the network.
+    """
+
+    QUANTILES = [0.0, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 1.0]
+
+    @staticmethod
+    def _histogram(values: np.ndarray, flagged: np.ndarray, bins: int, log: bool = False) -> dict:
+        """
+        Count all and flagged rows per bin of `values`.
+
+        Bins span the minimum to the 99.9th percentile, so one extreme row
+        does not squeeze every other row into the first bin; larger values
+        are counted in the last bin. With `log`, bins are even in
+        log10(1 + value), which suits amounts.
+        """
+        keep = np.isfinite(values)
+        values, flagged = values[keep], flagged[keep]
+        if not len(values):
+            return {'edges': [], 'all': [], 'flagged': [], 'log': log}
+
+        scaled = np.log10(1 + np.maximum(values, 0)) if log else values
+        low, high = float(scaled.min()), float(np.quantile(scaled, 0.999))
+        if high <= low:
+            high = low + 1.0
+        codes = np.clip(((scaled - low) / (high - low) * bins).astype(np.int64), 0, bins - 1)
+        edges = np.linspace(low, high, bins + 1)
+        return {
+            'edges': (10 ** edges - 1 if log else edges).tolist(),
+            'all': np.bincount(codes, minlength=bins).tolist(),
+            'flagged': np.bincount(codes[flagged], minlength=bins).tolist(),
+            'log': log
+        }
+
+    @staticmethod
+    def _downsample(trend: pd.DataFrame, max_points: int) -> pd.DataFrame:
+        """
+        Merge consecutive buckets so that at most `max_points` remain.
+
+        Counts and volumes are summed and the flag rate recomputed; the
+        distinct critical customers of merged buckets cannot be summed,
+        so the busiest bucket of each group is kept.
+        """
+        if len(trend) <= max_points:
+            return trend
+        width = -(-len(trend) // max_points)
+        starts = np.arange(0, len(trend), width)
+        merged = pd.DataFrame({
+            column: np.add.reduceat(trend[column].to_numpy(), starts)
+            for column in ('transactions', 'volume', 'flagged', 'flagged_volume', 'critical_transactions')
+        })
+        merged['start_step'] = trend['start_step'].to_numpy()[starts]
+        merged['critical_customers'] = np.maximum.reduceat(trend['critical_customers'].to_numpy(), starts)
+        merged['flag_rate'] = np.divide(
+            merged['flagged'] * 100.0, merged['transactions'],
+            out=np.zeros(len(merged)), where=merged['transactions'].to_numpy() > 0
+        )
+        return merged[TrendAnalyzer.COLUMNS]
+
+    @staticmethod
+    def _records(df: pd.DataFrame) -> list:
+        """Return the rows of a small table as JSON-ready records (NaN becomes null)."""
+        return json.loads(df.to_json(orient='records', double_precision=6))
+
+    @staticmethod
+    def summarize(df: pd.DataFrame, bins: int = HTML_HISTOGRAM_BINS, top_k: int = HTML_TOP_K,
+                  max_points: int = HTML_MAX_POINTS) -> dict:
+        """
+        Pre-aggregate scored and flagged transactions for the dashboard.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Scored and flagged transactions.
+        bins : int
+            Bins per histogram.
+        top_k : int
+            Rows per top-k table.
+        max_points : int
+            Most points of a time series.
+
+        Returns
+        -------
+        dict
+            JSON-serializable summary: 'totals', 'risk_classes', 'types',
+            'histograms', 'quantiles', 'trends', 'top_customers',
+            'top_flagged' and 'flag_reasons'.
+        """
+        flagged = (df['transaction_flag'] == 1).to_numpy()
+        amount = df['amount'].to_numpy(dtype=float)
+        senders = df.drop_duplicates('nameOrig')[['nameOrig', 'risk_score', 'risk_class']]
+
+        totals = {
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'transactions': int(len(df)),
+            'customers': int(len(senders)),
+            'flagged': int(flagged.sum()),
+            'flag_rate': float(flagged.mean() * 100) if len(df) else 0.0,
+            'volume': float(amount.sum()),
+            'flagged_volume': float(amount[flagged].sum()),
+            'critical_customers': int((senders['risk_class'] == 'critical').sum())
+        }
+        if 'mahalanobis_flag' in df.columns:
+            totals['mahalanobis_flagged'] = int((df['mahalanobis_flag'] == 1).sum())
+
+        risk_rows = df['risk_class'].astype(str).value_counts()
+        risk_customers = senders['risk_class'].astype(str).value_counts()
+        risk_classes = [
+            {'label': label, 'transactions': int(risk_rows.get(label, 0)),
+             'customers': int(risk_customers.get(label, 0))}
+            for label in RISK_CLASS_LABELS
+        ]
+
+        type_codes, type_names = pd.factorize(df['type'].astype(str))
+        types = pd.DataFrame({
+            'type': type_names,
+            'transactions': np.bincount(type_codes, minlength=len(type_names)),
+            'flagged': np.bincount(type_codes[flagged], minlength=len(type_names)),
+            'volume': np.bincount(type_codes, weights=amount, minlength=len(type_names))
+        }).sort_values('transactions', ascending=False)
+
+        histograms = {'amount': HTMLDashboard._histogram(amount, flagged, bins, log=True)}
+        for column in ('risk_score', 'mahalanobis_distance'):
+            if column in df.columns:
+                histograms[column] = HTMLDashboard._histogram(
+                    df[column].to_numpy(dtype=float), flagged, bins
+                )
+
+        features = CustomerRiskScorer.RISK_FEATURES + TransactionFlagger.FLAG_FEATURES
+        quantile_columns = ['amount', 'risk_score', 'mahalanobis_distance'] + features
+        quantiles = {
+            column: [
+                None if np.isnan(q) else float(q)
+                for q in np.nanquantile(df[column].to_numpy(dtype=float), HTMLDashboard.QUANTILES)
+            ]
+            for column in dict.fromkeys(quantile_columns) if column in df.columns and df[column].notna().any()
+        }
+
+        trends = {
+            period: HTMLDashboard._records(HTMLDashboard._downsample(trend, max_points).reset_index(drop=True))
+            for period, trend in TrendAnalyzer.trends(df).items()
+        }
+
+        top = senders.nlargest(top_k, 'risk_score')
+        rows = df[df['nameOrig'].isin(top['nameOrig'])]
+        activity = rows.groupby('nameOrig').agg(
+            transactions=('amount', 'size'), volume=('amount', 'sum'), flagged=('transaction_flag', 'sum')
+        )
+        top_customers = top.merge(activity, left_on='nameOrig', right_index=True)
+        top_customers['risk_class'] = top_customers['risk_class'].astype(str)
+
+        flagged_columns = [column for column in ('step', 'nameOrig', 'nameDest', 'type', 'amount', 'risk_score',
+                                                 'flag_reason_1', 'flag_reason_1_zscore') if column in df.columns]
+        top_flagged = df.loc[flagged, flagged_columns].nlargest(top_k, 'amount')
+
+        reasons = (
+            df.loc[flagged, 'flag_reason_1'].astype(str).value_counts().head(top_k)
+            if 'flag_reason_1' in df.columns else pd.Series(dtype=int)
+        )
+
+        return {
+            'totals': totals,
+            'risk_classes': risk_classes,
+            'types': HTMLDashboard._records(types),
+            'histograms': histograms,
+            'quantiles': {'levels': HTMLDashboard.QUANTILES, 'columns': quantiles},
+            'trends': trends,
+            'top_customers': HTMLDashboard._records(top_customers),
+            'top_flagged': HTMLDashboard._records(top_flagged),
+            'flag_reasons': [{'feature': feature, 'flagged': int(count)} for feature, count in reasons.items()]
+        }
+
+    @staticmethod
+    def render(summary: dict) -> str:
+        """Return the HTML page embedding `summary`."""
+        data = json.dumps(summary, allow_nan=False, separators=(',', ':')).replace('</', '<\\/')
+        return _TEMPLATE.replace('/*DATA*/null', data)
+
+    @staticmethod
+    def export(summary: dict, output_dir: str = "outputs") -> str:
+        """Write `Dashboard.html` into `output_dir` and return its path."""
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, "Dashboard.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(HTMLDashboard.render(summary))
+        return path
+
+
+_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>FRAUDLENS – Dashboard</title>
+<style>
+  body { margin: 0; font-family: Helvetica, Arial, sans-serif; background: #f5f6fa; color: #212121; }
+  header { background: #1a237e; color: white; padding: 18px 32px; }
+  header h1 { margin: 0; font-size: 26px; letter-spacing: 2px; }
+  header p { margin: 4px 0 0; color: #c5cae9; font-size: 13px; }
+  main { padding: 20px 32px; display: grid; grid-template-columns: repeat(auto-fit, minmax(520px, 1fr)); gap: 20px; }
+  section { background: white; border-radius: 6px; box-shadow: 0 1px 3px rgba(0,0,0,.15); padding: 14px 18px; overflow-x: auto; }
+  section.wide { grid-column: 1 / -1; }
+  h2 { margin: 0 0 10px; font-size: 16px; color: #1a237e; }
+  .cards { display: flex; flex-wrap: wrap; gap: 12px; }
+  .card { flex: 1 1 150px; border-left: 4px solid #3949ab; padding: 6px 12px; background: #f5f6fa; }
+  .card.alert { border-color: #F44336; }
+  .card b { display: block; font-size: 20px; }
+  .card span { font-size: 12px; color: #616161; }
+  table { border-collapse: collapse; width: 100%; font-size: 12px; }
+  th { background: #1a237e; color: white; text-align: left; padding: 5px 8px; }
+  td { padding: 4px 8px; border-bottom: 1px solid #e0e0e0; }
+  td.num { text-align: right; font-variant-numeric: tabular-nums; }
+  tr:nth-child(even) td { background: #fafafa; }
+  svg text { font-size: 10px; fill: #424242; }
+  .legend { font-size: 12px; margin: 4px 0; }
+  .legend i { display: inline-block; width: 10px; height: 10px; margin: 0 4px 0 12px; }
+  select { margin-bottom: 8px; }
+</style>
+</head>
+<body>
+<header>
+  <h1>FRAUDLENS</h1>
+  <p id="subtitle"></p>
+</header>
+<main>
+  <section class="wide"><h2>Overview</h2><div class="cards" id="cards"></div></section>
+  <section class="wide">
+    <h2>Activity Trends</h2>
+    <select id="period"></select>
+    <div class="legend"><i style="background:#F44336"></i>Flagged transactions<i style="background:#1a237e"></i>Flag rate (%)<i style="background:#FF9800"></i>Critical customer transactions</div>
+    <div id="trend"></div>
+  </section>
+  <section><h2>Risk Classes</h2><div id="risk"></div><div id="risk_table"></div></section>
+  <section><h2>Transaction Types</h2><div id="types"></div></section>
+  <section class="wide">
+    <h2>Distributions</h2>
+    <select id="histogram"></select>
+    <div class="legend"><i style="background:#9fa8da"></i>All transactions<i style="background:#F44336"></i>Flagged</div>
+    <div id="hist"></div>
+  </section>
+  <section class="wide"><h2>Quantiles</h2><div id="quantiles"></div></section>
+  <section class="wide"><h2>Top Customers by Risk Score</h2><div id="top_customers"></div></section>
+  <section class="wide"><h2>Largest Flagged Transactions</h2><div id="top_flagged"></div></section>
+  <section><h2>Top Flag Reasons</h2><div id="reasons"></div></section>
+</main>
+<script>
+const DATA = /*DATA*/null;
+const NS = 'http://www.w3.org/2000/svg';
+
+function fmt(v, digits) {
+  if (v === null || v === undefined) return '-';
+  if (typeof v !== 'number') return String(v);
+  return v.toLocaleString(undefined, {maximumFractionDigits: digits === undefined ? 2 : digits});
+}
+
+function el(tag, attrs, parent, text) {
+  const node = document.createElementNS(NS, tag);
+  for (const k in attrs) node.setAttribute(k, attrs[k]);
+  if (text !== undefined) node.textContent = text;
+  if (parent) parent.appendChild(node);
+  return node;
+}
+
+function table(target, rows, columns) {
+  const html = ['<table><tr>'];
+  columns.forEach(c => html.push('<th>' + c[1] + '</th>'));
+  html.push('</tr>');
+  rows.forEach(r => {
+    html.push('<tr>');
+    columns.forEach(c => {
+      const v = r[c[0]];
+      html.push(typeof v === 'number' ? '<td class="num">' + fmt(v, c[2]) + '</td>'
+                                      : '<td>' + fmt(v).replace(/</g, '&lt;') + '</td>');
+    });
+    html.push('</tr>');
+  });
+  html.push('</table>');
+  document.getElementById(target).innerHTML = html.join('');
+}
+
+// series: [{values, color, kind: 'bar' | 'line', axis: 'left' | 'right'}]
+function chart(target, labels, series, width, height) {
+  const box = document.getElementById(target);
+  box.innerHTML = '';
+  const m = {l: 70, r: 50, t: 10, b: 40}, w = width - m.l - m.r, h = height - m.t - m.b;
+  const svg = el('svg', {width: width, height: height, viewBox: '0 0 ' + width + ' ' + height}, box);
+  const max = {left: 0, right: 0};
+  series.forEach(s => s.values.forEach(v => { max[s.axis || 'left'] = Math.max(max[s.axis || 'left'], v || 0); }));
+  const n = labels.length, step = w / Math.max(n, 1);
+  const y = (v, axis) => m.t + h - (max[axis] ? (v || 0) / max[axis] * h : 0);
+  for (let i = 0; i <= 4; i++) {
+    const v = max.left * i / 4, py = y(v, 'left');
+    el('line', {x1: m.l, x2: m.l + w, y1: py, y2: py, stroke: '#e0e0e0'}, svg);
+    el('text', {x: m.l - 6, y: py + 3, 'text-anchor': 'end'}, svg, fmt(v, 0));
+    if (max.right) el('text', {x: m.l + w + 6, y: py + 3}, svg, fmt(max.right * i / 4, 2));
+  }
+  const bars = series.filter(s => s.kind !== 'line');
+  bars.forEach((s, k) => s.values.forEach((v, i) => {
+    const bw = step * 0.8 / bars.length, x = m.l + i * step + step * 0.1 + k * bw;
+    const rect = el('rect', {x: x, y: y(v, 'left'), width: Math.max(bw, 0.5), height: m.t + h - y(v, 'left'), fill: s.color}, svg);
+    el('title', {}, rect, labels[i] + ': ' + fmt(v));
+  }));
+  series.filter(s => s.kind === 'line').forEach(s => {
+    const points = s.values.map((v, i) => (m.l + (i + 0.5) * step) + ',' + y(v, s.axis || 'left')).join(' ');
+    el('polyline', {points: points, fill: 'none', stroke: s.color, 'stroke-width': 2}, svg);
+  });
+  const every = Math.ceil(n / 12);
+  labels.forEach((label, i) => {
+    if (i % every === 0) el('text', {x: m.l + (i + 0.5) * step, y: m.t + h + 16, 'text-anchor': 'middle'}, svg, label);
+  });
+}
+
+const T = DATA.totals;
+document.getElementById('subtitle').textContent =
+  'Critical Customer Analysis Dashboard · generated ' + T.generated + ' · ' + fmt(T.transactions) + ' transactions';
+const cards = [
+  ['Transactions', fmt(T.transactions)], ['Customers', fmt(T.customers)],
+  ['Flagged', fmt(T.flagged) + ' (' + fmt(T.flag_rate) + '%)', true],
+  ['Volume', fmt(T.volume, 0)], ['Flagged Volume', fmt(T.flagged_volume, 0), true],
+  ['Critical Customers', fmt(T.critical_customers), true]
+];
+if (T.mahalanobis_flagged !== undefined) cards.push(['Mahalanobis Flags', fmt(T.mahalanobis_flagged), true]);
+document.getElementById('cards').innerHTML = cards.map(c =>
+  '<div class="card' + (c[2] ? ' alert' : '') + '"><b>' + c[1] + '</b><span>' + c[0] + '</span></div>').join('');
+
+function options(target, keys, draw) {
+  const select = document.getElementById(target);
+  select.innerHTML = keys.map(k => '<option>' + k + '</option>').join('');
+  select.onchange = () => draw(select.value);
+  draw(keys[0]);
+}
+
+options('period', ['day', 'week', 'hour'].filter(p => DATA.trends[p]), period => {
+  const rows = DATA.trends[period];
+  chart('trend', rows.map(r => String(r.start_step)), [
+    {values: rows.map(r => r.flagged), color: '#F44336'},
+    {values: rows.map(r => r.critical_transactions), color: '#FF9800'},
+    {values: rows.map(r => r.flag_rate), color: '#1a237e', kind: 'line', axis: 'right'}
+  ], 1100, 280);
+});
+
+chart('risk', DATA.risk_classes.map(r => r.label), [
+  {values: DATA.risk_classes.map(r => r.transactions), color: '#3949ab'}
+], 520, 220);
+table('risk_table', DATA.risk_classes, [['label', 'Risk Class'], ['transactions', 'Transactions'], ['customers', 'Customers']]);
+table('types', DATA.types, [['type', 'Type'], ['transactions', 'Transactions'], ['flagged', 'Flagged'], ['volume', 'Volume', 0]]);
+
+options('histogram', Object.keys(DATA.histograms), column => {
+  const hist = DATA.histograms[column];
+  const labels = hist.all.map((_, i) => fmt(hist.edges[i], hist.log ? 0 : 2));
+  chart('hist', labels, [
+    {values: hist.all, color: '#9fa8da'}, {values: hist.flagged, color: '#F44336'}
+  ], 1100, 260);
+});
+
+const Q = DATA.quantiles;
+table('quantiles', Object.keys(Q.columns).map(c => {
+  const row = {column: c};
+  Q.levels.forEach((level, i) => { row['q' + i] = Q.columns[c][i]; });
+  return row;
+}), [['column', 'Column']].concat(Q.levels.map((level, i) => ['q' + i, level === 0 ? 'min' : level === 1 ? 'max' : 'p' + level * 100, 3])));
+
+table('top_customers', DATA.top_customers, [
+  ['nameOrig', 'Customer'], ['risk_score', 'Risk Score'], ['risk_class', 'Risk Class'],
+  ['transactions', 'Transactions'], ['flagged', 'Flagged'], ['volume', 'Volume']
+]);
+table('top_flagged', DATA.top_flagged, [
+  ['step', 'Step', 0], ['nameOrig', 'From'], ['nameDest', 'To'], ['type', 'Type'], ['amount', 'Amount'],
+  ['risk_score', 'Risk Score'], ['flag_reason_1', 'Top Reason'], ['flag_reason_1_zscore', 'Z-score']
+].filter(c => DATA.top_flagged.length === 0 || c[0] in DATA.top_flagged[0]));
+table('reasons', DATA.flag_reasons, [['feature', 'Feature'], ['flagged', 'Flagged']]);
+</script>
+</body>
+</html>
+"""
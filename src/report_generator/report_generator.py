@@ -1,6 +1,8 @@
 import os
 import pandas as pd
 from datetime import datetime
+from src.constants.config import TREND_PERIODS
+from src.report_generator.trend_analyzer import TrendAnalyzer
 
 
 class ReportGenerator:
@@ -8,38 +10,53 @@ class ReportGenerator:
     Generate comprehensive CSV and TXT reports with detailed analytics.
     """
 
-    def __init__(self, df: pd.DataFrame, output_dir: str = "outputs"):
-        """Initialize the report generator with a DataFrame and output directory."""
+    def __init__(self, df: pd.DataFrame, output_dir: str = "outputs", engine=None):
+        """Initialize the report generator with a DataFrame and output directory.
+
+        `engine` (e.g. a `DuckDBEngine`) computes the per-customer aggregations
+        of the CSV reports in place of pandas; it must provide
+        `flagged_table(df)` and `customer_risk_table(df)`.
+        """
         self.df = df.copy()
         self.output_dir = output_dir
+        self.engine = engine
         os.makedirs(self.output_dir, exist_ok=True)
 
-    def export_flagged_transactions(self) -> str:
-        """Export detailed flagged transactions with additional context"""
-        path = os.path.join(self.output_dir, "flagged_transactions.csv")
+    @staticmethod
+    def flagged_columns(columns) -> list:
+        """Return the columns of the flagged transactions report found in `columns`"""
+        cols = ['nameOrig', 'nameDest', 'amount', 'type', 'risk_score', 
+                'risk_class', 'transaction_flag', 'oldbalanceOrg', 
+                'newbalanceOrig', 'pct_of_customer_volume',
+                'mahalanobis_distance', 'mahalanobis_flag']
+        
+        cols += [col for col in columns if col.startswith('flag_reason_')]
         
-        flagged = self.df[self.df['transaction_flag'] == 1].copy()
+        return [col for col in cols if col in columns]
+
+    @staticmethod
+    def flagged_table(df: pd.DataFrame) -> pd.DataFrame:
+        """Return flagged transactions with their share of the customer's volume"""
+        flagged = df[df['transaction_flag'] == 1].copy()
         
-        customer_totals = self.df.groupby('nameOrig')['amount'].sum()
+        customer_totals = df.groupby('nameOrig')['amount'].sum()
         flagged['customer_total_volume'] = flagged['nameOrig'].map(customer_totals)
         flagged['pct_of_customer_volume'] = (
             flagged['amount'] / flagged['customer_total_volume'] * 100
         ).round(2)
         
-        cols = ['nameOrig', 'nameDest', 'amount', 'type', 'risk_score', 
-                'risk_class', 'transaction_flag', 'oldbalanceOrg', 
-                'newbalanceOrig', 'pct_of_customer_volume']
-        
-        available_cols = [col for col in cols if col in flagged.columns]
-        flagged[available_cols].to_csv(path, index=False)
-        
-        return path
+        return flagged[ReportGenerator.flagged_columns(flagged.columns)]
 
-    def export_customer_risk_summary(self) -> str:
-        """Export comprehensive customer risk analysis"""
-        path = os.path.join(self.output_dir, "customer_risk_summary.csv")
+    def export_flagged_transactions(self) -> str:
+        """Export detailed flagged transactions with additional context"""
+        path = os.path.join(self.output_dir, "flagged_transactions.csv")
+        (self.engine or ReportGenerator).flagged_table(self.df).to_csv(path, index=False)
+        return path
 
-        customer_stats = self.df.groupby('nameOrig').agg({
+    @staticmethod
+    def customer_risk_table(df: pd.DataFrame) -> pd.DataFrame:
+        """Return one row per customer with volume, flag counts, risk score and rank"""
+        customer_stats = df.groupby('nameOrig').agg({
             'amount': ['sum', 'mean', 'count', 'max'],
             'transaction_flag': 'sum',
             'risk_score': 'first',
@@ -51,6 +68,11 @@ class ReportGenerator:
             'max_transaction', 'flagged_count', 'risk_score', 'risk_class'
         ]
         
+        reason_cols = [col for col in df.columns if col.startswith('risk_reason_')]
+        if reason_cols:
+            reasons = df.groupby('nameOrig', observed=True)[reason_cols].first()
+            customer_stats = customer_stats.merge(reasons, left_on='customer_id', right_index=True)
+        
         customer_stats['flagged_percentage'] = (
             customer_stats['flagged_count'] / customer_stats['transaction_count'] * 100
         ).round(2)
@@ -59,9 +81,12 @@ class ReportGenerator:
             ascending=False, method='min'
         ).astype(int)
         
-        customer_stats = customer_stats.sort_values('risk_score', ascending=False)
-        
-        customer_stats.to_csv(path, index=False)
+        return customer_stats.sort_values('risk_score', ascending=False)
+
+    def export_customer_risk_summary(self) -> str:
+        """Export comprehensive customer risk analysis"""
+        path = os.path.join(self.output_dir, "customer_risk_summary.csv")
+        (self.engine or ReportGenerator).customer_risk_table(self.df).to_csv(path, index=False)
         return path
 
     def export_text_report(self) -> str:
@@ -98,11 +123,19 @@ class ReportGenerator:
         flagged_customers = self.df[self.df['transaction_flag'] == 1].groupby('nameOrig').size()
         top_flagged = flagged_customers.sort_values(ascending=False).head(10)
         
+        flag_reasons = (
+            self.df.loc[self.df['transaction_flag'] == 1, 'flag_reason_1'].value_counts().loc[lambda counts: counts > 0]
+            if 'flag_reason_1' in self.df.columns else pd.Series(dtype=int)
+        )
+        
         high_value_flagged = (
             self.df[self.df['transaction_flag'] == 1]
             .nlargest(10, 'amount')[['nameOrig', 'nameDest', 'amount', 'type', 'risk_score']]
         )
 
+        trends = TrendAnalyzer.trends(self.df)
+        peak_hours = trends['hour'].nlargest(10, 'flagged')
+
         with open(path, "w", encoding="utf-8") as f:
             f.write("=" * 70 + "\n")
             f.write("FRAUDLENS – COMPREHENSIVE FRAUD DETECTION ANALYSIS REPORT\n")
@@ -174,6 +207,43 @@ class ReportGenerator:
                 )
             f.write("\n")
 
+            if len(flag_reasons):
+                f.write("TOP FLAG REASONS (HIGHEST Z-SCORE FEATURE)\n")
+                f.write("-" * 70 + "\n")
+                f.write(f"{'Feature':<35} {'Flagged':<12} {'Share':<12}\n")
+                f.write("-" * 70 + "\n")
+                for feature, count in flag_reasons.items():
+                    share = (count / flagged_count * 100) if flagged_count else 0
+                    f.write(f"{feature:<35} {count:<12,} {share:<12.2f}%\n")
+                f.write("\n")
+
+            f.write("TREND ANALYSIS (STEP = 1 HOUR)\n")
+            f.write("-" * 70 + "\n")
+            for period in ('week', 'day'):
+                f.write(f"Per {period}:\n")
+                f.write(
+                    f"{period.title():<6} {'Steps':<10} {'Count':<10} {'Flagged':<9} "
+                    f"{'Rate':<8} {'Volume':<17} {'Crit Tx':<8} {'Crit Cust':<9}\n"
+                )
+                for bucket, row in trends[period].iterrows():
+                    steps = f"{int(row['start_step'])}-{int(row['start_step']) + TREND_PERIODS[period] - 1}"
+                    rate = f"{row['flag_rate']:.2f}%"
+                    f.write(
+                        f"{bucket:<6} {steps:<10} {int(row['transactions']):<10,} {int(row['flagged']):<9,} "
+                        f"{rate:<8} ${row['volume']:<16,.0f} "
+                        f"{int(row['critical_transactions']):<8,} {int(row['critical_customers']):<9,}\n"
+                    )
+                f.write("\n")
+            f.write("Peak hours by flagged transactions:\n")
+            f.write(f"{'Step':<8} {'Count':<10} {'Flagged':<10} {'Rate':<10} {'Crit Cust':<10}\n")
+            for step, row in peak_hours.iterrows():
+                rate = f"{row['flag_rate']:.2f}%"
+                f.write(
+                    f"{step:<8} {int(row['transactions']):<10,} {int(row['flagged']):<10,} "
+                    f"{rate:<10} {int(row['critical_customers']):<10,}\n"
+                )
+            f.write("\n")
+
             f.write("KEY FINDINGS & RECOMMENDATIONS\n")
             f.write("-" * 70 + "\n")
             
@@ -217,10 +287,20 @@ class ReportGenerator:
 
         return path
 
-    def export_all(self) -> dict:
-        """Export all reports and return file paths"""
-        return {
-            "flagged_csv": self.export_flagged_transactions(),
-            "customer_risk_csv": self.export_customer_risk_summary(),
-            "text_report": self.export_text_report()
-        }
\ No newline at end of file
+    def export_all(self, progress=None) -> dict:
+        """Export all reports and return file paths
+
+        `progress` (optional StageProgress) advances by one per written report.
+        """
+        exports = {
+            "flagged_csv": self.export_flagged_transactions,
+            "customer_risk_csv": self.export_customer_risk_summary,
+            "text_report": self.export_text_report
+        }
+        paths = {}
+        for key, export in exports.items():
+            paths[key] = export()
+            if progress is not None:
+                progress.update(1)
+                progress.check()
+        return paths
\ No newline at end of file
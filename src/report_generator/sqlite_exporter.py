@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import pandas as pd
+from src.constants.config import SQLITE_DB, SQLITE_BATCH_SIZE
+from src.report_generator.report_generator import ReportGenerator
+
+
+class SQLiteExporter:
+    """
+    Persist scored transactions and the customer risk table into an indexed SQLite database.
+    """
+
+    TABLE_INDEXES = {
+        'transactions': ['nameOrig', 'nameDest', 'risk_class', 'transaction_flag', 'step'],
+        'customers': ['customer_id', 'risk_class', 'risk_score']
+    }
+
+    def __init__(self, df: pd.DataFrame, output_dir: str = "outputs"):
+        """Initialize the exporter with the scored DataFrame and output directory."""
+        self.df = df
+        self.output_dir = output_dir
+        self.db_path = os.path.join(output_dir, SQLITE_DB)
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    @staticmethod
+    def _connect(db_path: str) -> sqlite3.Connection:
+        """Open the database in WAL mode so readers are not blocked by a running export."""
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _write_table(conn: sqlite3.Connection, name: str, df: pd.DataFrame, progress=None):
+        """Replace table `name` with `df` using batched bulk inserts, then build its indexes.
+
+        Indexes are created after the load, which is much cheaper than
+        maintaining them row by row during the inserts.
+        """
+        for start in range(0, max(len(df), 1), SQLITE_BATCH_SIZE):
+            batch = df.iloc[start:start + SQLITE_BATCH_SIZE]
+            batch.to_sql(
+                name, conn, index=False,
+                if_exists='replace' if start == 0 else 'append',
+                chunksize=SQLITE_BATCH_SIZE
+            )
+            if progress is not None:
+                progress.update(len(batch))
+                progress.check()
+
+        for column in SQLiteExporter.TABLE_INDEXES[name]:
+            if column in df.columns:
+                conn.execute(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{name}_{column}" ON "{name}" ("{column}")'
+                )
+        conn.commit()
+
+    def export_database(self, progress=None) -> str:
+        """Write the `transactions` and `customers` tables and return the database path.
+
+        `progress` (optional StageProgress) advances by the number of inserted rows.
+        """
+        customers = ReportGenerator.customer_risk_table(self.df)
+
+        conn = SQLiteExporter._connect(self.db_path)
+        try:
+            SQLiteExporter._write_table(conn, 'transactions', self.df, progress)
+            SQLiteExporter._write_table(conn, 'customers', customers, progress)
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        return self.db_path
+
+    @staticmethod
+    def query(db_path: str, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """Run a read query against an exported database and return the result.
+
+        Example
+        -------
+        SQLiteExporter.query(path, "SELECT * FROM transactions WHERE nameOrig = ?", ("C123",))
+        """
+        conn = sqlite3.connect(db_path)
+        try:
+            return pd.read_sql_query(sql, conn, params=params)
+        finally:
+            conn.close()
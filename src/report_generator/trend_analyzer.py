@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+from src.constants.config import TREND_PERIODS
+
+
+class TrendAnalyzer:
+    """
+    Aggregate scored transactions into hourly, daily and weekly buckets of `step`.
+
+    PaySim's `step` is one hour, so bucket `k` of a period spanning `h` hours
+    holds steps `k*h` to `(k+1)*h - 1`. Buckets are integer codes, and every
+    column is one `np.bincount` over them (no groupby), so a trend costs a few
+    vectorized passes over the rows. Empty buckets between the first and the
+    last one are kept with zero counts, so the timeline has no gaps.
+    """
+
+    COLUMNS = [
+        'start_step', 'transactions', 'volume', 'flagged', 'flag_rate',
+        'flagged_volume', 'critical_transactions', 'critical_customers'
+    ]
+
+    @staticmethod
+    def trend(df: pd.DataFrame, period: str = 'day') -> pd.DataFrame:
+        """Return one row per bucket of `period` (a key of `TREND_PERIODS`).
+
+        Columns: first step of the bucket, transactions, volume, flagged
+        transactions, flag rate (%), flagged volume, transactions of critical
+        customers and distinct critical customers active in the bucket.
+        """
+        hours = TREND_PERIODS[period]
+        if not len(df):
+            return pd.DataFrame(columns=TrendAnalyzer.COLUMNS).rename_axis(period)
+
+        buckets = df['step'].to_numpy(dtype=np.int64) // hours
+        first = int(buckets.min())
+        codes = buckets - first
+        size = int(codes.max()) + 1
+
+        amount = df['amount'].to_numpy(dtype=float)
+        flagged = df['transaction_flag'].to_numpy() == 1
+        critical = (df['risk_class'] == 'critical').to_numpy()
+
+        transactions = np.bincount(codes, minlength=size)
+        flagged_count = np.bincount(codes[flagged], minlength=size)
+
+        # distinct (bucket, sender) pairs of critical rows, counted per bucket
+        senders, uniques = pd.factorize(df['nameOrig'].to_numpy()[critical])
+        pairs = np.unique(codes[critical] * max(len(uniques), 1) + senders)
+        critical_customers = np.bincount(pairs // max(len(uniques), 1), minlength=size)
+
+        result = pd.DataFrame({
+            'start_step': (np.arange(size) + first) * hours,
+            'transactions': transactions,
+            'volume': np.bincount(codes, weights=amount, minlength=size),
+            'flagged': flagged_count,
+            'flag_rate': np.divide(
+                flagged_count * 100.0, transactions,
+                out=np.zeros(size), where=transactions > 0
+            ),
+            'flagged_volume': np.bincount(codes[flagged], weights=amount[flagged], minlength=size),
+            'critical_transactions': np.bincount(codes[critical], minlength=size),
+            'critical_customers': critical_customers
+        }, index=pd.RangeIndex(first, first + size, name=period))
+        return result
+
+    @staticmethod
+    def trends(df: pd.DataFrame, periods=None) -> dict:
+        """Return `trend` for every period (all of `TREND_PERIODS` by default)."""
+        return {period: TrendAnalyzer.trend(df, period) for period in (periods or TREND_PERIODS)}